@@ -1,5 +1,9 @@
 import reflex as rx
 from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from app.database import security
+from app.services import export, metrics, profiler
+from app.states.auth_state import ADMIN_EMAILS
 from app.states.polar_state import PolarState
 
 api = FastAPI()
@@ -10,4 +14,74 @@ async def handle_polar_webhook(request: Request):
     payload = await request.body()
     headers = dict(request.headers)
     result = await PolarState().handle_webhook(payload=payload, headers=headers)
-    return Response(content=result["body"], status_code=result["status_code"])
\ No newline at end of file
+    return Response(content=result["body"], status_code=result["status_code"])
+
+
+@api.get("/metrics")
+def prometheus_metrics(request: Request):
+    if not metrics.METRICS_TOKEN:
+        return Response(content="Metrics are disabled", status_code=404)
+    authorization = request.headers.get("Authorization", "")
+    if authorization != f"Bearer {metrics.METRICS_TOKEN}":
+        return Response(content="Forbidden", status_code=403)
+    return PlainTextResponse(
+        metrics.registry.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@api.get("/api/debug/profile")
+async def sampling_profile(token: str, seconds: float = 10, idle: bool = False):
+    claims = security.read_signed_token(token, profiler.PROFILE_TOKEN_MAX_AGE)
+    if (
+        not claims
+        or claims.get("scope") != "profile"
+        or claims.get("email", "").lower() not in ADMIN_EMAILS
+    ):
+        return Response(content="Invalid or expired profile link", status_code=403)
+    try:
+        collapsed = await profiler.profile(seconds, include_idle=idle)
+    except RuntimeError as e:
+        return Response(content=str(e), status_code=409)
+    return PlainTextResponse(
+        collapsed,
+        headers={"Content-Disposition": "attachment; filename=profile.collapsed"},
+    )
+
+
+@api.get("/api/export/{kind}")
+def export_history(
+    kind: str,
+    token: str,
+    format: str = "csv",
+    start: str | None = None,
+    end: str | None = None,
+    bot_id: str | None = None,
+):
+    if kind not in export.EXPORT_KINDS or format not in export.EXPORT_FORMATS:
+        return Response(content="Unknown export", status_code=404)
+    claims = security.read_signed_token(token, export.EXPORT_TOKEN_MAX_AGE)
+    if not claims or claims.get("scope") != "export":
+        return Response(content="Invalid or expired export link", status_code=403)
+    try:
+        start_ts = export.parse_day(start)
+        end_ts = export.parse_day(end)
+    except ValueError:
+        return Response(content="Dates must be YYYY-MM-DD", status_code=400)
+    if end_ts is not None:
+        end_ts += 86400
+    batches = export.iter_export_batches(
+        kind, claims["user_id"], start=start_ts, end=end_ts, bot_uuid=bot_id
+    )
+    if format == "parquet":
+        if not export.parquet_available():
+            return Response(content="Parquet export requires pyarrow", status_code=501)
+        return StreamingResponse(
+            export.stream_parquet(kind, batches),
+            media_type="application/vnd.apache.parquet",
+            headers={"Content-Disposition": f"attachment; filename={kind}.parquet"},
+        )
+    return StreamingResponse(
+        export.stream_csv(kind, batches),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={kind}.csv"},
+    )
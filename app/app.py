@@ -1,18 +1,21 @@
 import reflex as rx
 from app.states.auth_state import AuthState
+from app.states.debug_state import DebugState
 from app.components.sidebar import sidebar
 from app.components.app_bar import app_bar
 from app.pages.login import login_page
 from app.pages.register import register_page
 from app.pages.dashboard import dashboard_page
 from app.pages.placeholder_pages import bots_page
-from app.pages.subscription import subscription_page
 from app.pages.settings import settings_page
 from app.pages.analytics_page import analytics_page
 from app.pages.bot_detail_page import bot_detail_page
 from app.pages.forgot_password import forgot_password_page
-from app.pages.reset_password import reset_password_page
-from app.api import api
+from app.database.database import init_db, reset_running_bots
+from app.services import replay
+from app.services.state_backend import install_state_backend
+from app.services.loop_monitor import run_loop_monitor
+from app.api import api as api_router
 
 
 def main_layout(child: rx.Component) -> rx.Component:
@@ -27,10 +30,36 @@ def main_layout(child: rx.Component) -> rx.Component:
     )
 
 
+def verify_email_route() -> rx.Component:
+    from app.pages.verify_email_page import verify_email_page
+
+    return verify_email_page()
+
+
+def reset_password_route() -> rx.Component:
+    from app.pages.reset_password import reset_password_page
+
+    return reset_password_page()
+
+
+def subscription_route() -> rx.Component:
+    from app.pages.subscription import subscription_page
+
+    return main_layout(subscription_page())
+
+
+def debug_route() -> rx.Component:
+    from app.pages.debug_page import debug_page
+
+    return main_layout(debug_page())
+
+
 def index() -> rx.Component:
     return rx.cond(AuthState.is_logged_in, main_layout(dashboard_page()), login_page())
 
 
+replay.isolate_database()
+init_db()
 app = rx.App(
     theme=rx.theme(appearance="light"),
     head_components=[
@@ -42,15 +71,17 @@ app = rx.App(
         ),
     ],
 )
-from app.pages.verify_email_page import verify_email_page
+app.register_lifespan_task(install_state_backend, rx_app=app)
+app.register_lifespan_task(run_loop_monitor)
+app.register_lifespan_task(reset_running_bots)
 
 app.add_page(index, route="/", on_load=AuthState.check_login)
 app.add_page(login_page, route="/login")
 app.add_page(register_page, route="/register")
 app.add_page(forgot_password_page, route="/forgot-password")
-app.add_page(reset_password_page, route="/reset-password/[token]")
+app.add_page(reset_password_route, route="/reset-password/[token]")
 app.add_page(
-    verify_email_page, route="/verify-email/[token]", on_load=AuthState.verify_email
+    verify_email_route, route="/verify-email/[token]", on_load=AuthState.verify_email
 )
 app.add_page(
     lambda: main_layout(bots_page()), route="/bots", on_load=AuthState.check_login
@@ -70,12 +101,14 @@ app.add_page(
     route="/settings",
     on_load=AuthState.check_login,
 )
-from app.pages.subscription import subscription_page
-from app.api import api as api_router
-
 app.add_page(
-    lambda: main_layout(subscription_page()),
+    subscription_route,
     route="/subscription",
     on_load=AuthState.check_login,
 )
+app.add_page(
+    debug_route,
+    route="/debug",
+    on_load=[AuthState.check_admin, DebugState.load],
+)
 app.api_router = api_router
\ No newline at end of file
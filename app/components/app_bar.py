@@ -77,8 +77,20 @@ def app_bar() -> rx.Component:
                             ),
                             class_name="flex justify-between items-center border-b",
                         ),
-                        rx.foreach(
-                            NotificationState.recent_notifications, notification_item
+                        rx.el.div(
+                            rx.foreach(
+                                NotificationState.notifications, notification_item
+                            ),
+                            rx.cond(
+                                NotificationState.has_more_notifications,
+                                rx.el.button(
+                                    "Load more",
+                                    on_click=NotificationState.load_more_notifications,
+                                    class_name="w-full px-4 py-2 text-sm font-medium text-teal-600 hover:bg-gray-50 rounded-md",
+                                ),
+                                None,
+                            ),
+                            class_name="max-h-96 overflow-y-auto",
                         ),
                         rx.cond(
                             NotificationState.notifications.length() == 0,
@@ -99,4 +111,5 @@ def app_bar() -> rx.Component:
             class_name="flex items-center space-x-2",
         ),
         class_name="flex items-center justify-between h-16 px-4 bg-white/70 backdrop-blur-md border-b border-gray-200 shadow-sm sticky top-0 z-40",
+        on_mount=NotificationState.load_notifications,
     )
\ No newline at end of file
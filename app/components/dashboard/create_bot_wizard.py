@@ -42,6 +42,7 @@ def config_input_field(
             type=type,
             name=name,
             id=name,
+            key=f"{name}-{BotsState.config_revision}",
             on_change=lambda value: BotsState.update_bot_config_field(name, value),
             class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm placeholder-gray-400 focus:outline-none focus:ring-teal-500 focus:border-teal-500 sm:text-sm",
             default_value=value.to_string(),
@@ -49,6 +50,52 @@ def config_input_field(
     )
 
 
+def suggestion_row(suggestion: rx.Var, index: int) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(
+                f"Deviation {suggestion['config']['price_deviation'].to_string()}% x{suggestion['config']['safety_order_step_scale'].to_string()}, volume x{suggestion['config']['safety_order_volume_scale'].to_string()}, {suggestion['config']['max_safety_orders'].to_string()} SOs, TP {suggestion['config']['take_profit_percentage'].to_string()}%",
+                class_name="text-sm font-medium text-gray-800",
+            ),
+            rx.el.p(
+                f"P/L ${suggestion['total_pnl'].to_string()} over {suggestion['deals'].to_string()} deals, drawdown ${suggestion['max_drawdown'].to_string()}, needs ${suggestion['capital_required'].to_string()}",
+                class_name="text-xs text-gray-500",
+            ),
+        ),
+        rx.el.button(
+            "Apply",
+            type="button",
+            on_click=BotsState.apply_suggestion(index),
+            class_name="px-3 py-1 text-sm bg-teal-600 text-white rounded-md hover:bg-teal-700",
+        ),
+        class_name="flex items-center justify-between gap-4 p-2 border rounded-md",
+    )
+
+
+def suggestions_panel() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(
+                "Backtest parameter ranges on recent market data for this pair.",
+                class_name="text-xs text-gray-500",
+            ),
+            rx.el.button(
+                rx.cond(BotsState.is_suggesting, "Backtesting...", "Suggest settings"),
+                type="button",
+                on_click=BotsState.suggest_settings,
+                disabled=BotsState.is_suggesting,
+                class_name="px-3 py-1 text-sm border border-teal-600 text-teal-700 rounded-md hover:bg-teal-50",
+            ),
+            class_name="flex items-center justify-between gap-4",
+        ),
+        rx.el.div(
+            rx.foreach(BotsState.config_suggestions, suggestion_row),
+            class_name="space-y-2 mt-2",
+        ),
+        class_name="p-4 bg-gray-50 rounded-md",
+    )
+
+
 def create_bot_wizard() -> rx.Component:
     return rx.radix.primitives.dialog.root(
         rx.radix.primitives.dialog.content(
@@ -187,6 +234,7 @@ def create_bot_wizard() -> rx.Component:
                         BotsState.current_bot_config["take_profit_percentage"],
                     ),
                 ),
+                suggestions_panel(),
                 rx.el.div(
                     rx.el.button(
                         "Cancel",
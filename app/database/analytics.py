@@ -0,0 +1,71 @@
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from . import models
+from .rollups import SECONDS_PER_DAY
+
+VOLUME_ORDER_TYPES = ("base", "safety")
+
+
+def _completed_deals(db: Session, user_id: int, *columns):
+    return (
+        db.query(*columns)
+        .select_from(models.Deal)
+        .join(models.Bot, models.Bot.id == models.Deal.bot_id)
+        .filter(
+            models.Bot.user_id == user_id,
+            models.Deal.status == "completed",
+            models.Deal.close_time.isnot(None),
+        )
+    )
+
+
+def deal_metrics(db: Session, user_id: int) -> dict:
+    total_deals, total_pnl, profitable_deals, total_duration = _completed_deals(
+        db,
+        user_id,
+        func.count(models.Deal.id),
+        func.coalesce(func.sum(models.Deal.realized_pnl), 0.0),
+        func.coalesce(func.sum(case((models.Deal.realized_pnl > 0, 1), else_=0)), 0),
+        func.coalesce(
+            func.sum(models.Deal.close_time - models.Deal.entry_time), 0.0
+        ),
+    ).one()
+    return {
+        "total_deals": total_deals,
+        "total_pnl": total_pnl,
+        "win_rate": profitable_deals / total_deals * 100 if total_deals else 0.0,
+        "average_deal_duration": total_duration / total_deals if total_deals else 0.0,
+    }
+
+
+def deal_volume(db: Session, user_id: int) -> float:
+    return (
+        _completed_deals(
+            db,
+            user_id,
+            func.coalesce(func.sum(models.Order.price * models.Order.quantity), 0.0),
+        )
+        .join(models.Order, models.Order.deal_id == models.Deal.id)
+        .filter(
+            models.Order.status == "filled",
+            models.Order.order_type.in_(VOLUME_ORDER_TYPES),
+        )
+        .scalar()
+    )
+
+
+def daily_pnl(db: Session, user_id: int) -> list[tuple[int, float]]:
+    return (
+        db.query(models.DailyPnl.day, func.sum(models.DailyPnl.realized_pnl))
+        .filter(models.DailyPnl.user_id == user_id)
+        .group_by(models.DailyPnl.day)
+        .order_by(models.DailyPnl.day)
+        .all()
+    )
+
+
+def user_analytics(db: Session, user_id: int) -> dict:
+    metrics = deal_metrics(db, user_id)
+    metrics["total_volume"] = deal_volume(db, user_id)
+    metrics["daily_pnl"] = daily_pnl(db, user_id)
+    return metrics
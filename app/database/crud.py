@@ -1,9 +1,22 @@
+from sqlalchemy import and_, case, func, or_
 from sqlalchemy.orm import Session
-from . import models, security
+from . import models, performance, rollups, security
 import json
+import time
 import uuid
 from datetime import datetime, timedelta
 
+NOTIFICATION_CAPACITY = 100
+RUNNING_BOT_STATUSES = (
+    "starting",
+    "monitoring",
+    "placing_order",
+    "in_position",
+    "closing",
+    "waiting_for_balance",
+    "active",
+)
+
 
 def get_user_by_email(db: Session, email: str):
     return db.query(models.User).filter(models.User.email == email).first()
@@ -79,6 +92,13 @@ def create_bot(db: Session, user_id: int, bot_data: dict) -> models.Bot:
         user_id=user_id,
     )
     db.add(db_bot)
+    adjust_user_summary(
+        db,
+        user_id,
+        total_bots=1,
+        active_bots=1 if db_bot.status in RUNNING_BOT_STATUSES else 0,
+        total_pnl=db_bot.total_pnl or 0.0,
+    )
     db.commit()
     db.refresh(db_bot)
     return db_bot
@@ -92,11 +112,18 @@ def get_bot_by_uuid(db: Session, bot_uuid: str) -> models.Bot | None:
     return db.query(models.Bot).filter(models.Bot.uuid == bot_uuid).first()
 
 
-def update_bot_status(db: Session, bot_uuid: str, status: str):
-    bot = get_bot_by_uuid(db, bot_uuid)
-    if bot:
+def update_bot_statuses(db: Session, statuses: dict[str, str]):
+    bots = db.query(models.Bot).filter(models.Bot.uuid.in_(list(statuses))).all()
+    for bot in bots:
+        status = statuses[bot.uuid]
+        if bot.status == status:
+            continue
+        was_running = bot.status in RUNNING_BOT_STATUSES
+        is_running = status in RUNNING_BOT_STATUSES
         bot.status = status
-        db.commit()
+        if was_running != is_running:
+            adjust_user_summary(db, bot.user_id, active_bots=1 if is_running else -1)
+    db.commit()
 
 
 def update_bot_stats(
@@ -106,16 +133,87 @@ def update_bot_stats(
     if bot:
         bot.total_pnl += pnl_delta
         bot.deals_count += deals_increment
+        adjust_user_summary(db, bot.user_id, total_pnl=pnl_delta)
         db.commit()
 
 
 def delete_bot(db: Session, bot_uuid: str):
     bot = get_bot_by_uuid(db, bot_uuid)
     if bot:
+        adjust_user_summary(
+            db,
+            bot.user_id,
+            total_bots=-1,
+            active_bots=-1 if bot.status in RUNNING_BOT_STATUSES else 0,
+            total_pnl=-(bot.total_pnl or 0.0),
+        )
+        rollups.delete_bot_rollups(db, bot.id)
+        performance.delete_bot_performance(db, bot.id)
         db.delete(bot)
         db.commit()
 
 
+def get_user_summary(db: Session, user_id: int) -> models.UserSummary:
+    summary = db.get(models.UserSummary, user_id)
+    if summary is None:
+        summary = rebuild_user_summary(db, user_id)
+    return summary
+
+
+def rebuild_user_summary(db: Session, user_id: int) -> models.UserSummary:
+    total_bots, active_bots, total_pnl = (
+        db.query(
+            func.count(models.Bot.id),
+            func.sum(
+                case((models.Bot.status.in_(RUNNING_BOT_STATUSES), 1), else_=0)
+            ),
+            func.sum(models.Bot.total_pnl),
+        )
+        .filter(models.Bot.user_id == user_id)
+        .one()
+    )
+    summary = db.get(models.UserSummary, user_id) or models.UserSummary(
+        user_id=user_id, account_balance=0.0
+    )
+    summary.total_bots = total_bots or 0
+    summary.active_bots = active_bots or 0
+    summary.total_pnl = total_pnl or 0.0
+    summary.updated_at = datetime.utcnow()
+    db.add(summary)
+    db.commit()
+    return summary
+
+
+def adjust_user_summary(
+    db: Session,
+    user_id: int | None,
+    total_bots: int = 0,
+    active_bots: int = 0,
+    total_pnl: float = 0.0,
+):
+    if user_id is None:
+        return
+    db.query(models.UserSummary).filter(
+        models.UserSummary.user_id == user_id
+    ).update(
+        {
+            models.UserSummary.total_bots: models.UserSummary.total_bots + total_bots,
+            models.UserSummary.active_bots: models.UserSummary.active_bots
+            + active_bots,
+            models.UserSummary.total_pnl: models.UserSummary.total_pnl + total_pnl,
+            models.UserSummary.updated_at: datetime.utcnow(),
+        },
+        synchronize_session=False,
+    )
+
+
+def set_user_account_balance(db: Session, user_id: int, balance: float):
+    summary = get_user_summary(db, user_id)
+    summary.account_balance = balance
+    summary.updated_at = datetime.utcnow()
+    db.commit()
+
+
 def create_deal(db: Session, bot_id: int, deal_data: dict) -> models.Deal:
     orders_data = deal_data.pop("orders", [])
     db_deal = models.Deal(bot_id=bot_id, **deal_data)
@@ -134,15 +232,97 @@ def get_deal_by_bot_id(db: Session, bot_id: int, active_only: bool = False):
     return query.first()
 
 
-def get_deals_by_bot_id(db: Session, bot_id: int) -> list[models.Deal]:
-    return (
+def get_deals_by_bot_id(
+    db: Session, bot_id: int, limit: int | None = None
+) -> list[models.Deal]:
+    query = (
         db.query(models.Deal)
         .filter(models.Deal.bot_id == bot_id)
         .order_by(models.Deal.entry_time.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def get_deals_page(
+    db: Session,
+    bot_id: int,
+    limit: int,
+    before: tuple[float, int] | None = None,
+) -> list[models.Deal]:
+    query = db.query(models.Deal).filter(models.Deal.bot_id == bot_id)
+    if before is not None:
+        entry_time, deal_id = before
+        query = query.filter(
+            or_(
+                models.Deal.entry_time < entry_time,
+                and_(models.Deal.entry_time == entry_time, models.Deal.id < deal_id),
+            )
+        )
+    return (
+        query.order_by(models.Deal.entry_time.desc(), models.Deal.id.desc())
+        .limit(limit)
         .all()
     )
 
 
+def count_deals_by_bot_id(db: Session, bot_id: int) -> int:
+    return (
+        db.query(func.count(models.Deal.id))
+        .filter(models.Deal.bot_id == bot_id)
+        .scalar()
+        or 0
+    )
+
+
+def get_deals_for_export(
+    db: Session,
+    user_id: int,
+    limit: int,
+    after_id: int = 0,
+    start: float | None = None,
+    end: float | None = None,
+    bot_uuid: str | None = None,
+) -> list[tuple[models.Deal, str]]:
+    query = (
+        db.query(models.Deal, models.Bot.uuid)
+        .join(models.Bot, models.Bot.id == models.Deal.bot_id)
+        .filter(models.Bot.user_id == user_id, models.Deal.id > after_id)
+    )
+    if start is not None:
+        query = query.filter(models.Deal.entry_time >= start)
+    if end is not None:
+        query = query.filter(models.Deal.entry_time < end)
+    if bot_uuid:
+        query = query.filter(models.Bot.uuid == bot_uuid)
+    return query.order_by(models.Deal.id).limit(limit).all()
+
+
+def get_orders_for_export(
+    db: Session,
+    user_id: int,
+    limit: int,
+    after_id: int = 0,
+    start: float | None = None,
+    end: float | None = None,
+    bot_uuid: str | None = None,
+) -> list[tuple[models.Order, str]]:
+    query = (
+        db.query(models.Order, models.Bot.uuid)
+        .join(models.Deal, models.Deal.id == models.Order.deal_id)
+        .join(models.Bot, models.Bot.id == models.Deal.bot_id)
+        .filter(models.Bot.user_id == user_id, models.Order.id > after_id)
+    )
+    if start is not None:
+        query = query.filter(models.Order.timestamp >= start)
+    if end is not None:
+        query = query.filter(models.Order.timestamp < end)
+    if bot_uuid:
+        query = query.filter(models.Bot.uuid == bot_uuid)
+    return query.order_by(models.Order.id).limit(limit).all()
+
+
 def update_deal(db: Session, deal_id: int, deal_data: dict):
     deal = db.query(models.Deal).filter(models.Deal.id == deal_id).first()
     if deal:
@@ -151,17 +331,31 @@ def update_deal(db: Session, deal_id: int, deal_data: dict):
         db.commit()
 
 
-def close_deal(db: Session, deal_id: int, realized_pnl: float, close_time: float):
+def close_deal(
+    db: Session,
+    deal_id: int,
+    realized_pnl: float,
+    close_time: float,
+    order_data: dict | None = None,
+):
     deal = db.query(models.Deal).filter(models.Deal.id == deal_id).first()
     if deal:
+        if order_data is not None:
+            db.add(order_row(deal_id, order_data))
+        already_closed = deal.status == "completed"
         deal.status = "completed"
         deal.realized_pnl = realized_pnl
         deal.close_time = close_time
+        if not already_closed and deal.bot.user_id is not None:
+            rollups.add_daily_pnl(
+                db, deal.bot.user_id, deal.bot_id, close_time, realized_pnl
+            )
+            performance.record_closed_deal(db, deal)
         db.commit()
 
 
-def create_order(db: Session, deal_id: int, order_data: dict) -> models.Order:
-    db_order = models.Order(
+def order_row(deal_id: int, order_data: dict) -> models.Order:
+    return models.Order(
         deal_id=deal_id,
         order_id_str=order_data["order_id"],
         timestamp=order_data["timestamp"],
@@ -171,6 +365,10 @@ def create_order(db: Session, deal_id: int, order_data: dict) -> models.Order:
         order_type=order_data["order_type"],
         status=order_data["status"],
     )
+
+
+def create_order(db: Session, deal_id: int, order_data: dict) -> models.Order:
+    db_order = order_row(deal_id, order_data)
     db.add(db_order)
     db.commit()
     db.refresh(db_order)
@@ -207,13 +405,102 @@ def update_order_status(
 
 
 def get_all_running_bots(db: Session) -> list[models.Bot]:
-    running_statuses = [
-        "starting",
-        "monitoring",
-        "placing_order",
-        "in_position",
-        "closing",
-        "waiting_for_balance",
-        "active",
-    ]
-    return db.query(models.Bot).filter(models.Bot.status.in_(running_statuses)).all()
\ No newline at end of file
+    return (
+        db.query(models.Bot).filter(models.Bot.status.in_(RUNNING_BOT_STATUSES)).all()
+    )
+
+
+def reset_running_bots(db: Session, status: str = "stopped") -> int:
+    bots = get_all_running_bots(db)
+    for bot in bots:
+        bot.status = status
+    db.flush()
+    for user_id in {bot.user_id for bot in bots}:
+        rebuild_user_summary(db, user_id)
+    db.commit()
+    return len(bots)
+
+
+def get_notification_counter(db: Session, user_id: int) -> models.NotificationCounter:
+    counter = db.get(models.NotificationCounter, user_id)
+    if counter is None:
+        counter = models.NotificationCounter(user_id=user_id, next_seq=0, unread_count=0)
+        db.add(counter)
+        db.flush()
+    return counter
+
+
+def push_notification(
+    db: Session,
+    user_id: int,
+    message: str,
+    type: str = "info",
+    capacity: int = NOTIFICATION_CAPACITY,
+) -> tuple[models.Notification, int]:
+    counter = get_notification_counter(db, user_id)
+    seq = counter.next_seq
+    slot = seq % capacity
+    notification = (
+        db.query(models.Notification)
+        .filter(
+            models.Notification.user_id == user_id, models.Notification.slot == slot
+        )
+        .first()
+    )
+    if notification is None:
+        notification = models.Notification(user_id=user_id, slot=slot)
+        db.add(notification)
+    elif not notification.is_read:
+        counter.unread_count -= 1
+    notification.seq = seq
+    notification.created_at = time.time()
+    notification.type = type
+    notification.message = message
+    notification.is_read = False
+    counter.next_seq = seq + 1
+    counter.unread_count += 1
+    unread_count = counter.unread_count
+    db.commit()
+    db.refresh(notification)
+    return notification, unread_count
+
+
+def get_notifications_page(
+    db: Session, user_id: int, limit: int, before_seq: int | None = None
+) -> list[models.Notification]:
+    query = db.query(models.Notification).filter(
+        models.Notification.user_id == user_id
+    )
+    if before_seq is not None:
+        query = query.filter(models.Notification.seq < before_seq)
+    return query.order_by(models.Notification.seq.desc()).limit(limit).all()
+
+
+def mark_notification_read(db: Session, user_id: int, seq: int):
+    notification = (
+        db.query(models.Notification)
+        .filter(models.Notification.user_id == user_id, models.Notification.seq == seq)
+        .first()
+    )
+    if notification and not notification.is_read:
+        notification.is_read = True
+        counter = get_notification_counter(db, user_id)
+        counter.unread_count = max(counter.unread_count - 1, 0)
+        db.commit()
+
+
+def mark_all_notifications_read(db: Session, user_id: int):
+    db.query(models.Notification).filter(
+        models.Notification.user_id == user_id,
+        models.Notification.is_read.is_(False),
+    ).update({models.Notification.is_read: True}, synchronize_session=False)
+    get_notification_counter(db, user_id).unread_count = 0
+    db.commit()
+
+
+def clear_notifications(db: Session, user_id: int):
+    db.query(models.Notification).filter(
+        models.Notification.user_id == user_id
+    ).delete(synchronize_session=False)
+    get_notification_counter(db, user_id).unread_count = 0
+    db.commit()
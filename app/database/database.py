@@ -1,12 +1,15 @@
 import os
+import logging
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from app.services import metrics
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./test.db")
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+metrics.instrument_sessions(SessionLocal)
 
 
 def get_db():
@@ -14,4 +17,27 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def init_db():
+    from . import models
+
+    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def reset_running_bots():
+    from . import crud
+
+    db = SessionLocal()
+    try:
+        count = crud.reset_running_bots(db)
+    finally:
+        db.close()
+    if count:
+        logging.info(
+            f"Marked {count} bots left running by a previous process as stopped."
+        )
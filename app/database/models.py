@@ -8,6 +8,8 @@ from sqlalchemy import (
     JSON,
     LargeBinary,
     DateTime,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -40,7 +42,7 @@ class Bot(Base):
     config = Column(JSON)
     total_pnl = Column(Float, default=0.0)
     deals_count = Column(Integer, default=0)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     owner = relationship("User", back_populates="bots")
     deals = relationship("Deal", back_populates="bot", cascade="all, delete-orphan")
 
@@ -58,6 +60,17 @@ class Deal(Base):
     bot_id = Column(Integer, ForeignKey("bots.id"))
     bot = relationship("Bot", back_populates="deals")
     orders = relationship("Order", back_populates="deal", cascade="all, delete-orphan")
+    __table_args__ = (
+        Index("ix_deals_bot_entry_time_id", "bot_id", "entry_time", "id"),
+        Index(
+            "ix_deals_bot_status_close_time",
+            "bot_id",
+            "status",
+            "close_time",
+            "entry_time",
+            "realized_pnl",
+        ),
+    )
 
 
 class Order(Base):
@@ -71,4 +84,67 @@ class Order(Base):
     order_type = Column(String)
     status = Column(String)
     deal_id = Column(Integer, ForeignKey("deals.id"))
-    deal = relationship("Deal", back_populates="orders")
\ No newline at end of file
+    deal = relationship("Deal", back_populates="orders")
+    __table_args__ = (Index("ix_orders_deal_status", "deal_id", "status"),)
+
+
+class UserSummary(Base):
+    __tablename__ = "user_summaries"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_bots = Column(Integer, default=0, nullable=False)
+    active_bots = Column(Integer, default=0, nullable=False)
+    total_pnl = Column(Float, default=0.0, nullable=False)
+    account_balance = Column(Float, default=0.0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+class DailyPnl(Base):
+    __tablename__ = "daily_pnl"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    bot_id = Column(Integer, ForeignKey("bots.id"), nullable=False)
+    day = Column(Integer, nullable=False)
+    realized_pnl = Column(Float, default=0.0, nullable=False)
+    deals_count = Column(Integer, default=0, nullable=False)
+    __table_args__ = (
+        UniqueConstraint("user_id", "bot_id", "day", name="uq_daily_pnl_user_bot_day"),
+        Index("ix_daily_pnl_user_day", "user_id", "day", "realized_pnl"),
+    )
+
+
+class BotPerformance(Base):
+    __tablename__ = "bot_performance"
+    bot_id = Column(Integer, ForeignKey("bots.id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
+    deals_count = Column(Integer, default=0, nullable=False)
+    total_pnl = Column(Float, default=0.0, nullable=False)
+    peak_pnl = Column(Float, default=0.0, nullable=False)
+    max_drawdown = Column(Float, default=0.0, nullable=False)
+    max_safety_orders = Column(Integer, default=0, nullable=False)
+    total_duration = Column(Float, default=0.0, nullable=False)
+    pnl_histogram = Column(JSON, nullable=False)
+    utilization = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+
+class Notification(Base):
+    __tablename__ = "notifications"
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    slot = Column(Integer, nullable=False)
+    seq = Column(Integer, nullable=False)
+    created_at = Column(Float, nullable=False)
+    type = Column(String, default="info", nullable=False)
+    message = Column(String, nullable=False)
+    is_read = Column(Boolean, default=False, nullable=False)
+    __table_args__ = (
+        UniqueConstraint("user_id", "slot", name="uq_notifications_user_slot"),
+        Index("ix_notifications_user_seq", "user_id", "seq"),
+    )
+
+
+class NotificationCounter(Base):
+    __tablename__ = "notification_counters"
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    next_seq = Column(Integer, default=0, nullable=False)
+    unread_count = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,153 @@
+import bisect
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from . import models
+from app.services.dca import max_bot_capital
+
+PNL_HISTOGRAM_EDGES = (-5.0, -2.0, -1.0, 0.0, 1.0, 2.0, 5.0)
+UTILIZATION_HISTORY = 100
+
+performance_cache: dict[int, dict] = {}
+
+
+def histogram_labels() -> list[str]:
+    edges = PNL_HISTOGRAM_EDGES
+    return (
+        [f"< {edges[0]:g}%"]
+        + [f"{lo:g}% to {hi:g}%" for lo, hi in zip(edges, edges[1:])]
+        + [f">= {edges[-1]:g}%"]
+    )
+
+
+def count_filled_safety_orders(db: Session, deal_id: int) -> int:
+    return (
+        db.query(models.Order)
+        .filter(
+            models.Order.deal_id == deal_id,
+            models.Order.status == "filled",
+            models.Order.order_type == "safety",
+        )
+        .count()
+    )
+
+
+def _new_performance(bot: models.Bot) -> models.BotPerformance:
+    return models.BotPerformance(
+        bot_id=bot.id,
+        user_id=bot.user_id,
+        deals_count=0,
+        total_pnl=0.0,
+        peak_pnl=0.0,
+        max_drawdown=0.0,
+        max_safety_orders=0,
+        total_duration=0.0,
+        pnl_histogram=[0] * (len(PNL_HISTOGRAM_EDGES) + 1),
+        utilization=[],
+    )
+
+
+def _apply_deal(
+    perf: models.BotPerformance,
+    deal: models.Deal,
+    bot_capital: float,
+    safety_orders_used: int,
+):
+    deal_cost = deal.average_entry_price * deal.total_quantity
+    perf.deals_count += 1
+    perf.total_pnl += deal.realized_pnl
+    perf.peak_pnl = max(perf.peak_pnl, perf.total_pnl)
+    perf.max_drawdown = max(perf.max_drawdown, perf.peak_pnl - perf.total_pnl)
+    perf.max_safety_orders = max(perf.max_safety_orders, safety_orders_used)
+    perf.total_duration += deal.close_time - deal.entry_time
+    pnl_percentage = deal.realized_pnl / deal_cost * 100 if deal_cost > 0 else 0.0
+    histogram = list(perf.pnl_histogram)
+    histogram[bisect.bisect_right(PNL_HISTOGRAM_EDGES, pnl_percentage)] += 1
+    perf.pnl_histogram = histogram
+    utilization = deal_cost / bot_capital * 100 if bot_capital > 0 else 0.0
+    perf.utilization = (
+        list(perf.utilization) + [[deal.close_time, round(utilization, 2)]]
+    )[-UTILIZATION_HISTORY:]
+    perf.updated_at = datetime.utcnow()
+
+
+def record_closed_deal(db: Session, deal: models.Deal):
+    bot = deal.bot
+    if bot is None or bot.user_id is None:
+        return
+    performance_cache.pop(bot.id, None)
+    perf = db.get(models.BotPerformance, bot.id)
+    if perf is None:
+        return
+    _apply_deal(
+        perf,
+        deal,
+        max_bot_capital(bot.config or {}),
+        count_filled_safety_orders(db, deal.id),
+    )
+
+
+def delete_bot_performance(db: Session, bot_id: int):
+    db.query(models.BotPerformance).filter(
+        models.BotPerformance.bot_id == bot_id
+    ).delete(synchronize_session=False)
+    performance_cache.pop(bot_id, None)
+
+
+def rebuild_bot_performance(db: Session, bot: models.Bot) -> models.BotPerformance:
+    existing = db.get(models.BotPerformance, bot.id)
+    if existing is not None:
+        db.delete(existing)
+        db.flush()
+    perf = _new_performance(bot)
+    bot_capital = max_bot_capital(bot.config or {})
+    deals = (
+        db.query(models.Deal)
+        .filter(
+            models.Deal.bot_id == bot.id,
+            models.Deal.status == "completed",
+            models.Deal.close_time.isnot(None),
+        )
+        .order_by(models.Deal.close_time)
+        .yield_per(1000)
+    )
+    safety_counts = dict(
+        db.query(models.Order.deal_id, func.count(models.Order.id))
+        .join(models.Deal, models.Deal.id == models.Order.deal_id)
+        .filter(
+            models.Deal.bot_id == bot.id,
+            models.Order.status == "filled",
+            models.Order.order_type == "safety",
+        )
+        .group_by(models.Order.deal_id)
+        .all()
+    )
+    for deal in deals:
+        _apply_deal(perf, deal, bot_capital, safety_counts.get(deal.id, 0))
+    db.add(perf)
+    db.commit()
+    performance_cache.pop(bot.id, None)
+    return perf
+
+
+def performance_snapshot(perf: models.BotPerformance) -> dict:
+    return {
+        "deals_count": perf.deals_count,
+        "total_pnl": perf.total_pnl,
+        "max_drawdown": perf.max_drawdown,
+        "max_safety_orders": perf.max_safety_orders,
+        "average_deal_duration": (
+            perf.total_duration / perf.deals_count if perf.deals_count else 0.0
+        ),
+        "pnl_histogram": list(perf.pnl_histogram),
+        "utilization": [list(point) for point in perf.utilization],
+    }
+
+
+def get_bot_performance(db: Session, bot: models.Bot) -> dict:
+    if bot.id not in performance_cache:
+        perf = db.get(models.BotPerformance, bot.id)
+        if perf is None:
+            perf = rebuild_bot_performance(db, bot)
+        performance_cache[bot.id] = performance_snapshot(perf)
+    return performance_cache[bot.id]
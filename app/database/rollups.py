@@ -0,0 +1,106 @@
+import argparse
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.orm import Session
+from . import models, performance
+
+SECONDS_PER_DAY = 86400
+
+
+def day_bucket(timestamp: float) -> int:
+    return int(timestamp // SECONDS_PER_DAY)
+
+
+def add_daily_pnl(
+    db: Session, user_id: int, bot_id: int, close_time: float, realized_pnl: float
+):
+    day = day_bucket(close_time)
+    row = (
+        db.query(models.DailyPnl)
+        .filter(
+            models.DailyPnl.user_id == user_id,
+            models.DailyPnl.bot_id == bot_id,
+            models.DailyPnl.day == day,
+        )
+        .first()
+    )
+    if row is None:
+        row = models.DailyPnl(
+            user_id=user_id, bot_id=bot_id, day=day, realized_pnl=0.0, deals_count=0
+        )
+        db.add(row)
+    row.realized_pnl += realized_pnl
+    row.deals_count += 1
+
+
+def delete_bot_rollups(db: Session, bot_id: int):
+    db.query(models.DailyPnl).filter(models.DailyPnl.bot_id == bot_id).delete(
+        synchronize_session=False
+    )
+
+
+def rebuild_daily_pnl(db: Session, user_id: int | None = None) -> int:
+    delete = db.query(models.DailyPnl)
+    if user_id is not None:
+        delete = delete.filter(models.DailyPnl.user_id == user_id)
+    delete.delete(synchronize_session=False)
+    day = cast(models.Deal.close_time / SECONDS_PER_DAY, Integer)
+    query = (
+        db.query(
+            models.Bot.user_id,
+            models.Deal.bot_id,
+            day,
+            func.sum(models.Deal.realized_pnl),
+            func.count(models.Deal.id),
+        )
+        .join(models.Bot, models.Bot.id == models.Deal.bot_id)
+        .filter(
+            models.Deal.status == "completed",
+            models.Deal.close_time.isnot(None),
+            models.Bot.user_id.isnot(None),
+        )
+        .group_by(models.Bot.user_id, models.Deal.bot_id, day)
+    )
+    if user_id is not None:
+        query = query.filter(models.Bot.user_id == user_id)
+    rows = [
+        {
+            "user_id": owner_id,
+            "bot_id": bot_id,
+            "day": bucket,
+            "realized_pnl": pnl,
+            "deals_count": count,
+        }
+        for owner_id, bot_id, bucket, pnl, count in query.all()
+    ]
+    if rows:
+        db.execute(models.DailyPnl.__table__.insert(), rows)
+    db.commit()
+    return len(rows)
+
+
+def main():
+    from .database import SessionLocal, init_db
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild daily P/L rollups and bot performance from completed deals."
+    )
+    parser.add_argument("--user-id", type=int, default=None)
+    args = parser.parse_args()
+    init_db()
+    db = SessionLocal()
+    try:
+        count = rebuild_daily_pnl(db, args.user_id)
+        print(f"Rebuilt {count} daily P/L rollup rows.")
+        bots = db.query(models.Bot).filter(models.Bot.user_id.isnot(None))
+        if args.user_id is not None:
+            bots = bots.filter(models.Bot.user_id == args.user_id)
+        bots = bots.all()
+        for bot in bots:
+            performance.rebuild_bot_performance(db, bot)
+        print(f"Rebuilt performance metrics for {len(bots)} bots.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
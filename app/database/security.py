@@ -1,10 +1,15 @@
-from cryptography.fernet import Fernet
 import os
-import bcrypt
+import json
 import logging
+from typing import TYPE_CHECKING
 
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+
+def get_fernet() -> "Fernet":
+    from cryptography.fernet import Fernet
 
-def get_fernet() -> Fernet:
     key = os.environ.get("ENCRYPTION_KEY")
     if not key:
         logging.warning(
@@ -25,9 +30,26 @@ def decrypt_data(encrypted_data: bytes) -> str:
     return f.decrypt(encrypted_data).decode()
 
 
+def create_signed_token(payload: dict) -> str:
+    return get_fernet().encrypt(json.dumps(payload).encode()).decode()
+
+
+def read_signed_token(token: str, max_age: int) -> dict | None:
+    from cryptography.fernet import InvalidToken
+
+    try:
+        return json.loads(get_fernet().decrypt(token.encode(), ttl=max_age))
+    except (InvalidToken, ValueError):
+        return None
+
+
 def hash_password(password: str) -> str:
+    import bcrypt
+
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    import bcrypt
+
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
\ No newline at end of file
@@ -57,6 +57,10 @@ def bot_performance_table() -> rx.Component:
         {"key": "status", "label": "Status"},
         {"key": "total_pnl", "label": "Total P/L"},
         {"key": "deals_count", "label": "Deals"},
+        {"key": "max_drawdown", "label": "Max Drawdown"},
+        {"key": "max_safety_orders", "label": "Max SOs"},
+        {"key": "average_deal_duration", "label": "Avg. Duration"},
+        {"key": "average_utilization", "label": "Avg. Utilization"},
     ]
     return rx.el.div(
         rx.el.h2("Bot Performance", class_name="text-xl font-bold text-gray-800 mb-4"),
@@ -74,19 +78,41 @@ def bot_performance_table() -> rx.Component:
             ),
             rx.el.tbody(
                 rx.foreach(
-                    BotsState.bots,
+                    AnalyticsState.bot_performance,
                     lambda bot: rx.el.tr(
                         rx.el.td(bot["name"], class_name="border-t px-4 py-2"),
+                        rx.el.td(bot["pair"], class_name="border-t px-4 py-2"),
                         rx.el.td(
-                            bot["config"]["pair"], class_name="border-t px-4 py-2"
+                            BotsState.bot_statuses[bot["bot_id"]],
+                            class_name="border-t px-4 py-2",
                         ),
-                        rx.el.td(bot["status"], class_name="border-t px-4 py-2"),
                         rx.el.td(
                             f"${bot['total_pnl'].to_string()}",
                             class_name="border-t px-4 py-2",
                         ),
                         rx.el.td(bot["deals_count"], class_name="border-t px-4 py-2"),
-                        class_name="hover:bg-gray-50",
+                        rx.el.td(
+                            f"${bot['max_drawdown'].to_string()}",
+                            class_name="border-t px-4 py-2",
+                        ),
+                        rx.el.td(
+                            bot["max_safety_orders"], class_name="border-t px-4 py-2"
+                        ),
+                        rx.el.td(
+                            f"{bot['average_deal_duration'].to_string()} min",
+                            class_name="border-t px-4 py-2",
+                        ),
+                        rx.el.td(
+                            f"{bot['average_utilization'].to_string()}%",
+                            class_name="border-t px-4 py-2",
+                        ),
+                        on_click=AnalyticsState.select_bot(bot["bot_id"]),
+                        class_name=rx.cond(
+                            AnalyticsState.selected_bot_performance["bot_id"]
+                            == bot["bot_id"],
+                            "bg-teal-50 cursor-pointer",
+                            "hover:bg-gray-50 cursor-pointer",
+                        ),
                     ),
                 )
             ),
@@ -96,18 +122,105 @@ def bot_performance_table() -> rx.Component:
     )
 
 
+def selected_bot_charts() -> rx.Component:
+    return rx.cond(
+        AnalyticsState.selected_bot_performance,
+        rx.el.div(
+            rx.el.div(
+                rx.el.h2(
+                    f"P/L Distribution: {AnalyticsState.selected_bot_performance['name']}",
+                    class_name="text-xl font-bold text-gray-800 mb-4",
+                ),
+                rx.recharts.bar_chart(
+                    rx.recharts.cartesian_grid(stroke_dasharray="3 3"),
+                    rx.recharts.x_axis(data_key="bucket"),
+                    rx.recharts.y_axis(allow_decimals=False),
+                    rx.recharts.tooltip(),
+                    rx.recharts.bar(data_key="deals", fill="#14b8a6", name="Deals"),
+                    data=AnalyticsState.selected_bot_performance["pnl_histogram"],
+                    height=300,
+                ),
+                class_name="bg-white p-6 rounded-xl shadow-md",
+            ),
+            rx.el.div(
+                rx.el.h2(
+                    "Capital Utilization per Deal (%)",
+                    class_name="text-xl font-bold text-gray-800 mb-4",
+                ),
+                rx.recharts.line_chart(
+                    rx.recharts.cartesian_grid(stroke_dasharray="3 3"),
+                    rx.recharts.x_axis(data_key="time"),
+                    rx.recharts.y_axis(domain=[0, 100]),
+                    rx.recharts.tooltip(),
+                    rx.recharts.line(
+                        data_key="utilization", stroke="#0ea5e9", name="Utilization"
+                    ),
+                    data=AnalyticsState.selected_bot_performance["utilization"],
+                    height=300,
+                ),
+                class_name="bg-white p-6 rounded-xl shadow-md",
+            ),
+            class_name="grid grid-cols-1 lg:grid-cols-2 gap-6",
+        ),
+    )
+
+
+def export_button(label: str, kind: str) -> rx.Component:
+    return rx.el.button(
+        rx.icon("download", class_name="w-4 h-4 mr-2"),
+        label,
+        on_click=AnalyticsState.export_history(kind),
+        class_name="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md shadow-sm text-white bg-teal-600 hover:bg-teal-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-teal-500",
+    )
+
+
+def export_controls() -> rx.Component:
+    field_class = "px-3 py-2 text-sm bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-teal-500 focus:border-teal-500"
+    return rx.el.div(
+        rx.el.select(
+            rx.foreach(
+                AnalyticsState.export_formats,
+                lambda format: rx.el.option(format.upper(), value=format),
+            ),
+            value=AnalyticsState.export_format,
+            on_change=AnalyticsState.set_export_format,
+            class_name=field_class,
+        ),
+        rx.el.select(
+            rx.el.option("All bots", value=""),
+            rx.foreach(
+                AnalyticsState.bot_performance,
+                lambda bot: rx.el.option(bot["name"], value=bot["bot_id"]),
+            ),
+            value=AnalyticsState.export_bot_id,
+            on_change=AnalyticsState.set_export_bot_id,
+            class_name=field_class,
+        ),
+        rx.el.input(
+            type="date",
+            value=AnalyticsState.export_start,
+            on_change=AnalyticsState.set_export_start,
+            class_name=field_class,
+        ),
+        rx.el.input(
+            type="date",
+            value=AnalyticsState.export_end,
+            on_change=AnalyticsState.set_export_end,
+            class_name=field_class,
+        ),
+        export_button("Export Deals", "deals"),
+        export_button("Export Orders", "orders"),
+        class_name="flex flex-wrap items-center gap-2",
+    )
+
+
 def analytics_page() -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.h1(
                 "Analytics Dashboard", class_name="text-3xl font-bold text-gray-800"
             ),
-            rx.el.button(
-                rx.icon("download", class_name="w-4 h-4 mr-2"),
-                "Export Deals (CSV)",
-                on_click=AnalyticsState.export_deals_csv,
-                class_name="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md shadow-sm text-white bg-teal-600 hover:bg-teal-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-teal-500",
-            ),
+            export_controls(),
             class_name="flex items-center justify-between mb-6",
         ),
         rx.cond(
@@ -147,6 +260,7 @@ def analytics_page() -> rx.Component:
                     ),
                     pnl_chart(),
                     bot_performance_table(),
+                    selected_bot_charts(),
                     class_name="space-y-6",
                 ),
                 rx.el.div(
@@ -163,5 +277,5 @@ def analytics_page() -> rx.Component:
                 ),
             ),
         ),
-        on_mount=AnalyticsState.calculate_analytics,
+        on_mount=[BotsState.load_bots, AnalyticsState.calculate_analytics],
     )
\ No newline at end of file
@@ -1,6 +1,7 @@
 import reflex as rx
 from app.states.bot_state import BotsState
 from app.states.deal_state import DealState
+from app.states.bot_execution_state import BotExecutionState
 
 
 def config_display_item(label: str, value: rx.Var) -> rx.Component:
@@ -11,39 +12,92 @@ def config_display_item(label: str, value: rx.Var) -> rx.Component:
     )
 
 
+def price_chart() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            "Price (1m)",
+            class_name="text-lg font-bold text-gray-800 mb-2",
+        ),
+        rx.cond(
+            BotExecutionState.price_bars.length() > 0,
+            rx.recharts.composed_chart(
+                rx.recharts.cartesian_grid(stroke_dasharray="3 3"),
+                rx.recharts.x_axis(data_key="time"),
+                rx.recharts.y_axis(domain=["auto", "auto"]),
+                rx.recharts.tooltip(),
+                rx.recharts.area(
+                    data_key="high", stroke="#99f6e4", fill="#f0fdfa", name="High"
+                ),
+                rx.recharts.area(
+                    data_key="low", stroke="#99f6e4", fill="#ffffff", name="Low"
+                ),
+                rx.recharts.line(
+                    data_key="close", stroke="#14b8a6", dot=False, name="Close"
+                ),
+                data=BotExecutionState.price_bars,
+                height=250,
+            ),
+            rx.el.p(
+                "Waiting for trades on this pair.",
+                class_name="text-sm text-gray-500",
+            ),
+        ),
+        class_name="bg-white p-6 rounded-xl shadow-md",
+    )
+
+
 def deal_history_table() -> rx.Component:
     return rx.el.div(
-        rx.el.h3("Deal History", class_name="text-lg font-bold text-gray-800 mb-4"),
-        rx.el.table(
-            rx.el.thead(
-                rx.el.tr(
-                    rx.el.th("Entry Time", class_name="px-4 py-2 text-left"),
-                    rx.el.th("Close Time", class_name="px-4 py-2 text-left"),
-                    rx.el.th("Realized P/L", class_name="px-4 py-2 text-left"),
-                    rx.el.th("Status", class_name="px-4 py-2 text-left"),
-                )
+        rx.el.div(
+            rx.el.h3("Deal History", class_name="text-lg font-bold text-gray-800"),
+            rx.el.p(
+                f"Showing {DealState.bot_deals.length()} of {DealState.total_deals_count}",
+                class_name="text-sm text-gray-500",
             ),
-            rx.el.tbody(
-                rx.foreach(
-                    DealState.bot_deals,
-                    lambda deal: rx.el.tr(
-                        rx.el.td(
-                            deal["entry_time"].to_string(),
-                            class_name="border-t px-4 py-2",
-                        ),
-                        rx.el.td(
-                            deal["close_time"].to_string(),
-                            class_name="border-t px-4 py-2",
-                        ),
-                        rx.el.td(
-                            f"${deal['realized_pnl'].to_string()}",
-                            class_name="border-t px-4 py-2",
+            class_name="flex items-center justify-between mb-4",
+        ),
+        rx.el.div(
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("Entry Time", class_name="px-4 py-2 text-left"),
+                        rx.el.th("Close Time", class_name="px-4 py-2 text-left"),
+                        rx.el.th("Realized P/L", class_name="px-4 py-2 text-left"),
+                        rx.el.th("Status", class_name="px-4 py-2 text-left"),
+                    )
+                ),
+                rx.el.tbody(
+                    rx.foreach(
+                        DealState.bot_deals,
+                        lambda deal: rx.el.tr(
+                            rx.el.td(
+                                deal["entry_time"].to_string(),
+                                class_name="border-t px-4 py-2",
+                            ),
+                            rx.el.td(
+                                deal["close_time"].to_string(),
+                                class_name="border-t px-4 py-2",
+                            ),
+                            rx.el.td(
+                                f"${deal['realized_pnl'].to_string()}",
+                                class_name="border-t px-4 py-2",
+                            ),
+                            rx.el.td(deal["status"], class_name="border-t px-4 py-2"),
                         ),
-                        rx.el.td(deal["status"], class_name="border-t px-4 py-2"),
-                    ),
-                )
+                    )
+                ),
+                class_name="w-full text-sm",
+            ),
+            rx.cond(
+                DealState.has_more_deals,
+                rx.el.button(
+                    "Load more",
+                    on_click=DealState.load_more_deals,
+                    class_name="w-full mt-4 px-4 py-2 text-sm font-medium text-teal-600 hover:bg-gray-50 rounded-md",
+                ),
+                None,
             ),
-            class_name="w-full text-sm",
+            class_name="max-h-[32rem] overflow-y-auto",
         ),
         class_name="bg-white p-6 rounded-xl shadow-md mt-6",
     )
@@ -142,21 +196,29 @@ def bot_detail_page() -> rx.Component:
                                     "Total Quantity",
                                     DealState.active_deal["total_quantity"].to_string(),
                                 ),
+                                config_display_item(
+                                    "Last Price",
+                                    BotExecutionState.bot_prices[
+                                        BotsState.selected_bot["id"]
+                                    ].to_string(),
+                                ),
                                 config_display_item(
                                     "Unrealized PNL",
-                                    DealState.active_deal["unrealized_pnl"].to_string(),
+                                    BotExecutionState.bot_unrealized_pnl[
+                                        BotsState.selected_bot["id"]
+                                    ].to_string(),
                                 ),
                                 config_display_item(
                                     "Safety Orders Filled",
-                                    DealState.active_deal["filled_safety_orders"]
-                                    .length()
-                                    .to_string(),
+                                    DealState.active_deal[
+                                        "safety_orders_filled"
+                                    ].to_string(),
                                 ),
                                 config_display_item(
                                     "Safety Orders Pending",
-                                    DealState.active_deal["pending_safety_orders"]
-                                    .length()
-                                    .to_string(),
+                                    DealState.active_deal[
+                                        "safety_orders_pending"
+                                    ].to_string(),
                                 ),
                                 class_name="bg-white p-6 rounded-xl shadow-md",
                             ),
@@ -171,9 +233,16 @@ def bot_detail_page() -> rx.Component:
                     ),
                     class_name="grid grid-cols-1 md:grid-cols-2 gap-6",
                 ),
+                price_chart(),
                 deal_history_table(),
             ),
             rx.el.div("Bot not found or loading...", class_name="text-center p-8"),
         ),
-        on_mount=[BotsState.get_bot_by_id, DealState.get_deals_for_bot],
+        on_mount=[
+            BotsState.load_bots,
+            BotsState.get_bot_by_id,
+            DealState.get_deals_for_bot,
+            BotExecutionState.stream_ui_updates,
+        ],
+        on_unmount=BotExecutionState.stop_ui_updates,
     )
\ No newline at end of file
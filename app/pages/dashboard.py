@@ -23,16 +23,16 @@ def dashboard_page() -> rx.Component:
             overview_card(
                 icon="trending-up",
                 title="Total P/L",
-                value=f"${DashboardState.total_pnl.to_string()}",
+                value=f"${DashboardState.display_pnl}",
                 color="text-blue-600",
             ),
             overview_card(
                 icon="wallet",
                 title="Account Balance",
-                value=f"${DashboardState.account_balance.to_string()}",
+                value=f"${DashboardState.display_balance}",
                 color="text-purple-600",
             ),
             class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6",
         ),
-        on_mount=AuthState.check_login,
+        on_mount=[AuthState.check_login, DashboardState.load_summary],
     )
\ No newline at end of file
@@ -0,0 +1,130 @@
+import reflex as rx
+from app.pages.analytics_page import analytics_stat_card
+from app.states.debug_state import DebugState
+
+
+def lock_stats_table() -> rx.Component:
+    columns = [
+        "Handler",
+        "Acquisitions",
+        "Wait Total (ms)",
+        "Wait Max (ms)",
+        "Hold Total (ms)",
+        "Hold Max (ms)",
+    ]
+    return rx.el.div(
+        rx.el.h2(
+            "State Lock Contention", class_name="text-xl font-bold text-gray-800 mb-4"
+        ),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    rx.foreach(
+                        columns,
+                        lambda col: rx.el.th(col, class_name="px-4 py-2 text-left"),
+                    ),
+                    class_name="bg-gray-50",
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(
+                    DebugState.lock_stats,
+                    lambda stats: rx.el.tr(
+                        rx.el.td(
+                            stats["handler"], class_name="border-t px-4 py-2 font-mono"
+                        ),
+                        rx.el.td(
+                            stats["acquisitions"], class_name="border-t px-4 py-2"
+                        ),
+                        rx.el.td(
+                            stats["wait_total_ms"], class_name="border-t px-4 py-2"
+                        ),
+                        rx.el.td(
+                            stats["wait_max_ms"], class_name="border-t px-4 py-2"
+                        ),
+                        rx.el.td(
+                            stats["hold_total_ms"], class_name="border-t px-4 py-2"
+                        ),
+                        rx.el.td(
+                            stats["hold_max_ms"], class_name="border-t px-4 py-2"
+                        ),
+                    ),
+                )
+            ),
+            class_name="w-full text-sm",
+        ),
+        class_name="bg-white p-6 rounded-xl shadow-md overflow-x-auto",
+    )
+
+
+def slow_callbacks_list() -> rx.Component:
+    return rx.el.div(
+        rx.el.h2("Slow Callbacks", class_name="text-xl font-bold text-gray-800 mb-4"),
+        rx.cond(
+            DebugState.slow_callbacks.length() > 0,
+            rx.el.div(
+                rx.foreach(
+                    DebugState.slow_callbacks,
+                    lambda callback: rx.el.details(
+                        rx.el.summary(
+                            f"{callback['time']} blocked {callback['blocked_ms'].to_string()} ms",
+                            class_name="cursor-pointer text-sm font-medium text-gray-700",
+                        ),
+                        rx.el.pre(
+                            callback["stack"],
+                            class_name="mt-2 p-3 bg-gray-900 text-gray-100 text-xs rounded-md overflow-x-auto",
+                        ),
+                        class_name="border-t py-2",
+                    ),
+                ),
+            ),
+            rx.el.p("No slow callbacks recorded.", class_name="text-sm text-gray-500"),
+        ),
+        class_name="bg-white p-6 rounded-xl shadow-md",
+    )
+
+
+def debug_page() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.h1(
+                "Engine Diagnostics", class_name="text-3xl font-bold text-gray-800"
+            ),
+            rx.el.div(
+                rx.el.button(
+                    rx.icon("refresh-cw", class_name="w-4 h-4 mr-2"),
+                    "Refresh",
+                    on_click=DebugState.load,
+                    class_name="inline-flex items-center px-4 py-2 border border-transparent text-sm font-medium rounded-md shadow-sm text-white bg-teal-600 hover:bg-teal-700",
+                ),
+                rx.el.button(
+                    rx.icon("flame", class_name="w-4 h-4 mr-2"),
+                    "Profile 10s",
+                    on_click=DebugState.download_profile(10),
+                    class_name="inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50",
+                ),
+                rx.el.button(
+                    "Reset",
+                    on_click=DebugState.reset_stats,
+                    class_name="inline-flex items-center px-4 py-2 border border-gray-300 text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50",
+                ),
+                class_name="flex items-center gap-2",
+            ),
+            class_name="flex items-center justify-between mb-6",
+        ),
+        rx.el.div(
+            analytics_stat_card("Loop Lag", DebugState.loop_lag_ms, "timer", "ms"),
+            analytics_stat_card(
+                "Max Loop Lag", DebugState.loop_lag_max_ms, "gauge", "ms"
+            ),
+            analytics_stat_card(
+                "Slow Callbacks", DebugState.slow_callback_count, "triangle-alert"
+            ),
+            class_name="grid grid-cols-1 md:grid-cols-3 gap-6 mb-6",
+        ),
+        rx.el.div(
+            lock_stats_table(),
+            slow_callbacks_list(),
+            class_name="flex flex-col gap-6",
+        ),
+    )
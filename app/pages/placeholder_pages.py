@@ -48,7 +48,7 @@ def bot_card(bot: rx.Var[dict], **props) -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.h3(bot["name"], class_name="text-lg font-semibold text-gray-800"),
-            status_badge(bot["status"]),
+            status_badge(BotsState.bot_statuses[bot["id"]]),
             class_name="flex items-center justify-between",
         ),
         rx.el.div(
@@ -183,5 +183,9 @@ def bots_page() -> rx.Component:
                 class_name="flex flex-col items-center justify-center text-center p-8 bg-white rounded-lg shadow-md",
             ),
         ),
-        on_mount=[AuthState.check_login, ExchangeState.fetch_trading_pairs],
+        on_mount=[
+            AuthState.check_login,
+            BotsState.load_bots,
+            ExchangeState.fetch_trading_pairs,
+        ],
     )
\ No newline at end of file
@@ -0,0 +1,181 @@
+import argparse
+import json
+from typing import TypedDict
+import numpy as np
+from app.services import dca
+
+SEARCH_WINDOW = 512
+
+
+class BacktestResult(TypedDict):
+    deals: int
+    winning_deals: int
+    total_pnl: float
+    unrealized_pnl: float
+    max_capital_deployed: float
+    max_drawdown: float
+    max_safety_orders_used: int
+    average_deal_candles: float
+    open_deal: bool
+
+
+def load_klines_csv(path: str) -> np.ndarray:
+    with open(path) as f:
+        first = f.readline()
+    skip = 0 if first[:1].isdigit() else 1
+    return np.loadtxt(
+        path, delimiter=",", skiprows=skip, usecols=(0, 1, 2, 3, 4, 5), ndmin=2
+    )
+
+
+def load_trades_csv(path: str, price_column: int = 1, time_column: int = 5):
+    with open(path) as f:
+        first = f.readline()
+    skip = 0 if first[:1].isdigit() else 1
+    trades = np.loadtxt(
+        path,
+        delimiter=",",
+        skiprows=skip,
+        usecols=(time_column, price_column),
+        ndmin=2,
+    )
+    prices = trades[:, 1]
+    return np.column_stack(
+        (trades[:, 0], prices, prices, prices, prices, np.zeros(len(prices)))
+    )
+
+
+def _first_at_or_below(values: np.ndarray, start: int, threshold: float) -> int:
+    window = SEARCH_WINDOW
+    while start < len(values):
+        end = min(len(values), start + window)
+        hits = values[start:end] <= threshold
+        index = int(hits.argmax())
+        if hits[index]:
+            return start + index
+        start = end
+        window *= 2
+    return -1
+
+
+def _first_at_or_above(values: np.ndarray, start: int, threshold: float) -> int:
+    window = SEARCH_WINDOW
+    while start < len(values):
+        end = min(len(values), start + window)
+        hits = values[start:end] >= threshold
+        index = int(hits.argmax())
+        if hits[index]:
+            return start + index
+        start = end
+        window *= 2
+    return -1
+
+
+def price_columns(candles: np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(candles[:, 2:5].T, dtype=np.float64)
+
+
+def run_backtest(config, candles: np.ndarray, fee_rate: float = 0.0) -> BacktestResult:
+    return simulate(config, price_columns(candles), fee_rate)
+
+
+def simulate(config, prices: np.ndarray, fee_rate: float = 0.0) -> BacktestResult:
+    high, low, close = prices
+    candle_count = len(close)
+    max_safety_orders = config["max_safety_orders"]
+    sizes = [dca.safety_order_size(config, i) for i in range(max_safety_orders)]
+    realized = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+    max_capital = 0.0
+    max_sos_used = 0
+    deals = 0
+    wins = 0
+    deal_candles = 0
+    unrealized = 0.0
+    open_deal = False
+    start = 0
+    while start < candle_count:
+        base_price = close[start]
+        cost = config["base_order_size"]
+        quantity = cost * (1 - fee_rate) / base_price
+        triggers = [
+            dca.safety_order_trigger_price(config, base_price, i)
+            for i in range(max_safety_orders)
+        ]
+        filled = 0
+        position = start
+        while True:
+            tp_price = dca.take_profit_price(config, cost / quantity)
+            tp_index = _first_at_or_above(high, position + 1, tp_price)
+            so_index = (
+                _first_at_or_below(low, position + 1, triggers[filled])
+                if filled < max_safety_orders
+                else -1
+            )
+            if so_index != -1 and (tp_index == -1 or so_index <= tp_index):
+                segment_low = low[position + 1 : so_index + 1].min()
+                max_drawdown = max(
+                    max_drawdown, peak - (realized + quantity * segment_low - cost)
+                )
+                cost += sizes[filled]
+                quantity += sizes[filled] * (1 - fee_rate) / triggers[filled]
+                filled += 1
+                position = so_index
+                continue
+            end = tp_index if tp_index != -1 else candle_count - 1
+            if end > position:
+                segment_low = low[position + 1 : end + 1].min()
+                max_drawdown = max(
+                    max_drawdown, peak - (realized + quantity * segment_low - cost)
+                )
+            max_capital = max(max_capital, cost)
+            max_sos_used = max(max_sos_used, filled)
+            if tp_index == -1:
+                unrealized = quantity * close[-1] - cost
+                open_deal = True
+                start = candle_count
+                break
+            pnl = quantity * tp_price * (1 - fee_rate) - cost
+            realized += pnl
+            peak = max(peak, realized)
+            deals += 1
+            wins += pnl > 0
+            deal_candles += tp_index - start
+            start = tp_index
+            break
+    return BacktestResult(
+        deals=deals,
+        winning_deals=int(wins),
+        total_pnl=float(realized),
+        unrealized_pnl=float(unrealized),
+        max_capital_deployed=float(max_capital),
+        max_drawdown=float(max_drawdown),
+        max_safety_orders_used=max_sos_used,
+        average_deal_candles=deal_candles / deals if deals else 0.0,
+        open_deal=open_deal,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest a DCA bot config.")
+    parser.add_argument("path", help="Kline/trade CSV file or a stored symbol")
+    parser.add_argument("--config", required=True, help="Bot config as JSON")
+    parser.add_argument("--trades", action="store_true")
+    parser.add_argument("--interval", help="Read stored klines for this interval")
+    parser.add_argument("--fee-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    if args.interval:
+        from app.services.market_data import KlineStore, as_candles
+
+        candles = as_candles(KlineStore(args.path, args.interval).read())
+    elif args.trades:
+        candles = load_trades_csv(args.path)
+    else:
+        candles = load_klines_csv(args.path)
+    result = run_backtest(json.loads(args.config), candles, args.fee_rate)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
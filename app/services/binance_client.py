@@ -0,0 +1,61 @@
+import functools
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from binance import AsyncClient, BinanceSocketManager
+    from binance.client import Client
+
+BINANCE_BASE_URL = os.environ.get("BINANCE_BASE_URL", "").rstrip("/")
+BINANCE_STREAM_URL = os.environ.get(
+    "BINANCE_STREAM_URL",
+    BINANCE_BASE_URL.replace("http", "ws", 1) if BINANCE_BASE_URL else "",
+).rstrip("/")
+
+
+def is_testnet() -> bool:
+    return os.environ.get("BINANCE_TESTNET", "false").lower() == "true"
+
+
+@functools.cache
+def _client_classes() -> tuple[type, type, type]:
+    from binance import AsyncClient, BinanceSocketManager
+    from binance.client import Client
+
+    if not BINANCE_BASE_URL:
+        return (Client, AsyncClient, BinanceSocketManager)
+    api_urls = {
+        "API_URL": f"{BINANCE_BASE_URL}/api",
+        "API_TESTNET_URL": f"{BINANCE_BASE_URL}/api",
+    }
+    stream_urls = {
+        "STREAM_URL": f"{BINANCE_STREAM_URL}/",
+        "STREAM_TESTNET_URL": f"{BINANCE_STREAM_URL}/",
+    }
+    return (
+        type("LocalClient", (Client,), api_urls),
+        type("LocalAsyncClient", (AsyncClient,), api_urls),
+        type("LocalSocketManager", (BinanceSocketManager,), stream_urls),
+    )
+
+
+def create_client(
+    api_key: str | None = None, secret_key: str | None = None, testnet: bool = False
+) -> "Client":
+    client = _client_classes()[0](api_key, secret_key, testnet=testnet)
+    if testnet:
+        client.API_URL = client.API_TESTNET_URL
+    return client
+
+
+async def create_async_client(
+    api_key: str | None = None, secret_key: str | None = None, testnet: bool = False
+) -> "AsyncClient":
+    client = await _client_classes()[1].create(api_key, secret_key, testnet=testnet)
+    if testnet and hasattr(client, "API_TESTNET_URL"):
+        client.API_URL = client.API_TESTNET_URL
+    return client
+
+
+def socket_manager(client: "AsyncClient") -> "BinanceSocketManager":
+    return _client_classes()[2](client)
@@ -0,0 +1,46 @@
+def safety_order_deviation(config, filled_count: int) -> float:
+    return sum(
+        config["price_deviation"] * config["safety_order_step_scale"] ** i
+        for i in range(filled_count + 1)
+    )
+
+
+def safety_order_trigger_price(config, base_price: float, filled_count: int) -> float:
+    return base_price * (1 - safety_order_deviation(config, filled_count) / 100)
+
+
+def safety_order_size(config, index: int) -> float:
+    return config["safety_order_size"] * config["safety_order_volume_scale"] ** index
+
+
+def limit_order_price(config, reference_price: float, index: int) -> float:
+    deviation = config["price_deviation"] * config["safety_order_step_scale"] ** index
+    return reference_price * (1 - deviation / 100)
+
+
+def safety_ladder(config, base_price: float) -> list[tuple[float, float]]:
+    return [
+        (
+            safety_order_trigger_price(config, base_price, i),
+            safety_order_size(config, i),
+        )
+        for i in range(config["max_safety_orders"])
+    ]
+
+
+def take_profit_price(config, average_entry_price: float) -> float:
+    return average_entry_price * (1 + config["take_profit_percentage"] / 100)
+
+
+def take_profit_reached(config, average_entry_price: float, price: float) -> bool:
+    if average_entry_price <= 0:
+        return False
+    pnl_percentage = (price - average_entry_price) / average_entry_price * 100
+    return pnl_percentage >= config["take_profit_percentage"]
+
+
+def max_bot_capital(config) -> float:
+    safety_orders = range(config.get("max_safety_orders", 0))
+    return config.get("base_order_size", 0.0) + sum(
+        safety_order_size(config, i) for i in safety_orders
+    )
@@ -1,7 +1,6 @@
 import reflex as rx
 import os
 import logging
-import resend
 
 
 class EmailService(rx.State):
@@ -11,6 +10,8 @@ class EmailService(rx.State):
             logging.error("RESEND_API_KEY not set. Cannot send email.")
             logging.info(f"Email intended for {to_email} with subject '{subject}'")
             return
+        import resend
+
         resend.api_key = api_key
         from_address = os.environ.get("EMAIL_FROM_ADDRESS", "onboarding@resend.dev")
         params = {
@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING, TypedDict
+
+if TYPE_CHECKING:
+    from app.states.bot_state import Bot
+    from app.states.deal_state import Deal
+
+
+class AccountContext(TypedDict):
+    email: str
+    user_id: int | None
+
+
+class EngineRegistry:
+    def __init__(self):
+        self.bots: dict[str, "Bot"] = {}
+        self.deals: dict[str, "Deal"] = {}
+        self.accounts: dict[str, AccountContext] = {}
+        self.bot_owners: dict[str, str] = {}
+        self.owner_bots: dict[str, set[str]] = {}
+
+    def register_bot(self, bot: "Bot", owner_email: str | None = None):
+        self.bots[bot["id"]] = bot
+        if owner_email:
+            self.bot_owners[bot["id"]] = owner_email
+            self.owner_bots.setdefault(owner_email, set()).add(bot["id"])
+
+    def remove_bot(self, bot_id: str):
+        self.bots.pop(bot_id, None)
+        self.deals.pop(bot_id, None)
+        owner = self.bot_owners.pop(bot_id, None)
+        if owner is not None:
+            self.owner_bots.get(owner, set()).discard(bot_id)
+
+    def get_bot(self, bot_id: str) -> "Bot | None":
+        return self.bots.get(bot_id)
+
+    def set_bot_status(self, bot_id: str, status: str):
+        bot = self.bots.get(bot_id)
+        if bot is not None:
+            bot["status"] = status
+
+    def update_bot_stats(self, bot_id: str, pnl_delta: float, deals_increment: int):
+        bot = self.bots.get(bot_id)
+        if bot is not None:
+            bot["total_pnl"] += pnl_delta
+            bot["deals_count"] += deals_increment
+
+    def bots_for_owner(self, owner_email: str) -> list["Bot"]:
+        return [
+            self.bots[bot_id]
+            for bot_id in self.owner_bots.get(owner_email, ())
+            if bot_id in self.bots
+        ]
+
+    def get_active_deal(self, bot_id: str) -> "Deal | None":
+        deal = self.deals.get(bot_id)
+        if deal is not None and deal["status"] == "active":
+            return deal
+        return None
+
+    def set_account(self, email: str, user_id: int | None = None):
+        account = self.accounts.get(email)
+        if account is None:
+            self.accounts[email] = AccountContext(email=email, user_id=user_id)
+        elif user_id is not None:
+            account["user_id"] = user_id
+
+    def account_for_bot(self, bot_id: str) -> AccountContext | None:
+        owner = self.bot_owners.get(bot_id)
+        return self.accounts.get(owner) if owner is not None else None
+
+
+engine_registry = EngineRegistry()
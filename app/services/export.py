@@ -0,0 +1,186 @@
+import csv
+import importlib.util
+import io
+import time
+from datetime import datetime, timezone
+from typing import Iterator
+from app.database import crud
+from app.database.database import SessionLocal
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_TOKEN_MAX_AGE = 300
+EXPORT_KINDS = ("deals", "orders")
+EXPORT_FORMATS = ("csv", "parquet")
+TIME_COLUMNS = ("entry_time", "close_time", "timestamp")
+EXPORT_COLUMNS = {
+    "deals": (
+        ("deal_id", "int64"),
+        ("bot_id", "string"),
+        ("status", "string"),
+        ("entry_time", "float64"),
+        ("close_time", "float64"),
+        ("average_entry_price", "float64"),
+        ("total_quantity", "float64"),
+        ("realized_pnl", "float64"),
+    ),
+    "orders": (
+        ("order_id", "string"),
+        ("deal_id", "int64"),
+        ("bot_id", "string"),
+        ("timestamp", "float64"),
+        ("side", "string"),
+        ("order_type", "string"),
+        ("status", "string"),
+        ("price", "float64"),
+        ("quantity", "float64"),
+    ),
+}
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def parse_day(value: str | None) -> float | None:
+    if not value:
+        return None
+    day = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return day.timestamp()
+
+
+def _deal_row(deal, bot_uuid: str) -> tuple:
+    return (
+        deal.id,
+        bot_uuid,
+        deal.status,
+        deal.entry_time,
+        deal.close_time,
+        deal.average_entry_price,
+        deal.total_quantity,
+        deal.realized_pnl,
+    )
+
+
+def _order_row(order, bot_uuid: str) -> tuple:
+    return (
+        order.order_id_str,
+        order.deal_id,
+        bot_uuid,
+        order.timestamp,
+        order.side,
+        order.order_type,
+        order.status,
+        order.price,
+        order.quantity,
+    )
+
+
+def iter_export_batches(
+    kind: str,
+    user_id: int,
+    start: float | None = None,
+    end: float | None = None,
+    bot_uuid: str | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[list[tuple]]:
+    fetch, to_row = (
+        (crud.get_deals_for_export, _deal_row)
+        if kind == "deals"
+        else (crud.get_orders_for_export, _order_row)
+    )
+    after_id = 0
+    db = SessionLocal()
+    try:
+        while True:
+            page = fetch(
+                db,
+                user_id,
+                limit=batch_size,
+                after_id=after_id,
+                start=start,
+                end=end,
+                bot_uuid=bot_uuid,
+            )
+            if not page:
+                return
+            after_id = page[-1][0].id
+            yield [to_row(item, owner_bot) for item, owner_bot in page]
+            db.expunge_all()
+            if len(page) < batch_size:
+                return
+    finally:
+        db.close()
+
+
+def _format_time(value: float | None) -> str:
+    if value is None:
+        return ""
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(value))
+
+
+def stream_csv(kind: str, batches: Iterator[list[tuple]]) -> Iterator[bytes]:
+    columns = [name for name, _ in EXPORT_COLUMNS[kind]]
+    time_indexes = [i for i, name in enumerate(columns) if name in TIME_COLUMNS]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        for row in batch:
+            row = list(row)
+            for i in time_indexes:
+                row[i] = _format_time(row[i])
+            writer.writerow(row)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def stream_parquet(kind: str, batches: Iterator[list[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = EXPORT_COLUMNS[kind]
+    schema = pa.schema([(name, getattr(pa, dtype)()) for name, dtype in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in batches:
+            arrays = [
+                pa.array(values, type=field.type)
+                for values, field in zip(zip(*batch), schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
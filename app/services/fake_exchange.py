@@ -0,0 +1,467 @@
+import argparse
+import asyncio
+import itertools
+import logging
+import math
+import os
+import random
+import secrets
+import time
+from collections import deque
+from urllib.parse import parse_qsl
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from app.services.sim_exchange import OrderRejected, SimulatedExchange, split_symbol
+
+FAKE_EXCHANGE_SYMBOLS = os.environ.get(
+    "FAKE_EXCHANGE_SYMBOLS", "BTCUSDT:65000,ETHUSDT:3200,DOGEUSDT:0.15"
+)
+FAKE_EXCHANGE_BALANCES = os.environ.get("FAKE_EXCHANGE_BALANCES", "USDT:100000")
+FAKE_EXCHANGE_LATENCY_MS = float(os.environ.get("FAKE_EXCHANGE_LATENCY_MS", "0"))
+FAKE_EXCHANGE_JITTER_MS = float(os.environ.get("FAKE_EXCHANGE_JITTER_MS", "0"))
+FAKE_EXCHANGE_RATE_LIMIT = int(os.environ.get("FAKE_EXCHANGE_RATE_LIMIT", "1200"))
+FAKE_EXCHANGE_TICK_MS = int(os.environ.get("FAKE_EXCHANGE_TICK_MS", "250"))
+FAKE_EXCHANGE_VOLATILITY = float(os.environ.get("FAKE_EXCHANGE_VOLATILITY", "0.8"))
+FAKE_EXCHANGE_SEED = int(os.environ.get("FAKE_EXCHANGE_SEED", "7"))
+SUBSCRIBER_QUEUE_SIZE = 1000
+SECONDS_PER_YEAR = 365 * 86400
+
+
+def parse_amounts(value: str) -> dict[str, float]:
+    amounts = {}
+    for item in value.split(","):
+        if ":" in item:
+            name, amount = item.split(":", 1)
+            amounts[name.strip().upper()] = float(amount)
+    return amounts
+
+
+class PricePath:
+    def __init__(
+        self,
+        price: float,
+        volatility: float = FAKE_EXCHANGE_VOLATILITY,
+        drift: float = 0.0,
+        seed: int | str = FAKE_EXCHANGE_SEED,
+    ):
+        self.price = price
+        self.volatility = volatility
+        self.drift = drift
+        self.random = random.Random(seed)
+
+    def step(self, seconds: float) -> float:
+        dt = seconds / SECONDS_PER_YEAR
+        shock = self.random.gauss(0.0, 1.0)
+        self.price *= math.exp(
+            (self.drift - self.volatility**2 / 2) * dt
+            + self.volatility * math.sqrt(dt) * shock
+        )
+        self.price = float(f"{self.price:.8g}")
+        return self.price
+
+    def quantity(self) -> float:
+        return round(self.random.expovariate(1.0) * 100 / self.price, 8)
+
+
+class FakeExchange:
+    def __init__(
+        self,
+        symbols: dict[str, float],
+        balances: dict[str, float],
+        latency_ms: float = FAKE_EXCHANGE_LATENCY_MS,
+        jitter_ms: float = FAKE_EXCHANGE_JITTER_MS,
+        rate_limit: int = FAKE_EXCHANGE_RATE_LIMIT,
+        tick_ms: int = FAKE_EXCHANGE_TICK_MS,
+        volatility: float = FAKE_EXCHANGE_VOLATILITY,
+        seed: int = FAKE_EXCHANGE_SEED,
+    ):
+        self.paths = {
+            symbol: PricePath(price, volatility, seed=f"{seed}:{symbol}")
+            for symbol, price in symbols.items()
+        }
+        self.balances = balances
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.tick_ms = tick_ms
+        self.random = random.Random(seed)
+        self.accounts: dict[str, SimulatedExchange] = {}
+        self.listen_keys: dict[str, str] = {}
+        self.trade_subscribers: dict[str, set[asyncio.Queue]] = {}
+        self.user_subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._order_ids = itertools.count(1)
+        self._trade_ids = itertools.count(1)
+        self._requests: dict[str, deque] = {}
+        self._ticker: asyncio.Task | None = None
+
+    def account(self, api_key: str) -> SimulatedExchange:
+        account = self.accounts.get(api_key)
+        if account is None:
+            account = SimulatedExchange(self.balances, order_ids=self._order_ids)
+            now = int(time.time() * 1000)
+            for symbol, path in self.paths.items():
+                account.on_tick(symbol, path.price, now)
+            self.accounts[api_key] = account
+        return account
+
+    def rate_limited(self, api_key: str) -> bool:
+        if self.rate_limit <= 0:
+            return False
+        now = time.monotonic()
+        window = self._requests.setdefault(api_key, deque())
+        while window and now - window[0] > 60:
+            window.popleft()
+        if len(window) >= self.rate_limit:
+            return True
+        window.append(now)
+        return False
+
+    async def delay(self):
+        latency = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def publish(self, subscribers: set[asyncio.Queue], event: dict):
+        for queue in list(subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logging.warning("Dropping fake exchange event for a slow consumer.")
+
+    def publish_order(self, api_key: str, order: dict, execution: str):
+        subscribers = self.user_subscribers.get(api_key)
+        if not subscribers:
+            return
+        filled = order["status"] == "FILLED"
+        fill_price = order["fills"][0]["price"] if filled else "0.00000000"
+        now = int(time.time() * 1000)
+        self.publish(
+            subscribers,
+            {
+                "e": "executionReport",
+                "E": now,
+                "s": order["symbol"],
+                "S": order["side"],
+                "o": order["type"],
+                "f": order["timeInForce"],
+                "q": order["origQty"],
+                "p": order["price"],
+                "x": execution,
+                "X": order["status"],
+                "i": int(order["orderId"]),
+                "l": order["executedQty"] if filled else "0.00000000",
+                "z": order["executedQty"],
+                "L": fill_price,
+                "n": order["fills"][0]["commission"] if filled else "0",
+                "N": order["fills"][0]["commissionAsset"] if filled else None,
+                "T": order["updateTime"],
+            },
+        )
+        self.publish(
+            subscribers,
+            {
+                "e": "outboundAccountPosition",
+                "E": now,
+                "u": now,
+                "B": [
+                    {"a": b["asset"], "f": b["free"], "l": b["locked"]}
+                    for b in self.accounts[api_key].account_balances()
+                ],
+            },
+        )
+
+    def step(self, seconds: float):
+        now = int(time.time() * 1000)
+        for symbol, path in self.paths.items():
+            price = path.step(seconds)
+            quantity = path.quantity()
+            trade_id = next(self._trade_ids)
+            for api_key, account in self.accounts.items():
+                for order in account.on_tick(symbol, price, now):
+                    self.publish_order(api_key, order, "TRADE")
+            subscribers = self.trade_subscribers.get(symbol)
+            if subscribers:
+                self.publish(
+                    subscribers,
+                    {
+                        "e": "trade",
+                        "E": now,
+                        "s": symbol,
+                        "t": trade_id,
+                        "p": f"{price:.8f}",
+                        "q": f"{quantity:.8f}",
+                        "T": now,
+                        "m": bool(trade_id % 2),
+                        "M": True,
+                    },
+                )
+
+    async def run(self):
+        interval = self.tick_ms / 1000
+        next_tick = time.monotonic()
+        while True:
+            self.step(interval)
+            next_tick += interval
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+
+    def exchange_info(self) -> dict:
+        symbols = []
+        for symbol in self.paths:
+            base, quote = split_symbol(symbol)
+            symbols.append(
+                {
+                    "symbol": symbol,
+                    "status": "TRADING",
+                    "baseAsset": base,
+                    "baseAssetPrecision": 8,
+                    "quoteAsset": quote,
+                    "quotePrecision": 8,
+                    "orderTypes": ["LIMIT", "MARKET"],
+                    "isSpotTradingAllowed": True,
+                    "permissions": ["SPOT"],
+                    "filters": [
+                        {
+                            "filterType": "PRICE_FILTER",
+                            "minPrice": "0.00000001",
+                            "maxPrice": "1000000.00000000",
+                            "tickSize": "0.00000001",
+                        },
+                        {
+                            "filterType": "LOT_SIZE",
+                            "minQty": "0.00000001",
+                            "maxQty": "9000000.00000000",
+                            "stepSize": "0.00000001",
+                        },
+                    ],
+                }
+            )
+        return {
+            "timezone": "UTC",
+            "serverTime": int(time.time() * 1000),
+            "rateLimits": [
+                {
+                    "rateLimitType": "REQUEST_WEIGHT",
+                    "interval": "MINUTE",
+                    "intervalNum": 1,
+                    "limit": self.rate_limit,
+                }
+            ],
+            "symbols": symbols,
+        }
+
+
+def error_response(code: int, message: str, status_code: int = 400) -> JSONResponse:
+    return JSONResponse({"code": code, "msg": message}, status_code=status_code)
+
+
+def binance_order(order: dict) -> dict:
+    return {**order, "orderId": int(order["orderId"])}
+
+
+def create_app(exchange: FakeExchange) -> FastAPI:
+    app = FastAPI()
+
+    @app.on_event("startup")
+    async def start_ticker():
+        exchange._ticker = asyncio.create_task(exchange.run())
+
+    @app.on_event("shutdown")
+    async def stop_ticker():
+        if exchange._ticker:
+            exchange._ticker.cancel()
+
+    @app.middleware("http")
+    async def throttle(request: Request, call_next):
+        api_key = request.headers.get(
+            "X-MBX-APIKEY", request.client.host if request.client else ""
+        )
+        if exchange.rate_limited(api_key):
+            response = error_response(
+                -1003, "Too many requests; current limit is exceeded.", 429
+            )
+            response.headers["Retry-After"] = "60"
+            return response
+        await exchange.delay()
+        response = await call_next(request)
+        response.headers["X-MBX-USED-WEIGHT-1M"] = str(
+            len(exchange._requests.get(api_key, ()))
+        )
+        return response
+
+    async def params(request: Request) -> dict:
+        values = dict(request.query_params)
+        if request.method != "GET":
+            values.update(parse_qsl((await request.body()).decode()))
+        return values
+
+    def signed_account(request: Request) -> SimulatedExchange | None:
+        api_key = request.headers.get("X-MBX-APIKEY")
+        return exchange.account(api_key) if api_key else None
+
+    @app.get("/api/v3/ping")
+    async def ping():
+        return {}
+
+    @app.get("/api/v3/time")
+    async def server_time():
+        return {"serverTime": int(time.time() * 1000)}
+
+    @app.get("/api/v3/exchangeInfo")
+    async def exchange_info():
+        return exchange.exchange_info()
+
+    @app.get("/api/v3/ticker/price")
+    async def ticker_price(symbol: str | None = None):
+        prices = [
+            {"symbol": s, "price": f"{p.price:.8f}"}
+            for s, p in exchange.paths.items()
+            if symbol is None or s == symbol
+        ]
+        if symbol is not None:
+            return prices[0] if prices else error_response(-1121, "Invalid symbol.")
+        return prices
+
+    @app.get("/api/v3/account")
+    async def account(request: Request):
+        account = signed_account(request)
+        if account is None:
+            return error_response(-2015, "Invalid API-key, IP, or permissions.", 401)
+        return {
+            "makerCommission": 0,
+            "takerCommission": 0,
+            "canTrade": True,
+            "canWithdraw": False,
+            "canDeposit": False,
+            "updateTime": account.clock_ms,
+            "accountType": "SPOT",
+            "balances": account.account_balances(),
+            "permissions": ["SPOT"],
+        }
+
+    @app.post("/api/v3/order")
+    async def create_order(request: Request):
+        account = signed_account(request)
+        if account is None:
+            return error_response(-2015, "Invalid API-key, IP, or permissions.", 401)
+        values = await params(request)
+        try:
+            order = account.create_order(
+                values.get("symbol", ""),
+                values.get("side", ""),
+                values.get("type", ""),
+                quantity=float(values["quantity"]) if "quantity" in values else None,
+                price=float(values["price"]) if "price" in values else None,
+                quote_quantity=(
+                    float(values["quoteOrderQty"])
+                    if "quoteOrderQty" in values
+                    else None
+                ),
+            )
+        except OrderRejected as e:
+            return error_response(e.code, e.message)
+        except ValueError:
+            return error_response(-1100, "Illegal characters found in a parameter.")
+        api_key = request.headers["X-MBX-APIKEY"]
+        exchange.publish_order(api_key, order, "NEW")
+        if order["status"] == "FILLED":
+            exchange.publish_order(api_key, order, "TRADE")
+        return binance_order(order)
+
+    @app.get("/api/v3/order")
+    async def get_order(request: Request, symbol: str, orderId: str):
+        account = signed_account(request)
+        if account is None:
+            return error_response(-2015, "Invalid API-key, IP, or permissions.", 401)
+        try:
+            order = account.order_status(symbol, orderId)
+        except OrderRejected as e:
+            return error_response(e.code, e.message)
+        order.pop("fills", None)
+        return binance_order(order)
+
+    @app.post("/api/v3/userDataStream")
+    async def open_user_stream(request: Request):
+        api_key = request.headers.get("X-MBX-APIKEY")
+        if not api_key:
+            return error_response(-2015, "Invalid API-key, IP, or permissions.", 401)
+        exchange.account(api_key)
+        listen_key = secrets.token_hex(32)
+        exchange.listen_keys[listen_key] = api_key
+        return {"listenKey": listen_key}
+
+    @app.put("/api/v3/userDataStream")
+    async def keepalive_user_stream(request: Request):
+        values = await params(request)
+        if values.get("listenKey") not in exchange.listen_keys:
+            return error_response(-1125, "This listenKey does not exist.")
+        return {}
+
+    @app.delete("/api/v3/userDataStream")
+    async def close_user_stream(request: Request):
+        values = await params(request)
+        exchange.listen_keys.pop(values.get("listenKey", ""), None)
+        return {}
+
+    @app.websocket("/ws/{stream}")
+    async def stream(websocket: WebSocket, stream: str):
+        if stream.endswith("@trade"):
+            symbol = stream[: -len("@trade")].upper()
+            if symbol not in exchange.paths:
+                await websocket.close(code=1008)
+                return
+            subscribers = exchange.trade_subscribers.setdefault(symbol, set())
+        elif stream in exchange.listen_keys:
+            api_key = exchange.listen_keys[stream]
+            subscribers = exchange.user_subscribers.setdefault(api_key, set())
+        else:
+            await websocket.close(code=1008)
+            return
+        await websocket.accept()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        subscribers.add(queue)
+        try:
+            while True:
+                await websocket.send_json(await queue.get())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            subscribers.discard(queue)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Binance server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--symbols", default=FAKE_EXCHANGE_SYMBOLS)
+    parser.add_argument("--balances", default=FAKE_EXCHANGE_BALANCES)
+    parser.add_argument("--latency-ms", type=float, default=FAKE_EXCHANGE_LATENCY_MS)
+    parser.add_argument("--jitter-ms", type=float, default=FAKE_EXCHANGE_JITTER_MS)
+    parser.add_argument("--rate-limit", type=int, default=FAKE_EXCHANGE_RATE_LIMIT)
+    parser.add_argument("--tick-ms", type=int, default=FAKE_EXCHANGE_TICK_MS)
+    parser.add_argument("--volatility", type=float, default=FAKE_EXCHANGE_VOLATILITY)
+    parser.add_argument("--seed", type=int, default=FAKE_EXCHANGE_SEED)
+    args = parser.parse_args()
+    exchange = FakeExchange(
+        parse_amounts(args.symbols),
+        parse_amounts(args.balances),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit=args.rate_limit,
+        tick_ms=args.tick_ms,
+        volatility=args.volatility,
+        seed=args.seed,
+    )
+    import uvicorn
+
+    print(
+        f"Fake Binance on http://{args.host}:{args.port} - set BINANCE_BASE_URL=http://{args.host}:{args.port}"
+    )
+    uvicorn.run(
+        create_app(exchange), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
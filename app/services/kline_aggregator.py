@@ -0,0 +1,124 @@
+import logging
+import os
+from app.services.replay import replay_enabled
+
+BAR_INTERVALS_MS = {"1s": 1_000, "1m": 60_000, "5m": 300_000}
+BAR_CAPACITY = {"1s": 900, "1m": 1440, "5m": 2016}
+PERSISTED_INTERVALS = tuple(
+    i
+    for i in os.environ.get("KLINE_PERSIST_INTERVALS", "1m,5m").split(",")
+    if i in BAR_INTERVALS_MS and not replay_enabled()
+)
+
+Bar = list[float]
+
+
+class BarRing:
+    def __init__(self, interval_ms: int, capacity: int):
+        self.interval_ms = interval_ms
+        self.capacity = capacity
+        self._bars: list[Bar | None] = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self.current: Bar | None = None
+        self.version = 0
+
+    def update(self, timestamp_ms: int, price: float, quantity: float) -> Bar | None:
+        open_time = timestamp_ms - timestamp_ms % self.interval_ms
+        closed = None
+        bar = self.current
+        if bar is not None and open_time > bar[0]:
+            closed = bar
+            self._bars[self._head] = bar
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
+            bar = None
+        if bar is None:
+            self.current = [open_time, price, price, price, price, quantity]
+        elif open_time == bar[0]:
+            if price > bar[2]:
+                bar[2] = price
+            if price < bar[3]:
+                bar[3] = price
+            bar[4] = price
+            bar[5] += quantity
+        else:
+            return closed
+        self.version += 1
+        return closed
+
+    def closed_bars(self, limit: int | None = None) -> list[Bar]:
+        count = self._count if limit is None else min(limit, self._count)
+        start = (self._head - count) % self.capacity
+        return [self._bars[(start + i) % self.capacity] for i in range(count)]
+
+    def bars(self, limit: int | None = None) -> list[Bar]:
+        if self.current is None:
+            return self.closed_bars(limit)
+        history = self.closed_bars(None if limit is None else max(limit - 1, 0))
+        return history + [list(self.current)]
+
+
+class KlineAggregator:
+    def __init__(self, persist_intervals: tuple[str, ...] = PERSISTED_INTERVALS):
+        self._rings: dict[str, dict[str, BarRing]] = {}
+        self._last_trade_id: dict[str, int] = {}
+        self._persist_intervals = persist_intervals
+
+    def _rings_for(self, symbol: str) -> dict[str, BarRing]:
+        rings = self._rings.get(symbol)
+        if rings is None:
+            rings = {
+                name: BarRing(interval_ms, BAR_CAPACITY[name])
+                for name, interval_ms in BAR_INTERVALS_MS.items()
+            }
+            self._rings[symbol] = rings
+        return rings
+
+    def on_trade(
+        self,
+        symbol: str,
+        trade_id: int | None,
+        price: float,
+        quantity: float,
+        timestamp_ms: int,
+    ) -> bool:
+        if trade_id is not None:
+            if trade_id <= self._last_trade_id.get(symbol, -1):
+                return False
+            self._last_trade_id[symbol] = trade_id
+        for name, ring in self._rings_for(symbol).items():
+            closed = ring.update(timestamp_ms, price, quantity)
+            if closed is not None and name in self._persist_intervals:
+                self._persist(symbol, name, closed)
+        return True
+
+    def on_trade_event(self, event: dict) -> bool:
+        return self.on_trade(
+            event["s"], event.get("t"), float(event["p"]), float(event["q"]), event["T"]
+        )
+
+    def bars(self, symbol: str, interval: str, limit: int | None = None) -> list[Bar]:
+        rings = self._rings.get(symbol)
+        return rings[interval].bars(limit) if rings else []
+
+    def version(self, symbol: str, interval: str) -> int:
+        rings = self._rings.get(symbol)
+        return rings[interval].version if rings else 0
+
+    def forget_symbol(self, symbol: str):
+        self._rings.pop(symbol, None)
+        self._last_trade_id.pop(symbol, None)
+
+    def _persist(self, symbol: str, interval: str, bar: Bar):
+        try:
+            from app.services import market_data
+
+            market_data.KlineStore(symbol, interval).append(
+                market_data.parse_kline_rows([bar])
+            )
+        except Exception as e:
+            logging.exception(f"Failed to persist {interval} bar for {symbol}: {e}")
+
+
+kline_aggregator = KlineAggregator()
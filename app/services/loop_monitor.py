@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import TypedDict
+from app.services import metrics
+
+LOOP_MONITOR_ENABLED = os.environ.get("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+LOOP_LAG_INTERVAL = float(os.environ.get("LOOP_LAG_INTERVAL", "0.5"))
+SLOW_CALLBACK_SECONDS = float(os.environ.get("SLOW_CALLBACK_SECONDS", "0.1"))
+SLOW_CALLBACK_HISTORY = int(os.environ.get("SLOW_CALLBACK_HISTORY", "50"))
+SLOW_CALLBACK_STACK_DEPTH = 25
+
+
+class LockStats(TypedDict):
+    handler: str
+    acquisitions: int
+    wait_total_ms: float
+    wait_max_ms: float
+    hold_total_ms: float
+    hold_max_ms: float
+
+
+class SlowCallback(TypedDict):
+    at: float
+    blocked_ms: float
+    stack: str
+
+
+class LoopStats(TypedDict):
+    lag_ms: float
+    lag_max_ms: float
+    slow_callbacks: int
+
+
+lock_stats: dict[str, LockStats] = {}
+slow_callbacks: deque[SlowCallback] = deque(maxlen=SLOW_CALLBACK_HISTORY)
+loop_stats = LoopStats(lag_ms=0.0, lag_max_ms=0.0, slow_callbacks=0)
+_held: dict[int, tuple[str, float]] = {}
+_installed = False
+
+
+def _handler_name(frame) -> str:
+    if frame is None:
+        return "unknown"
+    return getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+
+
+def _stats_for(handler: str) -> LockStats:
+    stats = lock_stats.get(handler)
+    if stats is None:
+        stats = LockStats(
+            handler=handler,
+            acquisitions=0,
+            wait_total_ms=0.0,
+            wait_max_ms=0.0,
+            hold_total_ms=0.0,
+            hold_max_ms=0.0,
+        )
+        lock_stats[handler] = stats
+    return stats
+
+
+def record_lock_wait(handler: str, seconds: float):
+    metrics.state_lock_wait_seconds.observe(seconds, handler)
+    stats = _stats_for(handler)
+    stats["acquisitions"] += 1
+    stats["wait_total_ms"] += seconds * 1000
+    stats["wait_max_ms"] = max(stats["wait_max_ms"], seconds * 1000)
+
+
+def record_lock_hold(handler: str, seconds: float):
+    metrics.state_lock_hold_seconds.observe(seconds, handler)
+    stats = _stats_for(handler)
+    stats["hold_total_ms"] += seconds * 1000
+    stats["hold_max_ms"] = max(stats["hold_max_ms"], seconds * 1000)
+
+
+def install_lock_timing():
+    global _installed
+    if _installed:
+        return
+    from reflex.state import StateProxy
+
+    enter = StateProxy.__aenter__
+    exit = StateProxy.__aexit__
+
+    async def timed_enter(proxy, handler: str):
+        started = time.perf_counter()
+        result = await enter(proxy)
+        acquired = time.perf_counter()
+        record_lock_wait(handler, acquired - started)
+        _held[id(proxy)] = (handler, acquired)
+        return result
+
+    def aenter(proxy):
+        return timed_enter(proxy, _handler_name(sys._getframe(1)))
+
+    async def aexit(proxy, *exc_info):
+        try:
+            return await exit(proxy, *exc_info)
+        finally:
+            held = _held.pop(id(proxy), None)
+            if held:
+                record_lock_hold(held[0], time.perf_counter() - held[1])
+
+    StateProxy.__aenter__ = aenter
+    StateProxy.__aexit__ = aexit
+    _installed = True
+
+
+class Watchdog(threading.Thread):
+    def __init__(self, loop_thread_id: int):
+        super().__init__(name="loop-watchdog", daemon=True)
+        self.loop_thread_id = loop_thread_id
+        self.heartbeat = time.monotonic()
+        self.pending: SlowCallback | None = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(SLOW_CALLBACK_SECONDS / 2):
+            heartbeat = self.heartbeat
+            overdue = time.monotonic() - heartbeat - LOOP_LAG_INTERVAL
+            if overdue < SLOW_CALLBACK_SECONDS or self.pending is not None:
+                continue
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = (
+                "".join(traceback.format_stack(frame, SLOW_CALLBACK_STACK_DEPTH))
+                if frame
+                else ""
+            )
+            self.pending = SlowCallback(
+                at=time.time(), blocked_ms=round(overdue * 1000, 1), stack=stack
+            )
+            slow_callbacks.append(self.pending)
+
+    def beat(self, lag: float):
+        self.heartbeat = time.monotonic()
+        pending, self.pending = self.pending, None
+        if lag < SLOW_CALLBACK_SECONDS:
+            return
+        loop_stats["slow_callbacks"] += 1
+        metrics.slow_callbacks_total.inc()
+        if pending is not None:
+            pending["blocked_ms"] = round(lag * 1000, 1)
+        else:
+            slow_callbacks.append(
+                SlowCallback(at=time.time(), blocked_ms=round(lag * 1000, 1), stack="")
+            )
+
+
+async def run_loop_monitor():
+    if not LOOP_MONITOR_ENABLED:
+        return
+    install_lock_timing()
+    loop = asyncio.get_running_loop()
+    watchdog = Watchdog(threading.get_ident())
+    watchdog.start()
+    logging.info(
+        f"Loop monitor started (interval {LOOP_LAG_INTERVAL}s, slow callback threshold {SLOW_CALLBACK_SECONDS}s)"
+    )
+    try:
+        while True:
+            started = loop.time()
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            lag = max(loop.time() - started - LOOP_LAG_INTERVAL, 0.0)
+            metrics.event_loop_lag_seconds.observe(lag)
+            loop_stats["lag_ms"] = round(lag * 1000, 2)
+            loop_stats["lag_max_ms"] = max(
+                loop_stats["lag_max_ms"], loop_stats["lag_ms"]
+            )
+            watchdog.beat(lag)
+    finally:
+        watchdog.stopped.set()
+
+
+def reset():
+    lock_stats.clear()
+    slow_callbacks.clear()
+    loop_stats["lag_max_ms"] = 0.0
+    loop_stats["slow_callbacks"] = 0
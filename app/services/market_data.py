@@ -0,0 +1,168 @@
+import argparse
+import io
+import os
+import threading
+import time
+import zipfile
+import numpy as np
+
+MARKET_DATA_DIR = os.environ.get("MARKET_DATA_DIR", "market_data")
+KLINE_DTYPE = np.dtype(
+    [
+        ("open_time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+_append_lock = threading.Lock()
+
+
+class KlineStore:
+    def __init__(self, symbol: str, interval: str, root: str = MARKET_DATA_DIR):
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported interval '{interval}'.")
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.path = os.path.join(root, self.symbol, f"{interval}.bin")
+
+    def __len__(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        return os.path.getsize(self.path) // KLINE_DTYPE.itemsize
+
+    def last_open_time(self) -> int | None:
+        count = len(self)
+        if count == 0:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek((count - 1) * KLINE_DTYPE.itemsize)
+            return int(np.frombuffer(f.read(KLINE_DTYPE.itemsize), KLINE_DTYPE)[0][0])
+
+    def append(self, records: np.ndarray) -> int:
+        records = np.asarray(records, dtype=KLINE_DTYPE)
+        if len(records) == 0:
+            return 0
+        records = records[np.argsort(records["open_time"], kind="stable")]
+        keep = np.ones(len(records), dtype=bool)
+        keep[:-1] = records["open_time"][:-1] != records["open_time"][1:]
+        records = records[keep]
+        with _append_lock:
+            last = self.last_open_time()
+            if last is not None and records["open_time"][0] <= last:
+                return self._merge(records)
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "ab") as f:
+                f.write(records.tobytes())
+        return len(records)
+
+    def _merge(self, records: np.ndarray) -> int:
+        existing = np.fromfile(self.path, dtype=KLINE_DTYPE)
+        replaced = np.isin(existing["open_time"], records["open_time"])
+        merged = np.concatenate([existing[~replaced], records])
+        merged = merged[np.argsort(merged["open_time"], kind="stable")]
+        tmp_path = f"{self.path}.tmp"
+        merged.tofile(tmp_path)
+        os.replace(tmp_path, self.path)
+        return len(records) - int(np.count_nonzero(replaced))
+
+    def read(self, start_ms: int | None = None, end_ms: int | None = None) -> np.ndarray:
+        count = len(self)
+        if count == 0:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        data = np.memmap(self.path, dtype=KLINE_DTYPE, mode="r", shape=(count,))
+        open_times = data["open_time"]
+        lo = 0 if start_ms is None else int(np.searchsorted(open_times, start_ms))
+        hi = count if end_ms is None else int(np.searchsorted(open_times, end_ms))
+        return data[lo:hi]
+
+
+def as_candles(records: np.ndarray) -> np.ndarray:
+    return np.column_stack(
+        [records[name].astype(np.float64) for name in KLINE_DTYPE.names]
+    )
+
+
+def recent_candles(symbol: str, interval: str, days: float) -> np.ndarray:
+    start_ms = int(time.time() * 1000) - int(days * 86_400_000)
+    return as_candles(KlineStore(symbol, interval).read(start_ms=start_ms))
+
+
+def parse_kline_rows(rows) -> np.ndarray:
+    values = np.asarray(rows, dtype=np.float64).reshape(-1, 6)
+    open_times = values[:, 0].astype(np.int64)
+    open_times = np.where(open_times > 10**14, open_times // 1000, open_times)
+    records = np.empty(len(values), dtype=KLINE_DTYPE)
+    records["open_time"] = open_times
+    for i, name in enumerate(KLINE_DTYPE.names[1:], start=1):
+        records[name] = values[:, i]
+    return records
+
+
+def _load_dump_text(text: str) -> np.ndarray:
+    lines = [line for line in text.splitlines() if line[:1].isdigit()]
+    if not lines:
+        return np.empty(0, dtype=KLINE_DTYPE)
+    rows = np.loadtxt(
+        io.StringIO("\n".join(lines)), delimiter=",", usecols=range(6), ndmin=2
+    )
+    return parse_kline_rows(rows)
+
+
+def ingest_dump(path: str, symbol: str, interval: str) -> int:
+    if path.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            records = [
+                _load_dump_text(archive.read(name).decode())
+                for name in archive.namelist()
+                if name.endswith(".csv")
+            ]
+        records = (
+            np.concatenate(records) if records else np.empty(0, dtype=KLINE_DTYPE)
+        )
+    else:
+        with open(path) as f:
+            records = _load_dump_text(f.read())
+    return KlineStore(symbol, interval).append(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local kline store.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="Import exchange kline dumps")
+    ingest.add_argument("symbol")
+    ingest.add_argument("interval", choices=sorted(INTERVAL_MS))
+    ingest.add_argument("files", nargs="+")
+    info = commands.add_parser("info", help="Show stored range")
+    info.add_argument("symbol")
+    info.add_argument("interval", choices=sorted(INTERVAL_MS))
+    args = parser.parse_args()
+    if args.command == "ingest":
+        for path in sorted(args.files):
+            added = ingest_dump(path, args.symbol, args.interval)
+            print(f"{path}: {added} new klines")
+    store = KlineStore(args.symbol, args.interval)
+    records = store.read()
+    if len(records):
+        print(
+            f"{store.symbol} {store.interval}: {len(records)} klines from {records['open_time'][0]} to {records['open_time'][-1]}"
+        )
+    else:
+        print(f"{store.symbol} {store.interval}: empty")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import bisect
+import math
+import os
+import time
+from collections.abc import Callable
+
+METRICS_PREFIX = "botsandchill"
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+FAST_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 1e-2)
+
+
+def observing() -> bool:
+    return bool(METRICS_TOKEN)
+
+
+def start_timer() -> float:
+    return time.perf_counter() if observing() else 0.0
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1.0):
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple, float]] | None = None,
+    ):
+        super().__init__(name, help, labels)
+        self.collect = collect
+
+    def set(self, *label_values, value: float):
+        self.values[label_values] = value
+
+    def samples(self) -> list[str]:
+        if self.collect is not None:
+            self.values = self.collect()
+        return super().samples()
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values):
+        series = self.values.get(label_values)
+        if series is None:
+            series = [[0] * (len(self.buckets) + 1), 0.0]
+            self.values[label_values] = series
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def observe_since(self, started: float, *label_values):
+        if started:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, (counts, total) in sorted(self.values.items()):
+            labels = _format_labels(self.labels, key)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: list[Counter | Histogram] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(f"{METRICS_PREFIX}_{name}", help, labels))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple, float]] | None = None,
+    ) -> Gauge:
+        return self.register(Gauge(f"{METRICS_PREFIX}_{name}", help, labels, collect))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(
+            Histogram(f"{METRICS_PREFIX}_{name}", help, labels, buckets)
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+def _active_bots_by_status() -> dict[tuple, float]:
+    from app.services.engine_registry import engine_registry
+
+    counts: dict[tuple, float] = {}
+    for bot in list(engine_registry.bots.values()):
+        key = (bot["status"],)
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+registry = MetricsRegistry()
+ticks_total = registry.counter(
+    "ticks_total", "Trade ticks processed by the engine.", ("symbol",)
+)
+strategy_seconds = registry.histogram(
+    "strategy_evaluation_seconds",
+    "Time spent evaluating the strategy for one tick.",
+    buckets=FAST_BUCKETS,
+)
+exchange_request_seconds = registry.histogram(
+    "exchange_request_seconds", "Exchange REST latency.", ("endpoint",)
+)
+exchange_errors_total = registry.counter(
+    "exchange_errors_total", "Failed exchange REST calls.", ("endpoint",)
+)
+exchange_weight_used = registry.gauge(
+    "exchange_weight_used", "Last reported 1m request weight used."
+)
+websocket_connects_total = registry.counter(
+    "websocket_connects_total", "Trade socket connections opened.", ("symbol",)
+)
+websocket_reconnects_total = registry.counter(
+    "websocket_reconnects_total", "Trade socket reconnects.", ("symbol",)
+)
+monitor_cycle_seconds = registry.histogram(
+    "monitor_cycle_seconds", "Duration of one open-order monitor cycle."
+)
+db_commit_seconds = registry.histogram("db_commit_seconds", "Database commit latency.")
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "Event loop scheduling lag."
+)
+slow_callbacks_total = registry.counter(
+    "slow_callbacks_total", "Event loop stalls over the slow callback threshold."
+)
+state_lock_wait_seconds = registry.histogram(
+    "state_lock_wait_seconds", "Time spent waiting for a state lock.", ("handler",)
+)
+state_lock_hold_seconds = registry.histogram(
+    "state_lock_hold_seconds", "Time a state lock was held.", ("handler",)
+)
+active_bots = registry.gauge(
+    "active_bots",
+    "Bots loaded in the engine by status.",
+    ("status",),
+    _active_bots_by_status,
+)
+
+
+def record_weight(client):
+    headers = getattr(getattr(client, "response", None), "headers", None)
+    used = headers.get("x-mbx-used-weight-1m") if headers else None
+    if used is not None:
+        exchange_weight_used.set(value=float(used))
+
+
+def instrument_sessions(session_factory):
+    from sqlalchemy import event
+
+    @event.listens_for(session_factory, "before_commit")
+    def before_commit(session):
+        session.info["commit_started"] = start_timer()
+
+    @event.listens_for(session_factory, "after_commit")
+    def after_commit(session):
+        db_commit_seconds.observe_since(session.info.pop("commit_started", 0.0))
@@ -0,0 +1,16 @@
+import logging
+from app.database import crud, models
+from app.database.database import SessionLocal
+
+
+def publish_notification(
+    user_id: int, message: str, type: str = "info"
+) -> tuple[models.Notification, int] | None:
+    db = SessionLocal()
+    try:
+        return crud.push_notification(db, user_id, message, type)
+    except Exception as e:
+        logging.exception(f"Failed to store notification for user {user_id}: {e}")
+        return None
+    finally:
+        db.close()
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import sys
+import threading
+from collections import Counter
+
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))
+PROFILE_MAX_SECONDS = float(os.environ.get("PROFILE_MAX_SECONDS", "60"))
+PROFILE_TOKEN_MAX_AGE = 300
+ENGINE_FILE = os.path.join("app", "states", "bot_execution_state.py")
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+}
+
+_lock = threading.Lock()
+
+
+def _frame_label(code) -> str:
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _bot_tag(frame) -> str | None:
+    while frame is not None:
+        if frame.f_code.co_filename.endswith(ENGINE_FILE):
+            bot_id = frame.f_locals.get("bot_id")
+            if isinstance(bot_id, str):
+                from app.services.engine_registry import engine_registry
+
+                bot = engine_registry.get_bot(bot_id)
+                symbol = bot["config"].get("pair", "") if bot else ""
+                return f"bot:{bot_id}/{symbol}"
+        frame = frame.f_back
+    return None
+
+
+def _is_idle(frame) -> bool:
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+class Sampler(threading.Thread):
+    def __init__(self, interval: float, include_idle: bool):
+        super().__init__(name="profiler", daemon=True)
+        self.interval = interval
+        self.include_idle = include_idle
+        self.samples: Counter[str] = Counter()
+        self.stopped = threading.Event()
+
+    def sample(self):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            if not self.include_idle and _is_idle(frame):
+                continue
+            stack = []
+            leaf = frame
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            tag = _bot_tag(leaf)
+            if tag:
+                stack.append(tag)
+            stack.append(names.get(ident, f"thread-{ident}"))
+            self.samples[";".join(reversed(stack))] += 1
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def collapsed(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.samples.most_common()
+        )
+
+
+async def profile(seconds: float, include_idle: bool = False) -> str:
+    if not _lock.acquire(blocking=False):
+        raise RuntimeError("A profile is already running")
+    sampler = Sampler(PROFILE_INTERVAL, include_idle)
+    try:
+        sampler.start()
+        await asyncio.sleep(min(max(seconds, PROFILE_INTERVAL), PROFILE_MAX_SECONDS))
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        _lock.release()
+    return sampler.collapsed()
@@ -0,0 +1,190 @@
+import asyncio
+import csv
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from app.services.sim_exchange import SimulatedExchange
+
+EXECUTION_MODE = os.environ.get("EXECUTION_MODE", "live").lower()
+REPLAY_TICK_FILE = os.environ.get("REPLAY_TICK_FILE", "")
+REPLAY_SPEED = os.environ.get("REPLAY_SPEED", "max")
+REPLAY_START_BALANCE = float(os.environ.get("REPLAY_START_BALANCE", "10000"))
+REPLAY_FEE_RATE = float(os.environ.get("REPLAY_FEE_RATE", "0"))
+REPLAY_REPORT_DIR = os.environ.get("REPLAY_REPORT_DIR", "replay_reports")
+REPLAY_DATABASE_URL = os.environ.get("REPLAY_DATABASE_URL", "")
+
+Tick = tuple[int, int, str, str]
+
+
+def replay_enabled() -> bool:
+    return EXECUTION_MODE == "replay"
+
+
+def isolate_database():
+    if not replay_enabled():
+        return
+    from sqlalchemy import create_engine
+    from app.database import database
+
+    url = REPLAY_DATABASE_URL
+    if not url:
+        live_url = database.engine.url
+        if live_url.get_backend_name() != "sqlite":
+            raise ValueError(
+                "EXECUTION_MODE=replay needs REPLAY_DATABASE_URL when the live database is not SQLite."
+            )
+        path = os.path.join(tempfile.mkdtemp(prefix="replay-"), "replay.db")
+        target = sqlite3.connect(path)
+        if live_url.database and os.path.exists(live_url.database):
+            source = sqlite3.connect(live_url.database)
+            source.backup(target)
+            source.close()
+        target.close()
+        url = f"sqlite:///{path}"
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    database.engine = create_engine(url, connect_args=connect_args)
+    database.SessionLocal.configure(bind=database.engine)
+    logging.info(f"Replay mode writes to {url}, the live database is untouched.")
+
+
+def parse_speed(value: str) -> float:
+    if value.lower() in ("", "max"):
+        return 0.0
+    return max(float(value.lower().rstrip("x")), 0.0)
+
+
+def load_ticks(path: str, symbol: str = "") -> list[Tick]:
+    ticks: list[Tick] = []
+    with open(path, newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if "p" not in event or (symbol and event.get("s", symbol) != symbol):
+                    continue
+                ticks.append(
+                    (
+                        int(event.get("t", len(ticks))),
+                        int(event["T"]),
+                        str(event["p"]),
+                        str(event["q"]),
+                    )
+                )
+        else:
+            for row in csv.reader(f):
+                if not row or not row[0][:1].isdigit():
+                    continue
+                if len(row) >= 6:
+                    ticks.append((int(row[0]), int(row[5]), row[1], row[2]))
+                else:
+                    ticks.append((len(ticks), int(row[0]), row[1], row[2]))
+    ticks.sort(key=lambda tick: (tick[1], tick[0]))
+    return ticks
+
+
+class ReplaySocket:
+    def __init__(
+        self,
+        symbol: str,
+        ticks: list[Tick],
+        exchange: SimulatedExchange,
+        speed: float,
+    ):
+        self.symbol = symbol
+        self.ticks = ticks
+        self.exchange = exchange
+        self.speed = speed
+        self.position = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def recv(self) -> dict:
+        if self.position >= len(self.ticks):
+            return {"e": "replay_end", "s": self.symbol}
+        trade_id, timestamp_ms, price, quantity = self.ticks[self.position]
+        if self.speed and self.position:
+            delay = (timestamp_ms - self.ticks[self.position - 1][1]) / 1000
+            await asyncio.sleep(delay / self.speed)
+        else:
+            await asyncio.sleep(0)
+        self.position += 1
+        self.exchange.on_tick(self.symbol, float(price), timestamp_ms)
+        return {
+            "e": "trade",
+            "E": timestamp_ms,
+            "s": self.symbol,
+            "t": trade_id,
+            "p": price,
+            "q": quantity,
+            "T": timestamp_ms,
+        }
+
+
+class ReplaySession:
+    def __init__(self, bot_id: str, symbol: str, ticks: list[Tick], speed: float):
+        self.bot_id = bot_id
+        self.symbol = symbol
+        self.exchange = SimulatedExchange(
+            {"USDT": REPLAY_START_BALANCE},
+            REPLAY_FEE_RATE,
+            order_prefix=f"R{time.time_ns()}-",
+        )
+        self.socket = ReplaySocket(symbol, ticks, self.exchange, speed)
+        if ticks:
+            self.exchange.on_tick(symbol, float(ticks[0][2]), ticks[0][1])
+
+    def report(self) -> dict:
+        return {
+            "bot_id": self.bot_id,
+            "symbol": self.symbol,
+            "ticks": self.socket.position,
+            "fills": len(self.exchange.journal),
+            "digest": self.exchange.digest(),
+            "balances": self.exchange.balances,
+            "journal": self.exchange.journal,
+        }
+
+
+sessions: dict[str, ReplaySession] = {}
+
+
+def start_session(
+    bot_id: str,
+    symbol: str,
+    path: str = REPLAY_TICK_FILE,
+    speed: str = REPLAY_SPEED,
+) -> ReplaySession:
+    if not path:
+        raise ValueError("REPLAY_TICK_FILE must be set when EXECUTION_MODE=replay.")
+    ticks = load_ticks(path, symbol)
+    if not ticks:
+        raise ValueError(f"No {symbol} ticks found in {path}.")
+    session = ReplaySession(bot_id, symbol, ticks, parse_speed(speed))
+    sessions[bot_id] = session
+    logging.info(f"Replaying {len(ticks)} {symbol} ticks from {path} for bot {bot_id}")
+    return session
+
+
+def finish_session(bot_id: str) -> dict | None:
+    session = sessions.pop(bot_id, None)
+    if session is None:
+        return None
+    report = session.report()
+    try:
+        os.makedirs(REPLAY_REPORT_DIR, exist_ok=True)
+        with open(os.path.join(REPLAY_REPORT_DIR, f"{bot_id}.json"), "w") as f:
+            json.dump(report, f, indent=2)
+    except OSError as e:
+        logging.exception(f"Failed to write replay report for bot {bot_id}: {e}")
+    logging.info(
+        f"Replay for bot {bot_id} finished after {report['ticks']} ticks, {report['fills']} fills, digest {report['digest']}"
+    )
+    return report
@@ -0,0 +1,225 @@
+import hashlib
+import itertools
+import json
+import logging
+from collections.abc import Iterator
+
+QUOTE_ASSETS = ("FDUSD", "USDT", "USDC", "TUSD")
+
+
+class OrderRejected(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+    def as_binance_error(self):
+        from binance.exceptions import BinanceAPIException
+
+        return BinanceAPIException(
+            None, 400, json.dumps({"code": self.code, "msg": self.message})
+        )
+
+
+def split_symbol(symbol: str) -> tuple[str, str]:
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return (symbol[: -len(quote)], quote)
+    raise OrderRejected(-1121, "Invalid symbol.")
+
+
+class SimulatedExchange:
+    def __init__(
+        self,
+        balances: dict[str, float] | None = None,
+        fee_rate: float = 0.0,
+        order_prefix: str = "",
+        order_ids: Iterator[int] | None = None,
+    ):
+        self.balances: dict[str, float] = dict(balances or {"USDT": 10000.0})
+        self.locked: dict[str, float] = {}
+        self.fee_rate = fee_rate
+        self.order_prefix = order_prefix
+        self.prices: dict[str, float] = {}
+        self.clock_ms = 0
+        self.orders: dict[str, dict] = {}
+        self.open_orders: dict[str, dict] = {}
+        self.journal: list[list] = []
+        self._order_ids = order_ids if order_ids is not None else itertools.count(1)
+
+    def on_tick(self, symbol: str, price: float, timestamp_ms: int) -> list[dict]:
+        self.prices[symbol] = price
+        self.clock_ms = max(self.clock_ms, timestamp_ms)
+        filled = []
+        for order_id, order in list(self.open_orders.items()):
+            if order["symbol"] != symbol:
+                continue
+            limit = float(order["price"])
+            if (order["side"] == "BUY" and price <= limit) or (
+                order["side"] == "SELL" and price >= limit
+            ):
+                del self.open_orders[order_id]
+                self._fill(order, limit, float(order["origQty"]))
+                filled.append(dict(order))
+        return filled
+
+    def _credit(self, asset: str, amount: float, locked: float = 0.0):
+        self.balances[asset] = self.balances.get(asset, 0.0) + amount
+        if locked:
+            self.locked[asset] = self.locked.get(asset, 0.0) + locked
+
+    def _fill(self, order: dict, price: float, quantity: float):
+        base, quote = split_symbol(order["symbol"])
+        notional = price * quantity
+        commission = notional * self.fee_rate
+        resting = order["type"] == "LIMIT"
+        if order["side"] == "BUY":
+            if resting:
+                self._credit(quote, -commission, -float(order["price"]) * quantity)
+            else:
+                self._credit(quote, -notional - commission)
+            self._credit(base, quantity)
+        else:
+            if resting:
+                self._credit(base, 0.0, -quantity)
+            else:
+                self._credit(base, -quantity)
+            self._credit(quote, notional - commission)
+        order["status"] = "FILLED"
+        order["executedQty"] = f"{quantity:.8f}"
+        order["cummulativeQuoteQty"] = f"{notional:.8f}"
+        order["updateTime"] = self.clock_ms
+        order["fills"] = [
+            {
+                "price": f"{price:.8f}",
+                "qty": f"{quantity:.8f}",
+                "commission": f"{commission:.8f}",
+                "commissionAsset": quote,
+            }
+        ]
+        self.journal.append(
+            [
+                int(order["orderId"][len(self.order_prefix) :]),
+                self.clock_ms,
+                order["symbol"],
+                order["side"],
+                order["type"],
+                order["price"],
+                order["executedQty"],
+            ]
+        )
+
+    def create_order(
+        self,
+        symbol: str,
+        side: str,
+        type: str,
+        quantity: float | None = None,
+        price: float | None = None,
+        quote_quantity: float | None = None,
+    ) -> dict:
+        base, quote = split_symbol(symbol)
+        side = side.upper()
+        type = type.upper()
+        if side not in ("BUY", "SELL"):
+            raise OrderRejected(-1100, "Illegal characters found in parameter 'side'.")
+        if type == "MARKET":
+            price = self.prices.get(symbol)
+            if price is None:
+                raise OrderRejected(-1121, "Invalid symbol.")
+            if quantity is None and quote_quantity is not None:
+                quantity = quote_quantity / price
+        elif type == "LIMIT":
+            if price is None or price <= 0:
+                raise OrderRejected(
+                    -1102, "Mandatory parameter 'price' was not sent or was invalid."
+                )
+        else:
+            raise OrderRejected(-1116, "Invalid orderType.")
+        if quantity is None or quantity <= 0:
+            raise OrderRejected(
+                -1102, "Mandatory parameter 'quantity' was not sent or was invalid."
+            )
+        quantity = round(quantity, 8)
+        asset, required = (quote, quantity * price) if side == "BUY" else (base, quantity)
+        if self.balances.get(asset, 0.0) + 1e-9 < required:
+            raise OrderRejected(
+                -2010, "Account has insufficient balance for requested action."
+            )
+        order = {
+            "symbol": symbol,
+            "orderId": f"{self.order_prefix}{next(self._order_ids)}",
+            "transactTime": self.clock_ms,
+            "updateTime": self.clock_ms,
+            "price": f"{price:.8f}",
+            "origQty": f"{quantity:.8f}",
+            "executedQty": "0.00000000",
+            "cummulativeQuoteQty": "0.00000000",
+            "status": "NEW",
+            "timeInForce": "GTC",
+            "type": type,
+            "side": side,
+            "fills": [],
+        }
+        self.orders[order["orderId"]] = order
+        if type == "MARKET":
+            self._fill(order, price, quantity)
+        else:
+            self._credit(asset, -required, required)
+            self.open_orders[order["orderId"]] = order
+        return dict(order)
+
+    def order_status(self, symbol: str, order_id) -> dict:
+        order = self.orders.get(str(order_id))
+        if order is None or order["symbol"] != symbol:
+            raise OrderRejected(-2013, "Order does not exist.")
+        return dict(order)
+
+    def account_balances(self) -> list[dict]:
+        assets = sorted(set(self.balances) | set(self.locked))
+        return [
+            {
+                "asset": asset,
+                "free": f"{max(self.balances.get(asset, 0.0), 0.0):.8f}",
+                "locked": f"{max(self.locked.get(asset, 0.0), 0.0):.8f}",
+            }
+            for asset in assets
+        ]
+
+    def digest(self) -> str:
+        return hashlib.sha256(json.dumps(self.journal).encode()).hexdigest()
+
+    async def validate_balance(
+        self, asset: str, required_amount: float
+    ) -> tuple[bool, float]:
+        available = self.balances.get(asset, 0.0)
+        return (available >= required_amount, available)
+
+    async def place_market_order(
+        self, pair: str, side: str, quantity: float
+    ) -> dict | None:
+        try:
+            if side.upper() == "BUY":
+                return self.create_order(pair, side, "MARKET", quote_quantity=quantity)
+            return self.create_order(pair, side, "MARKET", quantity=quantity)
+        except OrderRejected as e:
+            logging.error(f"Simulated market {side} on {pair} rejected: {e.message}")
+            return None
+
+    async def place_limit_order(
+        self, pair: str, side: str, quantity: float, price: float
+    ) -> dict | None:
+        try:
+            return self.create_order(pair, side, "LIMIT", quantity=quantity, price=price)
+        except OrderRejected as e:
+            logging.error(f"Simulated limit {side} on {pair} rejected: {e.message}")
+            return None
+
+    async def get_order(self, symbol: str, orderId) -> dict:
+        try:
+            return self.order_status(symbol, orderId)
+        except OrderRejected as e:
+            raise e.as_binance_error() from e
+
+    async def close_connection(self):
+        pass
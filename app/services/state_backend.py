@@ -0,0 +1,350 @@
+import asyncio
+import fnmatch
+import logging
+import os
+import time
+import zlib
+from reflex.istate.manager import StateManager, StateManagerRedis
+
+STATE_BACKEND = os.environ.get("STATE_BACKEND", "memory").lower()
+STATE_REDIS_URL = os.environ.get("STATE_REDIS_URL", os.environ.get("REDIS_URL", ""))
+STATE_COMPRESSION_THRESHOLD = int(
+    os.environ.get("STATE_COMPRESSION_THRESHOLD", "2048")
+)
+COMPRESSED_PREFIX = b"RXZ1"
+
+
+def compress_payload(value, threshold: int = STATE_COMPRESSION_THRESHOLD):
+    if not isinstance(value, (bytes, bytearray)) or len(value) < threshold:
+        return value
+    return COMPRESSED_PREFIX + zlib.compress(bytes(value), 1)
+
+
+def decompress_payload(value):
+    if isinstance(value, (bytes, bytearray)) and value.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(value[len(COMPRESSED_PREFIX) :])
+    return value
+
+
+class CompressingRedis:
+    def __init__(self, client, threshold: int = STATE_COMPRESSION_THRESHOLD):
+        self._client = client
+        self._threshold = threshold
+
+    async def get(self, name):
+        return decompress_payload(await self._client.get(name))
+
+    async def mget(self, keys, *args):
+        return [decompress_payload(v) for v in await self._client.mget(keys, *args)]
+
+    async def set(self, name, value, *args, **kwargs):
+        return await self._client.set(
+            name, compress_payload(value, self._threshold), *args, **kwargs
+        )
+
+    def pipeline(self, *args, **kwargs):
+        return _CompressingPipeline(self._client.pipeline(*args, **kwargs), self)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+class _CompressingPipeline:
+    def __init__(self, pipeline, owner: CompressingRedis):
+        self._pipeline = pipeline
+        self._owner = owner
+
+    def set(self, name, value, *args, **kwargs):
+        self._pipeline.set(
+            name, compress_payload(value, self._owner._threshold), *args, **kwargs
+        )
+        return self
+
+    async def execute(self, *args, **kwargs):
+        results = await self._pipeline.execute(*args, **kwargs)
+        return [decompress_payload(r) for r in results]
+
+    async def __aenter__(self):
+        await self._pipeline.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._pipeline.__aexit__(*exc)
+
+    def __getattr__(self, name):
+        return getattr(self._pipeline, name)
+
+
+class InProcessRedis:
+    def __init__(self):
+        self._data: dict[bytes, bytes] = {}
+        self._expires: dict[bytes, float] = {}
+        self._config: dict[str, str] = {"notify-keyspace-events": ""}
+        self._subscribers: list[InProcessPubSub] = []
+
+    @staticmethod
+    def _key(name) -> bytes:
+        return name if isinstance(name, bytes) else str(name).encode()
+
+    @staticmethod
+    def _value(value) -> bytes:
+        if isinstance(value, (bytes, bytearray)):
+            return bytes(value)
+        return str(value).encode()
+
+    def _alive(self, key: bytes) -> bool:
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            self._notify(key, "expired")
+            return False
+        return key in self._data
+
+    def _notify(self, key: bytes, event: str):
+        if not self._config.get("notify-keyspace-events"):
+            return
+        channel = b"__keyspace@0__:" + key
+        for pubsub in list(self._subscribers):
+            pubsub._deliver(channel, event.encode())
+
+    def get_connection_kwargs(self) -> dict:
+        return {"db": 0}
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, name):
+        key = self._key(name)
+        return self._data[key] if self._alive(key) else None
+
+    async def mget(self, keys, *args):
+        names = [*keys, *args] if isinstance(keys, (list, tuple)) else [keys, *args]
+        return [await self.get(n) for n in names]
+
+    async def set(
+        self,
+        name,
+        value,
+        ex=None,
+        px=None,
+        nx: bool = False,
+        xx: bool = False,
+        keepttl: bool = False,
+        get: bool = False,
+    ):
+        key = self._key(name)
+        exists = self._alive(key)
+        previous = self._data.get(key)
+        if (nx and exists) or (xx and not exists):
+            return previous if get else None
+        self._data[key] = self._value(value)
+        if ex is not None:
+            self._expires[key] = time.monotonic() + float(ex)
+        elif px is not None:
+            self._expires[key] = time.monotonic() + float(px) / 1000
+        elif not keepttl:
+            self._expires.pop(key, None)
+        self._notify(key, "set")
+        return previous if get else True
+
+    async def delete(self, *names) -> int:
+        removed = 0
+        for name in names:
+            key = self._key(name)
+            if self._alive(key):
+                del self._data[key]
+                self._expires.pop(key, None)
+                self._notify(key, "del")
+                removed += 1
+        return removed
+
+    async def exists(self, *names) -> int:
+        return sum(1 for n in names if self._alive(self._key(n)))
+
+    async def expire(self, name, time_seconds) -> bool:
+        return await self.pexpire(name, float(time_seconds) * 1000)
+
+    async def pexpire(self, name, time_ms) -> bool:
+        key = self._key(name)
+        if not self._alive(key):
+            return False
+        self._expires[key] = time.monotonic() + float(time_ms) / 1000
+        self._notify(key, "expire")
+        return True
+
+    async def pttl(self, name) -> int:
+        key = self._key(name)
+        if not self._alive(key):
+            return -2
+        deadline = self._expires.get(key)
+        return -1 if deadline is None else int((deadline - time.monotonic()) * 1000)
+
+    async def ttl(self, name) -> int:
+        remaining = await self.pttl(name)
+        return remaining if remaining < 0 else remaining // 1000
+
+    async def scan_iter(self, match=None, count=None):
+        pattern = match.decode() if isinstance(match, bytes) else match
+        for key in list(self._data):
+            if self._alive(key) and (
+                pattern is None or fnmatch.fnmatchcase(key.decode(), pattern)
+            ):
+                yield key
+
+    async def config_get(self, name="*") -> dict:
+        return {k: v for k, v in self._config.items() if fnmatch.fnmatchcase(k, name)}
+
+    async def config_set(self, name, value) -> bool:
+        self._config[name] = value
+        return True
+
+    async def publish(self, channel, message) -> int:
+        channel = self._key(channel)
+        delivered = 0
+        for pubsub in list(self._subscribers):
+            delivered += pubsub._deliver(channel, self._value(message))
+        return delivered
+
+    def pubsub(self, **kwargs) -> "InProcessPubSub":
+        return InProcessPubSub(self)
+
+    def pipeline(self, transaction: bool = True, **kwargs) -> "InProcessPipeline":
+        return InProcessPipeline(self)
+
+    async def aclose(self):
+        self._subscribers.clear()
+
+    async def close(self):
+        await self.aclose()
+
+    def used_bytes(self) -> int:
+        return sum(len(k) + len(v) for k, v in self._data.items())
+
+
+class InProcessPipeline:
+    def __init__(self, client: InProcessRedis):
+        self._client = client
+        self._commands = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args, **kwargs):
+            self._commands.append((method, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self, raise_on_error: bool = True):
+        commands, self._commands = self._commands, []
+        return [await method(*args, **kwargs) for method, args, kwargs in commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._commands = []
+
+    async def reset(self):
+        self._commands = []
+
+
+class InProcessPubSub:
+    def __init__(self, client: InProcessRedis):
+        self._client = client
+        self._channels: set[bytes] = set()
+        self._patterns: set[bytes] = set()
+        self._queue: asyncio.Queue = asyncio.Queue()
+        client._subscribers.append(self)
+
+    def _deliver(self, channel: bytes, data: bytes) -> int:
+        delivered = 0
+        if channel in self._channels:
+            self._queue.put_nowait(
+                {"type": "message", "pattern": None, "channel": channel, "data": data}
+            )
+            delivered += 1
+        for pattern in self._patterns:
+            if fnmatch.fnmatchcase(channel.decode(), pattern.decode()):
+                self._queue.put_nowait(
+                    {
+                        "type": "pmessage",
+                        "pattern": pattern,
+                        "channel": channel,
+                        "data": data,
+                    }
+                )
+                delivered += 1
+        return delivered
+
+    async def subscribe(self, *channels, **kwargs):
+        self._channels.update(InProcessRedis._key(c) for c in channels)
+
+    async def psubscribe(self, *patterns, **kwargs):
+        self._patterns.update(InProcessRedis._key(p) for p in patterns)
+
+    async def unsubscribe(self, *channels):
+        for c in channels or list(self._channels):
+            self._channels.discard(InProcessRedis._key(c))
+
+    async def punsubscribe(self, *patterns):
+        for p in patterns or list(self._patterns):
+            self._patterns.discard(InProcessRedis._key(p))
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: float | None = 0.0
+    ):
+        try:
+            if not timeout:
+                return self._queue.get_nowait()
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except (asyncio.QueueEmpty, asyncio.TimeoutError):
+            return None
+
+    async def listen(self):
+        while True:
+            yield await self._queue.get()
+
+    async def aclose(self):
+        if self in self._client._subscribers:
+            self._client._subscribers.remove(self)
+
+    async def reset(self):
+        await self.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+def create_state_manager(state, backend: str = STATE_BACKEND) -> StateManager | None:
+    if backend == "memory":
+        return None
+    if backend == "inprocess":
+        client = InProcessRedis()
+    elif backend == "redis":
+        import redis.asyncio as redis_asyncio
+
+        if not STATE_REDIS_URL:
+            raise ValueError("STATE_BACKEND=redis requires STATE_REDIS_URL.")
+        client = redis_asyncio.from_url(STATE_REDIS_URL)
+    else:
+        raise ValueError(f"Unknown STATE_BACKEND '{backend}'.")
+    return StateManagerRedis(state=state, redis=CompressingRedis(client))
+
+
+def install_state_backend(rx_app):
+    manager = create_state_manager(rx_app._state)
+    if manager is None:
+        return
+    rx_app._state_manager = manager
+    logging.info(
+        f"Using {STATE_BACKEND} state backend with compression above {STATE_COMPRESSION_THRESHOLD} bytes."
+    )
+    if STATE_BACKEND == "redis":
+        logging.warning(
+            "Session state is shared through Redis, but the bot engine (engine registry, active deals, UI publisher and trade sockets) is process-local. Run the backend with a single worker."
+        )
@@ -0,0 +1,35 @@
+import os
+import logging
+import reflex as rx
+
+SESSION_STATE_BUDGET_BYTES = int(
+    os.environ.get("SESSION_STATE_BUDGET_BYTES", str(64 * 1024))
+)
+
+
+def substate_size_bytes(state: rx.State) -> int:
+    return len(state._serialize())
+
+
+def session_state_sizes(root: rx.State) -> dict[str, int]:
+    sizes = {}
+    pending = [root]
+    while pending:
+        state = pending.pop()
+        sizes[state.get_full_name()] = substate_size_bytes(state)
+        pending.extend(state.substates.values())
+    return sizes
+
+
+def check_session_state_size(
+    root: rx.State, budget: int = SESSION_STATE_BUDGET_BYTES
+) -> tuple[bool, int]:
+    sizes = session_state_sizes(root)
+    total = sum(sizes.values())
+    if total > budget:
+        largest = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:3]
+        logging.warning(
+            f"Session state is {total} bytes, over the {budget} byte budget. Largest substates: {largest}"
+        )
+        return (False, total)
+    return (True, total)
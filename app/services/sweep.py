@@ -0,0 +1,162 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import TypedDict
+import numpy as np
+from app.services import dca, market_data
+from app.services.backtest import BacktestResult, price_columns, simulate
+
+SWEEP_WORKERS = int(os.environ.get("SWEEP_WORKERS", str(os.cpu_count() or 2)))
+SWEEP_MAX_CONFIGS = 2000
+SWEEP_CHUNK_SIZE = 16
+SUGGEST_INTERVAL = "15m"
+SUGGEST_LOOKBACK_DAYS = 90
+SUGGEST_MIN_CANDLES = 1000
+INTEGER_FIELDS = ("max_safety_orders", "immediate_safety_orders")
+
+_worker_prices: np.ndarray | None = None
+_worker_memory: shared_memory.SharedMemory | None = None
+
+
+class SweepResult(TypedDict):
+    config: dict
+    result: BacktestResult
+    capital_required: float
+
+
+def expand_grid(base_config: dict, ranges: dict[str, list]) -> list[dict]:
+    fields = [f for f in ranges if f in base_config and ranges[f]]
+    configs = []
+    for values in itertools.product(*(ranges[f] for f in fields)):
+        config = dict(base_config)
+        for field, value in zip(fields, values):
+            config[field] = int(value) if field in INTEGER_FIELDS else float(value)
+        config["immediate_safety_orders"] = min(
+            config["immediate_safety_orders"], config["max_safety_orders"]
+        )
+        configs.append(config)
+    return configs
+
+
+def default_ranges() -> dict[str, list]:
+    return {
+        "price_deviation": [0.5, 1.0, 1.5, 2.0, 3.0],
+        "safety_order_step_scale": [1.0, 1.2, 1.5],
+        "safety_order_volume_scale": [1.0, 1.5, 2.0],
+        "max_safety_orders": [3, 5, 8],
+        "take_profit_percentage": [0.8, 1.5, 2.5],
+    }
+
+
+def fetch_recent_klines(
+    pair: str,
+    interval: str = SUGGEST_INTERVAL,
+    lookback_days: int = SUGGEST_LOOKBACK_DAYS,
+) -> np.ndarray:
+    candles = market_data.recent_candles(pair, interval, lookback_days)
+    store = market_data.KlineStore(pair, interval)
+    interval_ms = market_data.INTERVAL_MS[interval]
+    now_ms = int(time.time() * 1000)
+    last = store.last_open_time()
+    if len(candles) >= SUGGEST_MIN_CANDLES and last >= now_ms - 2 * interval_ms:
+        return candles
+    if len(candles) >= SUGGEST_MIN_CANDLES:
+        start_ms = last + interval_ms
+    else:
+        start_ms = now_ms - lookback_days * 86_400_000
+    from app.services.binance_client import create_client
+
+    rows = create_client().get_historical_klines(pair, interval, start_ms)
+    closed = [row[:6] for row in rows if row[6] < now_ms]
+    store.append(market_data.parse_kline_rows(closed))
+    return market_data.recent_candles(pair, interval, lookback_days)
+
+
+def _attach(name: str, shape: tuple[int, int]):
+    global _worker_prices, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_prices = np.ndarray(shape, dtype=np.float64, buffer=_worker_memory.buf)
+
+
+def _run(args: tuple[dict, float]) -> BacktestResult:
+    config, fee_rate = args
+    return simulate(config, _worker_prices, fee_rate)
+
+
+def dominates(a: SweepResult, b: SweepResult) -> bool:
+    a_key = (
+        a["result"]["total_pnl"],
+        -a["result"]["max_drawdown"],
+        -a["capital_required"],
+    )
+    b_key = (
+        b["result"]["total_pnl"],
+        -b["result"]["max_drawdown"],
+        -b["capital_required"],
+    )
+    return all(x >= y for x, y in zip(a_key, b_key)) and a_key != b_key
+
+
+def pareto_front(results: list[SweepResult]) -> list[SweepResult]:
+    ordered = sorted(
+        results,
+        key=lambda r: (
+            -r["result"]["total_pnl"],
+            r["result"]["max_drawdown"],
+            r["capital_required"],
+        ),
+    )
+    front: list[SweepResult] = []
+    for candidate in ordered:
+        if not any(dominates(kept, candidate) for kept in front):
+            front.append(candidate)
+    return front
+
+
+def run_sweep(
+    base_config: dict,
+    candles: np.ndarray,
+    ranges: dict[str, list] | None = None,
+    fee_rate: float = 0.001,
+    workers: int = SWEEP_WORKERS,
+) -> list[SweepResult]:
+    configs = expand_grid(base_config, ranges or default_ranges())
+    if len(configs) > SWEEP_MAX_CONFIGS:
+        raise ValueError(
+            f"Sweep has {len(configs)} configs, limit is {SWEEP_MAX_CONFIGS}."
+        )
+    prices = price_columns(candles)
+    memory = shared_memory.SharedMemory(create=True, size=prices.nbytes)
+    try:
+        np.ndarray(prices.shape, dtype=np.float64, buffer=memory.buf)[:] = prices
+        with ProcessPoolExecutor(
+            max_workers=max(1, workers),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_attach,
+            initargs=(memory.name, prices.shape),
+        ) as pool:
+            results = list(
+                pool.map(
+                    _run,
+                    [(config, fee_rate) for config in configs],
+                    chunksize=SWEEP_CHUNK_SIZE,
+                )
+            )
+    finally:
+        memory.close()
+        memory.unlink()
+    logging.info(f"Swept {len(configs)} configs over {prices.shape[1]} candles.")
+    return pareto_front(
+        [
+            SweepResult(
+                config=config,
+                result=result,
+                capital_required=dca.max_bot_capital(config),
+            )
+            for config, result in zip(configs, results)
+        ]
+    )
@@ -0,0 +1,236 @@
+import argparse
+import atexit
+import contextvars
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from collections.abc import Callable
+
+TRACE_FILE = os.environ.get("TRACE_FILE", "")
+TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "0"))
+TRACE_ACTIONS = os.environ.get("TRACE_ACTIONS", "false").lower() == "true"
+
+_current: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_trace_ids = itertools.count(1)
+_exporters: list[Callable[[dict], None]] = []
+_sink = None
+
+
+class Span:
+    __slots__ = ("name", "started", "attrs", "duration")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.duration: float | None = None
+        self.started = time.perf_counter()
+
+    def end(self, **attrs):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+            self.attrs.update(attrs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(**({"error": exc_type.__name__} if exc_type else {}))
+        return False
+
+
+class _NoopSpan:
+    def end(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    __slots__ = (
+        "trace_id",
+        "bot_id",
+        "symbol",
+        "event_time",
+        "trade_time",
+        "received_at",
+        "received",
+        "sampled",
+        "decision",
+        "spans",
+    )
+
+    def __init__(self, bot_id: str, symbol: str, event: dict, sampled: bool):
+        self.received_at = time.time()
+        self.received = time.perf_counter()
+        self.trace_id = 0
+        self.bot_id = bot_id
+        self.symbol = symbol
+        self.event_time = event.get("E")
+        self.trade_time = event.get("T")
+        self.sampled = sampled
+        self.decision: str | None = None
+        self.spans: list[Span] = []
+
+    def to_record(self) -> dict:
+        finished = time.perf_counter()
+        received_ms = self.received_at * 1000
+        return {
+            "trace_id": self.trace_id,
+            "bot_id": self.bot_id,
+            "symbol": self.symbol,
+            "decision": self.decision,
+            "event_time": self.event_time,
+            "trade_time": self.trade_time,
+            "received_at": round(received_ms, 3),
+            "socket_delay_ms": (
+                round(received_ms - self.event_time, 3) if self.event_time else None
+            ),
+            "total_ms": round((finished - self.received) * 1000, 3),
+            "spans": [
+                {
+                    "name": span.name,
+                    "start_ms": round((span.started - self.received) * 1000, 3),
+                    "duration_ms": (
+                        round(span.duration * 1000, 3)
+                        if span.duration is not None
+                        else None
+                    ),
+                    **span.attrs,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+def enabled() -> bool:
+    return TRACE_ACTIONS or TRACE_SAMPLE_RATE > 0
+
+
+def begin_tick(bot_id: str, symbol: str, event: dict) -> contextvars.Token | None:
+    if not enabled():
+        return None
+    sampled = TRACE_SAMPLE_RATE > 0 and random.random() < TRACE_SAMPLE_RATE
+    if not sampled and not TRACE_ACTIONS:
+        return None
+    return _current.set(Trace(bot_id, symbol, event, sampled))
+
+
+def set_decision(decision: str | None):
+    trace = _current.get()
+    if trace is not None:
+        trace.decision = decision
+
+
+def span(name: str, **attrs) -> Span | _NoopSpan:
+    trace = _current.get()
+    if trace is None or not (trace.sampled or (TRACE_ACTIONS and trace.decision)):
+        return NOOP_SPAN
+    span = Span(name, attrs)
+    trace.spans.append(span)
+    return span
+
+
+def finish_tick(token: contextvars.Token | None):
+    if token is None:
+        return
+    trace = _current.get()
+    _current.reset(token)
+    if trace is None or not (trace.sampled or (TRACE_ACTIONS and trace.decision)):
+        return
+    trace.trace_id = next(_trace_ids)
+    export(trace.to_record())
+
+
+def add_exporter(exporter: Callable[[dict], None]):
+    _exporters.append(exporter)
+
+
+def export(record: dict):
+    global _sink
+    for exporter in _exporters:
+        try:
+            exporter(record)
+        except Exception as e:
+            logging.exception(f"Trace exporter failed: {e}")
+    if not TRACE_FILE:
+        return
+    try:
+        if _sink is None:
+            _sink = open(TRACE_FILE, "a", buffering=1)
+        _sink.write(json.dumps(record) + "\n")
+    except OSError as e:
+        logging.exception(f"Failed to write trace to {TRACE_FILE}: {e}")
+
+
+def close():
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+atexit.register(close)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def summarize(records) -> dict[str, dict]:
+    timings: dict[str, dict[str, list[float]]] = {}
+    for record in records:
+        bot = timings.setdefault(record["bot_id"], {})
+        if record.get("socket_delay_ms") is not None:
+            bot.setdefault("socket", []).append(record["socket_delay_ms"])
+        bot.setdefault("total", []).append(record["total_ms"])
+        for span in record["spans"]:
+            if span["duration_ms"] is not None:
+                bot.setdefault(span["name"], []).append(span["duration_ms"])
+    return {
+        bot_id: {
+            name: {
+                "count": len(values),
+                "p50_ms": _percentile(values, 0.5),
+                "p95_ms": _percentile(values, 0.95),
+                "max_ms": max(values),
+            }
+            for name, values in spans.items()
+        }
+        for bot_id, spans in timings.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize engine traces per bot.")
+    parser.add_argument("path", nargs="?", default=TRACE_FILE)
+    parser.add_argument("--bot-id")
+    args = parser.parse_args()
+    if not args.path:
+        parser.error("pass a trace file or set TRACE_FILE")
+    with open(args.path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if args.bot_id:
+        records = [r for r in records if r["bot_id"] == args.bot_id]
+    for bot_id, spans in summarize(records).items():
+        print(bot_id)
+        for name, stats in spans.items():
+            print(
+                f"  {name:24s} n={stats['count']:<6d} p50 {stats['p50_ms']:9.3f} ms  p95 {stats['p95_ms']:9.3f} ms  max {stats['max_ms']:9.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
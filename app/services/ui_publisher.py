@@ -0,0 +1,98 @@
+import os
+import logging
+
+UI_PUSH_HZ = float(os.environ.get("UI_PUSH_HZ", "2"))
+UI_STREAM_IDLE_SECONDS = float(os.environ.get("UI_STREAM_IDLE_SECONDS", "300"))
+
+
+class UIUpdatePublisher:
+    def __init__(self, frame_rate: float = UI_PUSH_HZ):
+        self.frame_interval = 1.0 / max(frame_rate, 0.1)
+        self._last_values: dict[str, dict[str, float]] = {}
+        self._pending: dict[str, dict[str, dict[str, float]]] = {}
+        self._subscribers: dict[str, set[str]] = {}
+        self._session_bots: dict[str, set[str]] = {}
+        self._mount_counts: dict[str, int] = {}
+        self._streaming: set[str] = set()
+
+    def publish(self, channel: str, bot_id: str, value: float):
+        last = self._last_values.setdefault(channel, {})
+        if last.get(bot_id) == value:
+            return
+        last[bot_id] = value
+        for token in self._subscribers.get(bot_id, ()):
+            self._pending.setdefault(token, {}).setdefault(channel, {})[bot_id] = value
+
+    def publish_price(self, bot_id: str, price: float):
+        self.publish("prices", bot_id, price)
+
+    def publish_pnl(self, bot_id: str, unrealized_pnl: float):
+        self.publish("pnl", bot_id, unrealized_pnl)
+
+    def last_value(self, channel: str, bot_id: str, default: float = 0.0) -> float:
+        return self._last_values.get(channel, {}).get(bot_id, default)
+
+    def last_price(self, bot_id: str) -> float:
+        return self.last_value("prices", bot_id)
+
+    def forget_bot(self, bot_id: str):
+        for last in self._last_values.values():
+            last.pop(bot_id, None)
+
+    def mount(self, token: str, bot_ids: list[str]) -> bool:
+        self._mount_counts[token] = self._mount_counts.get(token, 0) + 1
+        self._subscribe(token, bot_ids)
+        if token in self._streaming:
+            return False
+        self._streaming.add(token)
+        return True
+
+    def unmount(self, token: str):
+        count = self._mount_counts.get(token, 0) - 1
+        if count > 0:
+            self._mount_counts[token] = count
+            return
+        self._mount_counts.pop(token, None)
+        self._unsubscribe(token)
+
+    def disconnect(self, token: str):
+        self._mount_counts.pop(token, None)
+        self._unsubscribe(token)
+
+    def is_mounted(self, token: str) -> bool:
+        return self._mount_counts.get(token, 0) > 0
+
+    def stream_finished(self, token: str):
+        self._streaming.discard(token)
+        if not self.is_mounted(token):
+            self._unsubscribe(token)
+
+    def drain(self, token: str) -> dict[str, dict[str, float]]:
+        return self._pending.pop(token, {})
+
+    def snapshot(self, bot_ids: list[str]) -> dict[str, dict[str, float]]:
+        return {
+            channel: {b: last[b] for b in bot_ids if b in last}
+            for channel, last in self._last_values.items()
+        }
+
+    def _subscribe(self, token: str, bot_ids: list[str]):
+        session_bots = self._session_bots.setdefault(token, set())
+        for bot_id in bot_ids:
+            if bot_id not in session_bots:
+                session_bots.add(bot_id)
+                self._subscribers.setdefault(bot_id, set()).add(token)
+
+    def _unsubscribe(self, token: str):
+        for bot_id in self._session_bots.pop(token, set()):
+            tokens = self._subscribers.get(bot_id)
+            if tokens is None:
+                continue
+            tokens.discard(token)
+            if not tokens:
+                del self._subscribers[bot_id]
+        self._pending.pop(token, None)
+        logging.debug(f"Session {token} has no mounted price views, dropped updates.")
+
+
+ui_publisher = UIUpdatePublisher()
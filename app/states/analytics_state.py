@@ -1,13 +1,22 @@
 import reflex as rx
-from typing import TypedDict, cast
+from typing import TypedDict
 import logging
-from app.states.bot_state import BotsState, Bot
-from app.states.deal_state import DealState, Deal
-import csv
-import io
+from urllib.parse import urlencode
+from app.database import analytics, crud, performance, security
+from app.services import export
+from app.database.database import SessionLocal
+from app.services.engine_registry import engine_registry
+from app.states.auth_state import AuthState
 import time
 
 
+def user_id_for_email(db, email: str) -> int | None:
+    account = engine_registry.accounts.get(email)
+    if account and account["user_id"] is not None:
+        return account["user_id"]
+    return crud.get_user_id_from_email(db, email)
+
+
 class AnalyticsData(TypedDict):
     total_pnl: float
     total_deals: int
@@ -17,115 +26,168 @@ class AnalyticsData(TypedDict):
     pnl_history: list[dict[str, float | str]]
 
 
+class BotPerformanceRow(TypedDict):
+    bot_id: str
+    name: str
+    pair: str
+    total_pnl: float
+    deals_count: int
+    max_drawdown: float
+    max_safety_orders: int
+    average_deal_duration: float
+    average_utilization: float
+    pnl_histogram: list[dict[str, str | int]]
+    utilization: list[dict[str, str | float]]
+
+
+def bot_performance_row(db_bot, metrics: dict) -> BotPerformanceRow:
+    utilization = metrics["utilization"]
+    return BotPerformanceRow(
+        bot_id=db_bot.uuid,
+        name=db_bot.name,
+        pair=(db_bot.config or {}).get("pair", ""),
+        total_pnl=round(metrics["total_pnl"], 2),
+        deals_count=metrics["deals_count"],
+        max_drawdown=round(metrics["max_drawdown"], 2),
+        max_safety_orders=metrics["max_safety_orders"],
+        average_deal_duration=round(metrics["average_deal_duration"] / 60, 2),
+        average_utilization=(
+            round(sum(u for _, u in utilization) / len(utilization), 2)
+            if utilization
+            else 0.0
+        ),
+        pnl_histogram=[
+            {"bucket": label, "deals": count}
+            for label, count in zip(
+                performance.histogram_labels(), metrics["pnl_histogram"]
+            )
+        ],
+        utilization=[
+            {
+                "time": time.strftime("%Y-%m-%d %H:%M", time.gmtime(closed_at)),
+                "utilization": value,
+            }
+            for closed_at, value in utilization
+        ],
+    )
+
+
 class AnalyticsState(rx.State):
     analytics_data: AnalyticsData | None = None
     is_loading: bool = False
+    bot_performance: list[BotPerformanceRow] = []
+    selected_bot_id: str = ""
+    export_format: str = "csv"
+    export_start: str = ""
+    export_end: str = ""
+    export_bot_id: str = ""
+
+    @rx.var
+    def selected_bot_performance(self) -> BotPerformanceRow | None:
+        return next(
+            (p for p in self.bot_performance if p["bot_id"] == self.selected_bot_id),
+            self.bot_performance[0] if self.bot_performance else None,
+        )
+
+    @rx.event
+    def select_bot(self, bot_id: str):
+        self.selected_bot_id = bot_id
+
+    @rx.var
+    def export_formats(self) -> list[str]:
+        return ["csv", "parquet"] if export.parquet_available() else ["csv"]
+
+    @rx.event
+    def set_export_format(self, value: str):
+        self.export_format = value
+
+    @rx.event
+    def set_export_start(self, value: str):
+        self.export_start = value
+
+    @rx.event
+    def set_export_end(self, value: str):
+        self.export_end = value
+
+    @rx.event
+    def set_export_bot_id(self, value: str):
+        self.export_bot_id = value
 
     @rx.event(background=True)
     async def calculate_analytics(self):
         async with self:
             self.is_loading = True
+            auth_state = await self.get_state(AuthState)
+            email = auth_state.current_user["email"] if auth_state.current_user else ""
+        db = SessionLocal()
         try:
-            async with self:
-                deal_state = await self.get_state(DealState)
-                bots_state = await self.get_state(BotsState)
-            completed_deals = [
-                deal
-                for deal in deal_state.deals.values()
-                if deal["status"] == "completed" and deal["close_time"]
-            ]
-            total_pnl = sum((deal["realized_pnl"] for deal in completed_deals))
-            total_deals = len(completed_deals)
-            profitable_deals = sum(
-                (1 for deal in completed_deals if deal["realized_pnl"] > 0)
-            )
-            win_rate = profitable_deals / total_deals * 100 if total_deals > 0 else 0.0
-            total_volume = sum(
-                (
-                    deal["base_order"]["price"] * deal["base_order"]["quantity"]
-                    + sum(
-                        (
-                            so["price"] * so["quantity"]
-                            for so in deal.get("safety_orders", [])
-                        )
-                    )
-                    for deal in completed_deals
-                )
-            )
-            total_duration = sum(
-                (
-                    cast(float, deal["close_time"]) - deal["entry_time"]
-                    for deal in completed_deals
+            user_id = user_id_for_email(db, email)
+            if user_id is None:
+                async with self:
+                    self.analytics_data = None
+                    self.is_loading = False
+                return
+            metrics = analytics.user_analytics(db, user_id)
+            bot_rows = [
+                bot_performance_row(
+                    db_bot, performance.get_bot_performance(db, db_bot)
                 )
-            )
-            average_deal_duration = (
-                total_duration / total_deals if total_deals > 0 else 0.0
-            )
-            pnl_history = sorted(
-                [
+                for db_bot in crud.get_bots_by_user(db, user_id)
+            ]
+            cumulative_pnl_history = []
+            cumulative_pnl = 0.0
+            for day, pnl in metrics["daily_pnl"]:
+                cumulative_pnl += pnl
+                cumulative_pnl_history.append(
                     {
                         "date": time.strftime(
-                            "%Y-%m-%d", time.gmtime(cast(float, d["close_time"]))
+                            "%Y-%m-%d", time.gmtime(day * analytics.SECONDS_PER_DAY)
                         ),
-                        "pnl": d["realized_pnl"],
+                        "pnl": round(cumulative_pnl, 2),
                     }
-                    for d in completed_deals
-                ],
-                key=lambda x: x["date"],
-            )
-            cumulative_pnl_history = []
-            cumulative_pnl = 0
-            if pnl_history:
-                from itertools import groupby
-
-                for date, group in groupby(pnl_history, key=lambda x: x["date"]):
-                    daily_pnl = sum((item["pnl"] for item in group))
-                    cumulative_pnl += daily_pnl
-                    cumulative_pnl_history.append(
-                        {"date": date, "pnl": round(cumulative_pnl, 2)}
-                    )
+                )
             async with self:
                 self.analytics_data = {
-                    "total_pnl": round(total_pnl, 2),
-                    "total_deals": total_deals,
-                    "win_rate": round(win_rate, 2),
-                    "total_volume": round(total_volume, 2),
-                    "average_deal_duration": round(average_deal_duration / 60, 2),
+                    "total_pnl": round(metrics["total_pnl"], 2),
+                    "total_deals": metrics["total_deals"],
+                    "win_rate": round(metrics["win_rate"], 2),
+                    "total_volume": round(metrics["total_volume"], 2),
+                    "average_deal_duration": round(
+                        metrics["average_deal_duration"] / 60, 2
+                    ),
                     "pnl_history": cumulative_pnl_history,
                 }
+                self.bot_performance = bot_rows
                 self.is_loading = False
         except Exception as e:
             logging.exception(f"Error calculating analytics: {e}")
             async with self:
                 self.is_loading = False
+        finally:
+            db.close()
 
-    @rx.event(background=True)
-    async def export_deals_csv(self):
-        async with self:
-            deal_state = await self.get_state(DealState)
-            deals = list(deal_state.deals.values())
-        if not deals:
-            return rx.toast.info("No deals to export.")
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(
-            ["Deal ID", "Bot ID", "Status", "Entry Time", "Close Time", "Realized PNL"]
+    @rx.event
+    async def export_history(self, kind: str):
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.current_user:
+            return
+        db = SessionLocal()
+        try:
+            user_id = user_id_for_email(db, auth_state.current_user["email"])
+        finally:
+            db.close()
+        if user_id is None:
+            return rx.toast.error("Could not prepare the export.")
+        token = security.create_signed_token({"scope": "export", "user_id": user_id})
+        params = {
+            "token": token,
+            "format": self.export_format,
+            "start": self.export_start,
+            "end": self.export_end,
+            "bot_id": self.export_bot_id,
+        }
+        query = urlencode({k: v for k, v in params.items() if v})
+        return rx.download(
+            url=f"{rx.config.get_config().api_url}/api/export/{kind}?{query}",
+            filename=f"{kind}_export.{self.export_format}",
         )
-        for deal in deals:
-            writer.writerow(
-                [
-                    deal["deal_id"],
-                    deal["bot_id"],
-                    deal["status"],
-                    time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(deal["entry_time"])),
-                    time.strftime(
-                        "%Y-%m-%d %H:%M:%S",
-                        time.gmtime(cast(float, deal["close_time"])),
-                    )
-                    if deal["close_time"]
-                    else "N/A",
-                    deal["realized_pnl"],
-                ]
-            )
-        csv_data = output.getvalue()
-        return rx.download(data=csv_data.encode("utf-8"), filename="deals_export.csv")
\ No newline at end of file
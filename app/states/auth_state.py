@@ -1,11 +1,19 @@
 import reflex as rx
 from typing import TypedDict, Literal
+import os
 import re
 import logging
 from app.database import crud, security, models
 from app.database.database import get_db
 from sqlalchemy.orm import Session
 from app.services.email_service import EmailService
+from app.services.engine_registry import engine_registry
+
+ADMIN_EMAILS = {
+    email.strip().lower()
+    for email in os.environ.get("ADMIN_EMAILS", "").split(",")
+    if email.strip()
+}
 
 
 class User(TypedDict):
@@ -20,6 +28,12 @@ class AuthState(rx.State):
     current_user: User | None = None
     login_error: str = ""
 
+    @rx.var
+    def is_admin(self) -> bool:
+        return bool(
+            self.current_user and self.current_user["email"].lower() in ADMIN_EMAILS
+        )
+
     def _get_db(self) -> Session:
         return next(get_db())
 
@@ -94,6 +108,7 @@ class AuthState(rx.State):
                 email_verified=user.email_verified,
             )
             self.login_error = ""
+            engine_registry.set_account(user.email, user.id)
             db.close()
             return rx.redirect("/")
         else:
@@ -129,6 +144,13 @@ class AuthState(rx.State):
         if not self.is_logged_in:
             return rx.redirect("/login")
 
+    @rx.event
+    def check_admin(self):
+        if not self.is_logged_in:
+            return rx.redirect("/login")
+        if not self.is_admin:
+            return rx.redirect("/")
+
     @rx.event
     async def on_load(self):
         self.check_login()
@@ -1,86 +1,243 @@
 import reflex as rx
+from reflex.utils import prerequisites
 import asyncio
 import logging
-from typing import cast
-from binance import AsyncClient, BinanceSocketManager
-from app.states.bot_state import BotsState, Bot
+import time
+from typing import TypedDict
+from app.states.bot_state import BotsState
 from app.states.exchange_state import ExchangeState
-from app.states.deal_state import DealState, Order, OrderStatus, Deal
+from app.states.deal_state import DealState, Order, Deal
 from contextlib import AsyncExitStack
 from app.services.email_service import EmailService
 from app.states.auth_state import AuthState
+from app.services import binance_client, dca, metrics, replay, tracing
+from app.services.kline_aggregator import kline_aggregator
+from app.services.ui_publisher import UI_STREAM_IDLE_SECONDS, ui_publisher
+from app.services.engine_registry import AccountContext, engine_registry
+from app.services.notification_service import publish_notification
+from app.states.notification_state import NotificationState, NotificationType
 
 active_sockets: dict[str, AsyncExitStack] = {}
 order_monitoring_task: asyncio.Task | None = None
+STRATEGY_IDLE_STATUSES = (
+    "paused",
+    "stopped",
+    "error",
+    "closing",
+    "placing_order",
+    "waiting_for_balance",
+)
+CHART_INTERVAL = "1m"
+CHART_BARS = 60
+
+
+def safety_order_trigger_price(config, deal: Deal) -> float:
+    return dca.safety_order_trigger_price(
+        config, deal["base_order"]["price"], len(deal["filled_safety_orders"])
+    )
+
+
+def take_profit_reached(config, deal: Deal, current_price: float) -> bool:
+    return dca.take_profit_reached(config, deal["average_entry_price"], current_price)
+
+
+def strategy_decision(bot_id: str, current_price: float) -> str | None:
+    bot = engine_registry.get_bot(bot_id)
+    if not bot or bot["status"] in STRATEGY_IDLE_STATUSES:
+        return None
+    deal = engine_registry.get_active_deal(bot_id)
+    if not deal:
+        return None
+    ui_publisher.publish_pnl(
+        bot_id, (current_price - deal["average_entry_price"]) * deal["total_quantity"]
+    )
+    config = bot["config"]
+    if take_profit_reached(config, deal, current_price):
+        return "take_profit"
+    if len(deal["filled_safety_orders"]) < config[
+        "max_safety_orders"
+    ] and current_price <= safety_order_trigger_price(config, deal):
+        return "safety_order"
+    return None
+
+
+class ChartBar(TypedDict):
+    time: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def chart_bars(symbol: str, limit: int = CHART_BARS) -> list[ChartBar]:
+    return [
+        ChartBar(
+            time=time.strftime("%H:%M", time.gmtime(bar[0] / 1000)),
+            open=bar[1],
+            high=bar[2],
+            low=bar[3],
+            close=bar[4],
+            volume=bar[5],
+        )
+        for bar in kline_aggregator.bars(symbol, CHART_INTERVAL, limit)
+    ]
+
+
+def client_connected(token: str) -> bool | None:
+    try:
+        namespace = prerequisites.get_app().app.event_namespace
+    except Exception:
+        return None
+    if namespace is None:
+        return None
+    return token in namespace.token_to_sid
 
 
 class BotExecutionState(rx.State):
     bot_prices: dict[str, float] = {}
+    bot_unrealized_pnl: dict[str, float] = {}
+    price_bars: list[ChartBar] = []
 
     @rx.event(background=True)
-    async def poll_balances_for_pending_orders(self):
-        while True:
-            bots_to_check = []
+    async def stream_ui_updates(self):
+        token = self.router.session.client_token
+        async with self:
+            bots_state = await self.get_state(BotsState)
+            bot_ids = [b["id"] for b in bots_state.bots]
+            chart_bot = engine_registry.get_bot(
+                self.router.page.params.get("bot_id", "")
+            )
+        if not ui_publisher.mount(token, bot_ids):
+            return
+        chart_symbol = chart_bot["config"]["pair"] if chart_bot else ""
+        chart_version = -1
+        last_update = time.monotonic()
+        try:
+            snapshot = ui_publisher.snapshot(bot_ids)
             async with self:
-                bots_state = await self.get_state(BotsState)
-                bots_to_check = [
-                    bot
-                    for bot in bots_state.bots
-                    if bot["status"] == "waiting_for_balance"
-                ]
+                self.bot_prices = snapshot.get("prices", {})
+                self.bot_unrealized_pnl = snapshot.get("pnl", {})
+            while ui_publisher.is_mounted(token):
+                await asyncio.sleep(ui_publisher.frame_interval)
+                connected = client_connected(token)
+                if connected is False or (
+                    connected is None
+                    and time.monotonic() - last_update > UI_STREAM_IDLE_SECONDS
+                ):
+                    logging.info(f"Session {token} went away, stopping UI updates.")
+                    ui_publisher.disconnect(token)
+                    break
+                changes = ui_publisher.drain(token)
+                version = (
+                    kline_aggregator.version(chart_symbol, CHART_INTERVAL)
+                    if chart_symbol
+                    else chart_version
+                )
+                if not changes and version == chart_version:
+                    continue
+                last_update = time.monotonic()
+                async with self:
+                    for bot_id, price in changes.get("prices", {}).items():
+                        self.bot_prices[bot_id] = price
+                    for bot_id, pnl in changes.get("pnl", {}).items():
+                        self.bot_unrealized_pnl[bot_id] = pnl
+                    if version != chart_version:
+                        self.price_bars = chart_bars(chart_symbol)
+                chart_version = version
+        finally:
+            ui_publisher.stream_finished(token)
+
+    @rx.event
+    def stop_ui_updates(self):
+        ui_publisher.unmount(self.router.session.client_token)
+
+    @rx.event(background=True)
+    async def poll_balances_for_pending_orders(self):
+        async with self:
+            auth_state = await self.get_state(AuthState)
+            owner_email = (
+                auth_state.current_user["email"] if auth_state.current_user else ""
+            )
+        while active_sockets:
+            bots_to_check = [
+                bot
+                for bot in engine_registry.bots_for_owner(owner_email)
+                if bot["status"] == "waiting_for_balance"
+            ]
             if bots_to_check:
                 logging.info(
                     f"Polling balances for {len(bots_to_check)} bots waiting for funds."
                 )
                 for bot in bots_to_check:
                     await self._check_safety_orders(
-                        bot["id"], self.bot_prices.get(bot["id"], 0.0), is_retry=True
+                        bot["id"], ui_publisher.last_price(bot["id"]), is_retry=True
                     )
             await asyncio.sleep(60)
 
     @rx.event(background=True)
     async def start_bot_execution(self, bot_id: str):
+        bot = engine_registry.get_bot(bot_id)
+        if not bot:
+            logging.error(f"Bot {bot_id} not found to start execution.")
+            return
         async with self:
             bots_state = await self.get_state(BotsState)
-            bot = next((b for b in bots_state.bots if b["id"] == bot_id), None)
-            if not bot:
-                logging.error(f"Bot {bot_id} not found to start execution.")
-                return
             exchange_state = await self.get_state(ExchangeState)
-            if not exchange_state.is_connected:
+            if not replay.replay_enabled() and not exchange_state.has_api_keys:
                 logging.error(f"Cannot start bot {bot_id}, Binance not connected.")
-                bots_state = await self.get_state(BotsState)
                 bots_state.set_bot_status(bot_id, "error")
                 return
-            client = await AsyncClient.create(
-                exchange_state.api_keys["api_key"],
-                exchange_state.api_keys["secret_key"],
-            )
-            bsm = BinanceSocketManager(client)
-            trade_socket = bsm.trade_socket(bot["config"]["pair"])
-            active_sockets[bot_id] = trade_socket
-            bots_state = await self.get_state(BotsState)
+            api_keys = dict(exchange_state.api_keys)
             bots_state.set_bot_status(bot_id, "starting")
-            base_order_placed = await self._place_base_order(bot_id)
-            if not base_order_placed:
-                logging.error(f"Failed to place base order for bot {bot_id}. Halting.")
+        if replay.replay_enabled():
+            try:
+                session = replay.start_session(bot_id, bot["config"]["pair"])
+            except (OSError, ValueError) as e:
+                logging.error(f"Cannot start replay for bot {bot_id}: {e}")
                 async with self:
                     bots_state = await self.get_state(BotsState)
                     bots_state.set_bot_status(bot_id, "error")
                 return
+            kline_aggregator.forget_symbol(bot["config"]["pair"])
+            client = session.exchange
+            trade_socket = session.socket
+        else:
+            client = await binance_client.create_async_client(
+                api_keys["api_key"], api_keys["secret_key"]
+            )
+            bsm = binance_client.socket_manager(client)
+            trade_socket = bsm.trade_socket(bot["config"]["pair"])
+        start_balance_poller = not active_sockets
+        active_sockets[bot_id] = trade_socket
+        base_order_placed = await self._place_base_order(bot_id)
+        if not base_order_placed:
+            logging.error(f"Failed to place base order for bot {bot_id}. Halting.")
             async with self:
                 bots_state = await self.get_state(BotsState)
-                bots_state.set_bot_status(bot_id, "monitoring")
-            global order_monitoring_task
-            if not order_monitoring_task or order_monitoring_task.done():
-                order_monitoring_task = asyncio.create_task(self._monitor_open_orders())
-            if not active_sockets:
-                yield BotExecutionState.poll_balances_for_pending_orders
+                bots_state.set_bot_status(bot_id, "error")
+            active_sockets.pop(bot_id, None)
+            replay.finish_session(bot_id)
+            await client.close_connection()
+            return
+        async with self:
+            bots_state = await self.get_state(BotsState)
+            bots_state.set_bot_status(bot_id, "monitoring")
+        global order_monitoring_task
+        if not replay.replay_enabled() and (
+            not order_monitoring_task or order_monitoring_task.done()
+        ):
+            order_monitoring_task = asyncio.create_task(self._monitor_open_orders())
+        if start_balance_poller:
+            yield BotExecutionState.poll_balances_for_pending_orders
         logging.info(
             f"Starting trade socket for bot {bot_id} on pair {bot['config']['pair']}"
         )
+        symbol = bot["config"]["pair"]
         try:
             async with trade_socket as ts:
+                metrics.websocket_connects_total.inc(symbol)
+                reconnects = getattr(ts, "_reconnects", 0)
                 while True:
                     if bot_id not in active_sockets:
                         logging.info(
@@ -88,6 +245,11 @@ class BotExecutionState(rx.State):
                         )
                         break
                     res = await ts.recv()
+                    if getattr(ts, "_reconnects", 0) != reconnects:
+                        metrics.websocket_reconnects_total.inc(symbol)
+                        reconnects = getattr(ts, "_reconnects", 0)
+                    if res and res.get("e") == "replay_end":
+                        break
                     if res and res.get("e") == "error":
                         logging.error(
                             f"WebSocket error for bot {bot_id}: {res.get('m')}"
@@ -97,11 +259,17 @@ class BotExecutionState(rx.State):
                             bots_state.set_bot_status(bot_id, "error")
                         break
                     if res and "p" in res:
+                        metrics.ticks_total.inc(symbol)
+                        kline_aggregator.on_trade_event(res)
                         price = float(res["p"])
-                        async with self:
-                            self.bot_prices[bot_id] = price
-                        await self._check_bot_strategy(bot_id, price)
-                    await asyncio.sleep(0.1)
+                        ui_publisher.publish_price(bot_id, price)
+                        if replay.replay_enabled():
+                            await self._sync_pending_orders(client, bot_id)
+                        trace = tracing.begin_tick(bot_id, symbol, res)
+                        try:
+                            await self._check_bot_strategy(bot_id, price)
+                        finally:
+                            tracing.finish_tick(trace)
         except Exception as e:
             logging.exception(f"Exception in trade socket for bot {bot_id}: {e}")
             async with self:
@@ -112,23 +280,57 @@ class BotExecutionState(rx.State):
             await client.close_connection()
             if bot_id in active_sockets:
                 del active_sockets[bot_id]
+            replay.finish_session(bot_id)
 
     @rx.event(background=True)
     async def stop_bot_execution(self, bot_id: str):
-        if bot_id in active_sockets:
-            del active_sockets[bot_id]
+        self._release_bot(bot_id)
         async with self:
-            if bot_id in self.bot_prices:
-                del self.bot_prices[bot_id]
+            self.bot_prices.pop(bot_id, None)
+            self.bot_unrealized_pnl.pop(bot_id, None)
         logging.info(f"Stopped execution and cleaned up for bot {bot_id}.")
 
+    async def _notify_owner(
+        self,
+        account: AccountContext | None,
+        bot_name: str,
+        message: str,
+        type: NotificationType = "info",
+    ):
+        if not account:
+            return
+        if account["user_id"] is not None:
+            published = publish_notification(
+                account["user_id"], f"{bot_name}: {message}", type
+            )
+            if published is not None:
+                notification_state = await self.get_state(NotificationState)
+                notification_state.prepend_notification(*published)
+        if replay.replay_enabled():
+            return
+        email_service = await self.get_state(EmailService)
+        email_service.send_bot_notification_email(
+            to_email=account["email"], bot_name=bot_name, message=message
+        )
+
+    async def _exchange_for(self, bot_id: str):
+        session = replay.sessions.get(bot_id)
+        if session:
+            return session.exchange
+        return await self.get_state(ExchangeState)
+
+    def _release_bot(self, bot_id: str):
+        active_sockets.pop(bot_id, None)
+        ui_publisher.forget_bot(bot_id)
+
     async def _place_base_order(self, bot_id: str) -> bool:
+        bot = engine_registry.get_bot(bot_id)
+        if not bot:
+            return False
+        account = engine_registry.account_for_bot(bot_id)
         async with self:
             bots_state = await self.get_state(BotsState)
-            bot = next((b for b in bots_state.bots if b["id"] == bot_id), None)
-            if not bot:
-                return False
-            exchange_state = await self.get_state(ExchangeState)
+            exchange_state = await self._exchange_for(bot_id)
             pair_info = bot["config"]["pair"]
             base_currency = "USDT"
             required_usdt = bot["config"]["base_order_size"]
@@ -163,24 +365,16 @@ class BotExecutionState(rx.State):
             logging.info(
                 f"Successfully placed base order and created deal for bot {bot_id}"
             )
-            auth_state = await self.get_state(AuthState)
-            if auth_state.current_user:
-                email_service = await self.get_state(EmailService)
-                email_service.send_bot_notification_email(
-                    to_email=auth_state.current_user["email"],
-                    bot_name=bot["name"],
-                    message=f"A new deal has been started for pair {bot['config']['pair']}. Base order filled at {base_order_price}.",
-                )
+            await self._notify_owner(
+                account,
+                bot["name"],
+                f"A new deal has been started for pair {bot['config']['pair']}. Base order filled at {base_order_price}.",
+                "info",
+            )
             config = bot["config"]
             for i in range(config["immediate_safety_orders"]):
-                deviation = (
-                    config["price_deviation"] * config["safety_order_step_scale"] ** i
-                )
-                limit_price = base_order_price * (1 - deviation / 100)
-                so_quantity_usdt = (
-                    config["safety_order_size"]
-                    * config["safety_order_volume_scale"] ** i
-                )
+                limit_price = dca.limit_order_price(config, base_order_price, i)
+                so_quantity_usdt = dca.safety_order_size(config, i)
                 so_quantity_asset = so_quantity_usdt / limit_price
                 so_result = await exchange_state.place_limit_order(
                     pair=config["pair"],
@@ -210,132 +404,126 @@ class BotExecutionState(rx.State):
         return True
 
     async def _check_bot_strategy(self, bot_id: str, current_price: float):
-        async with self:
-            bots_state = await self.get_state(BotsState)
-            bot = next((b for b in bots_state.bots if b["id"] == bot_id), None)
-            if not bot or bot["status"] in ["paused", "stopped", "error", "closing"]:
-                return
-            deal_state = await self.get_state(DealState)
-            deal = deal_state.get_active_deal(bot_id)
-            if bot["status"] == "waiting_for_balance":
-                return
-            if not deal or deal["status"] != "active":
-                return
-            deal_state.update_unrealized_pnl(bot_id, current_price)
-            await self._check_take_profit(bot_id, deal, current_price)
-            await self._check_safety_orders(bot_id, deal, current_price)
+        started = metrics.start_timer()
+        decision = strategy_decision(bot_id, current_price)
+        metrics.strategy_seconds.observe_since(started)
+        tracing.set_decision(decision)
+        if decision == "take_profit":
+            await self._check_take_profit(bot_id, current_price)
+        elif decision == "safety_order":
+            await self._check_safety_orders(bot_id, current_price)
 
-    async def _check_take_profit(self, bot_id: str, deal: Deal, current_price: float):
-        bots_state = await self.get_state(BotsState)
-        bot = next((b for b in bots_state.bots if b["id"] == bot_id), None)
-        if not bot:
+    async def _check_take_profit(self, bot_id: str, current_price: float):
+        bot = engine_registry.get_bot(bot_id)
+        deal = engine_registry.get_active_deal(bot_id)
+        if not bot or not deal:
+            return
+        if not take_profit_reached(bot["config"], deal, current_price):
             return
-        profit_target = bot["config"]["take_profit_percentage"]
-        unrealized_pnl_percentage = (
-            deal["unrealized_pnl"]
-            / (deal["average_entry_price"] * deal["total_quantity"])
-            * 100
+        account = engine_registry.account_for_bot(bot_id)
+        logging.info(
+            f"Take profit target hit for bot {bot_id}. Attempting to close deal."
         )
-        if unrealized_pnl_percentage >= profit_target:
-            logging.info(
-                f"Take profit target hit for bot {bot_id}. Attempting to close deal."
-            )
+        lock_span = tracing.span("state_lock")
+        async with self:
+            lock_span.end()
+            bots_state = await self.get_state(BotsState)
             bots_state.set_bot_status(bot_id, "closing")
-            exchange_state = await self.get_state(ExchangeState)
-            sell_order = await exchange_state.place_market_order(
-                pair=bot["config"]["pair"], side="SELL", quantity=deal["total_quantity"]
-            )
-            if sell_order and sell_order["status"] == "FILLED":
-                realized_pnl = (
-                    float(sell_order["fills"][0]["price"]) - deal["average_entry_price"]
-                ) * deal["total_quantity"]
-                deal_state = await self.get_state(DealState)
-                deal_state.close_deal(bot_id, realized_pnl)
-                bots_state = await self.get_state(BotsState)
-                bots_state.update_bot_stats(bot_id, realized_pnl, 1)
-                logging.info(f"Deal for bot {bot_id} closed with PNL: {realized_pnl}")
-                auth_state = await self.get_state(AuthState)
-                if auth_state.current_user:
-                    email_service = await self.get_state(EmailService)
-                    email_service.send_bot_notification_email(
-                        to_email=auth_state.current_user["email"],
-                        bot_name=bot["name"],
-                        message=f"Take profit target hit! Deal closed with a profit of {realized_pnl:.2f} USDT. Starting new cycle.",
-                    )
-                bots_state.set_bot_status(bot_id, "starting")
-                base_order_placed = await self._place_base_order(bot_id)
-                if not base_order_placed:
-                    logging.error(f"Failed to restart bot {bot_id} after take profit.")
-                    bots_state.set_bot_status(bot_id, "error")
-                    yield BotExecutionState.stop_bot_execution(bot_id)
-                else:
-                    logging.info(
-                        f"Bot {bot_id} successfully restarted for a new cycle."
-                    )
-                    bots_state.set_bot_status(bot_id, "monitoring")
-            else:
+            exchange_state = await self._exchange_for(bot_id)
+            with tracing.span("place_market_order", side="SELL"):
+                sell_order = await exchange_state.place_market_order(
+                    pair=bot["config"]["pair"],
+                    side="SELL",
+                    quantity=deal["total_quantity"],
+                )
+            if not sell_order or sell_order["status"] != "FILLED":
                 logging.error(
                     f"Take profit sell order failed for bot {bot_id}: {sell_order}"
                 )
                 bots_state.set_bot_status(bot_id, "error")
+                return
+            sell_price = float(sell_order["fills"][0]["price"])
+            realized_pnl = (
+                sell_price - deal["average_entry_price"]
+            ) * deal["total_quantity"]
+            take_profit_order = Order(
+                order_id=str(sell_order["orderId"]),
+                timestamp=sell_order["transactTime"] / 1000,
+                side="sell",
+                price=sell_price,
+                quantity=float(sell_order["executedQty"]),
+                order_type="take_profit",
+                status="filled",
+            )
+            deal_state = await self.get_state(DealState)
+            deal_state.close_deal(
+                bot_id,
+                realized_pnl,
+                take_profit_order["timestamp"],
+                take_profit_order,
+            )
+            bots_state.update_bot_stats(bot_id, realized_pnl, 1)
+            logging.info(f"Deal for bot {bot_id} closed with PNL: {realized_pnl}")
+            await self._notify_owner(
+                account,
+                bot["name"],
+                f"Take profit target hit! Deal closed with a profit of {realized_pnl:.2f} USDT. Starting new cycle.",
+                "success",
+            )
+            bots_state.set_bot_status(bot_id, "starting")
+        base_order_placed = await self._place_base_order(bot_id)
+        async with self:
+            bots_state = await self.get_state(BotsState)
+            if not base_order_placed:
+                logging.error(f"Failed to restart bot {bot_id} after take profit.")
+                bots_state.set_bot_status(bot_id, "error")
+            else:
+                logging.info(f"Bot {bot_id} successfully restarted for a new cycle.")
+                bots_state.set_bot_status(bot_id, "monitoring")
+        if not base_order_placed:
+            self._release_bot(bot_id)
 
     async def _check_safety_orders(
-        self, bot_id: str, deal_or_price: Deal | float, is_retry: bool = False
+        self, bot_id: str, current_price: float, is_retry: bool = False
     ):
-        bots_state = await self.get_state(BotsState)
-        bot = next((b for b in bots_state.bots if b["id"] == bot_id), None)
-        deal_state = await self.get_state(DealState)
-        deal = (
-            deal_state.get_active_deal(bot_id)
-            if not is_retry
-            else deal_state.deals.get(bot_id)
-        )
+        bot = engine_registry.get_bot(bot_id)
+        deal = engine_registry.get_active_deal(bot_id)
         if not bot or not deal:
             return
-        current_price = cast(float, deal_or_price)
         config = bot["config"]
-        num_safety_orders = len(deal["safety_orders"])
+        num_safety_orders = len(deal["filled_safety_orders"])
         if num_safety_orders >= config["max_safety_orders"]:
             return
-        price_should_trigger = False
-        if not is_retry:
-            cumulative_deviation = config["price_deviation"]
-            for i in range(num_safety_orders):
-                cumulative_deviation += config["price_deviation"] * config[
-                    "safety_order_step_scale"
-                ] ** (i + 1)
-            trigger_price = deal["base_order"]["price"] * (
-                1 - cumulative_deviation / 100
-            )
-            price_should_trigger = current_price <= trigger_price
-        if price_should_trigger or is_retry:
+        if not is_retry and current_price > safety_order_trigger_price(config, deal):
+            return
+        account = engine_registry.account_for_bot(bot_id)
+        lock_span = tracing.span("state_lock")
+        async with self:
+            lock_span.end()
+            bots_state = await self.get_state(BotsState)
             if not is_retry:
                 logging.info(
                     f"Safety order condition met for bot {bot_id} at price {current_price}."
                 )
                 bots_state.set_bot_status(bot_id, "placing_order")
-            exchange_state = await self.get_state(ExchangeState)
-            safety_order_usdt = (
-                config["safety_order_size"]
-                * config["safety_order_volume_scale"] ** num_safety_orders
-            )
-            balance_ok, _ = await exchange_state.validate_balance(
-                "USDT", safety_order_usdt
-            )
+            exchange_state = await self._exchange_for(bot_id)
+            safety_order_usdt = dca.safety_order_size(config, num_safety_orders)
+            with tracing.span("validate_balance"):
+                balance_ok, _ = await exchange_state.validate_balance(
+                    "USDT", safety_order_usdt
+                )
             if not balance_ok:
                 if bot["status"] != "waiting_for_balance":
                     logging.warning(
                         f"Insufficient balance for safety order on bot {bot_id}. Entering waiting state."
                     )
                     bots_state.set_bot_status(bot_id, "waiting_for_balance")
-                    auth_state = await self.get_state(AuthState)
-                    if auth_state.current_user:
-                        email_service = await self.get_state(EmailService)
-                        email_service.send_bot_notification_email(
-                            to_email=auth_state.current_user["email"],
-                            bot_name=bot["name"],
-                            message=f"Your bot is paused due to insufficient USDT balance to place a safety order. It will resume automatically when funds are available.",
-                        )
+                    await self._notify_owner(
+                        account,
+                        bot["name"],
+                        f"Your bot is paused due to insufficient USDT balance to place a safety order. It will resume automatically when funds are available.",
+                        "warning",
+                    )
                 else:
                     logging.info(f"Still waiting for balance for bot {bot_id}...")
                 return
@@ -343,9 +531,10 @@ class BotExecutionState(rx.State):
                 logging.info(
                     f"Balance detected for bot {bot_id}. Retrying safety order."
                 )
-            so_result = await exchange_state.place_market_order(
-                pair=config["pair"], side="BUY", quantity=safety_order_usdt
-            )
+            with tracing.span("place_market_order", side="BUY"):
+                so_result = await exchange_state.place_market_order(
+                    pair=config["pair"], side="BUY", quantity=safety_order_usdt
+                )
             if so_result and so_result["status"] == "FILLED":
                 filled_price = float(so_result["fills"][0]["price"])
                 filled_qty = float(so_result["executedQty"])
@@ -356,106 +545,111 @@ class BotExecutionState(rx.State):
                     price=filled_price,
                     quantity=filled_qty,
                     order_type="safety",
-                    status="filled",
+                    status="new",
                 )
+                deal_state = await self.get_state(DealState)
                 deal_state.add_pending_safety_order(bot_id, safety_order)
+                deal_state.safety_order_filled(
+                    bot_id, safety_order["order_id"], filled_price, filled_qty
+                )
                 bots_state.set_bot_status(bot_id, "in_position")
                 logging.info(
                     f"Successfully placed safety order {num_safety_orders + 1} for bot {bot_id}."
                 )
-                auth_state = await self.get_state(AuthState)
-                if auth_state.current_user:
-                    email_service = await self.get_state(EmailService)
-                    message = f"Safety order #{num_safety_orders + 1} placed for {bot['config']['pair']} at price {filled_price}."
-                    email_service.send_bot_notification_email(
-                        to_email=auth_state.current_user["email"],
-                        bot_name=bot["name"],
-                        message=message,
-                    )
+                await self._notify_owner(
+                    account,
+                    bot["name"],
+                    f"Safety order #{num_safety_orders + 1} placed for {config['pair']} at price {filled_price}.",
+                    "info",
+                )
             else:
                 logging.error(f"Safety order failed for bot {bot_id}: {so_result}")
                 bots_state.set_bot_status(bot_id, "error")
 
     async def _monitor_open_orders(self):
+        async with self:
+            auth_state = await self.get_state(AuthState)
+            owner_email = (
+                auth_state.current_user["email"] if auth_state.current_user else ""
+            )
         while True:
             await asyncio.sleep(5)
+            active_bots = [
+                b
+                for b in engine_registry.bots_for_owner(owner_email)
+                if b["status"] in ["monitoring", "in_position"]
+            ]
+            if not active_bots:
+                continue
             async with self:
-                bots_state = await self.get_state(BotsState)
-                deal_state = await self.get_state(DealState)
                 exchange_state = await self.get_state(ExchangeState)
-                active_bots = [
-                    b
-                    for b in bots_state.bots
-                    if b["status"] in ["monitoring", "in_position"]
-                ]
-                if not active_bots or not exchange_state.is_connected:
+                if not exchange_state.has_api_keys:
                     continue
                 client = await exchange_state._get_async_client()
                 if not client:
                     continue
+            started = metrics.start_timer()
             try:
                 for bot in active_bots:
-                    deal = deal_state.deals.get(bot["id"])
-                    if (
-                        not deal
-                        or deal["status"] != "active"
-                        or (not deal["pending_safety_orders"])
-                    ):
-                        continue
-                    for so in list(deal["pending_safety_orders"]):
-                        try:
-                            order_status = await client.get_order(
-                                symbol=bot["config"]["pair"], orderId=so["order_id"]
-                            )
-                            if order_status["status"] == "FILLED":
-                                logging.info(
-                                    f"Safety order {so['order_id']} for bot {bot['id']} has been filled."
-                                )
-                                async with self:
-                                    deal_state = await self.get_state(DealState)
-                                    deal_state.safety_order_filled(
-                                        bot_id=bot["id"],
-                                        filled_order_id=so["order_id"],
-                                        fill_price=float(order_status["price"]),
-                                        fill_qty=float(order_status["executedQty"]),
-                                    )
-                                    await self._place_next_safety_order(bot["id"])
-                        except BinanceAPIException as e:
-                            if e.code == -2013:
-                                logging.warning(
-                                    f"Order {so['order_id']} not found on exchange, likely canceled or expired. Removing from pending."
-                                )
-                                async with self:
-                                    deal_state = await self.get_state(DealState)
-                                    deal_state.deals[bot["id"]][
-                                        "pending_safety_orders"
-                                    ] = [
-                                        pso
-                                        for pso in deal_state.deals[bot["id"]][
-                                            "pending_safety_orders"
-                                        ]
-                                        if pso["order_id"] != so["order_id"]
-                                    ]
-                            else:
-                                logging.exception(
-                                    f"Error checking order status for {so['order_id']}: {e}"
-                                )
-                        except Exception as e:
-                            logging.exception(
-                                f"Unexpected error checking order status for {so['order_id']}: {e}"
-                            )
+                    await self._sync_pending_orders(client, bot["id"])
             finally:
                 if client:
                     await client.close_connection()
+                metrics.monitor_cycle_seconds.observe_since(started)
+
+    async def _sync_pending_orders(self, client, bot_id: str):
+        bot = engine_registry.get_bot(bot_id)
+        deal = engine_registry.get_active_deal(bot_id)
+        if not bot or not deal or not deal["pending_safety_orders"]:
+            return
+        from binance.exceptions import BinanceAPIException
+
+        for so in list(deal["pending_safety_orders"]):
+            started = metrics.start_timer()
+            try:
+                order_status = await client.get_order(
+                    symbol=bot["config"]["pair"], orderId=so["order_id"]
+                )
+                metrics.exchange_request_seconds.observe_since(started, "get_order")
+                metrics.record_weight(client)
+                if order_status["status"] == "FILLED":
+                    logging.info(
+                        f"Safety order {so['order_id']} for bot {bot_id} has been filled."
+                    )
+                    async with self:
+                        deal_state = await self.get_state(DealState)
+                        deal_state.safety_order_filled(
+                            bot_id=bot_id,
+                            filled_order_id=so["order_id"],
+                            fill_price=float(order_status["price"]),
+                            fill_qty=float(order_status["executedQty"]),
+                        )
+                    await self._place_next_safety_order(bot_id)
+            except BinanceAPIException as e:
+                metrics.exchange_errors_total.inc("get_order")
+                if e.code == -2013:
+                    logging.warning(
+                        f"Order {so['order_id']} not found on exchange, likely canceled or expired. Removing from pending."
+                    )
+                    async with self:
+                        deal_state = await self.get_state(DealState)
+                        deal_state.remove_pending_safety_order(bot_id, so["order_id"])
+                else:
+                    logging.exception(
+                        f"Error checking order status for {so['order_id']}: {e}"
+                    )
+            except Exception as e:
+                logging.exception(
+                    f"Unexpected error checking order status for {so['order_id']}: {e}"
+                )
 
     async def _place_next_safety_order(self, bot_id: str):
+        bot = engine_registry.get_bot(bot_id)
+        deal = engine_registry.get_active_deal(bot_id)
+        if not bot or not deal:
+            return
         async with self:
-            bots_state = await self.get_state(BotsState)
-            bot = next((b for b in bots_state.bots if b["id"] == bot_id), None)
             deal_state = await self.get_state(DealState)
-            deal = deal_state.deals.get(bot_id)
-            if not bot or not deal or deal["status"] != "active":
-                return
             config = bot["config"]
             total_sos_placed = len(deal["filled_safety_orders"]) + len(
                 deal["pending_safety_orders"]
@@ -463,19 +657,13 @@ class BotExecutionState(rx.State):
             if total_sos_placed >= config["max_safety_orders"]:
                 logging.info(f"Max safety orders reached for bot {bot_id}")
                 return
-            last_price = deal["average_entry_price"]
             next_so_num = total_sos_placed
-            deviation = (
-                config["price_deviation"]
-                * config["safety_order_step_scale"] ** next_so_num
-            )
-            limit_price = last_price * (1 - deviation / 100)
-            so_quantity_usdt = (
-                config["safety_order_size"]
-                * config["safety_order_volume_scale"] ** next_so_num
+            limit_price = dca.limit_order_price(
+                config, deal["average_entry_price"], next_so_num
             )
+            so_quantity_usdt = dca.safety_order_size(config, next_so_num)
             so_quantity_asset = so_quantity_usdt / limit_price
-            exchange_state = await self.get_state(ExchangeState)
+            exchange_state = await self._exchange_for(bot_id)
             so_result = await exchange_state.place_limit_order(
                 pair=config["pair"],
                 side="BUY",
@@ -1,8 +1,17 @@
 import reflex as rx
 from typing import TypedDict, Literal, cast
+import asyncio
 import uuid
 import logging
 from app.states.auth_state import AuthState, User
+from app.database import crud, models
+from app.database.database import SessionLocal
+from app.services import dca
+from app.services.engine_registry import engine_registry
+
+SUGGESTION_COUNT = 5
+pending_status_writes: dict[str, str] = {}
+status_writer_task: asyncio.Task | None = None
 
 
 class BotConfig(TypedDict):
@@ -17,6 +26,30 @@ class BotConfig(TypedDict):
     take_profit_percentage: float
 
 
+class ConfigSuggestion(TypedDict):
+    config: BotConfig
+    total_pnl: float
+    max_drawdown: float
+    capital_required: float
+    deals: int
+
+
+def suggest_configs(config: BotConfig) -> list[ConfigSuggestion]:
+    from app.services import sweep
+
+    candles = sweep.fetch_recent_klines(config["pair"])
+    return [
+        ConfigSuggestion(
+            config=cast(BotConfig, s["config"]),
+            total_pnl=round(s["result"]["total_pnl"], 2),
+            max_drawdown=round(s["result"]["max_drawdown"], 2),
+            capital_required=round(s["capital_required"], 2),
+            deals=s["result"]["deals"],
+        )
+        for s in sweep.run_sweep(dict(config), candles)[:SUGGESTION_COUNT]
+    ]
+
+
 BotStatus = Literal[
     "active",
     "paused",
@@ -41,13 +74,59 @@ class Bot(TypedDict):
     deals_count: int
 
 
+def bot_from_model(db_bot: models.Bot) -> Bot:
+    return Bot(
+        id=db_bot.uuid,
+        name=db_bot.name,
+        status=cast(BotStatus, db_bot.status),
+        in_deal=False,
+        config=cast(BotConfig, db_bot.config),
+        total_pnl=db_bot.total_pnl or 0.0,
+        deals_count=db_bot.deals_count or 0,
+    )
+
+
+def write_bot_statuses(statuses: dict[str, str]):
+    db = SessionLocal()
+    try:
+        crud.update_bot_statuses(db, statuses)
+    except Exception as e:
+        logging.exception(f"Failed to persist bot statuses: {e}")
+    finally:
+        db.close()
+
+
+async def flush_bot_statuses():
+    while pending_status_writes:
+        statuses = dict(pending_status_writes)
+        pending_status_writes.clear()
+        await asyncio.to_thread(write_bot_statuses, statuses)
+
+
+def queue_bot_status(bot_id: str, status: str):
+    global status_writer_task
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        write_bot_statuses({bot_id: status})
+        return
+    pending_status_writes[bot_id] = status
+    if status_writer_task is None or status_writer_task.done():
+        status_writer_task = loop.create_task(flush_bot_statuses())
+
+
 class BotsState(rx.State):
     bots: list[Bot] = []
+    bot_statuses: dict[str, BotStatus] = {}
+    _bot_index: dict[str, int] = {}
     selected_bot: Bot | None = None
     show_create_wizard: bool = False
     show_upgrade_dialog: bool = False
     pair_search_term: str = ""
     show_pair_dropdown: bool = False
+    config_suggestions: list[ConfigSuggestion] = []
+    is_suggesting: bool = False
+    config_revision: int = 0
 
     @rx.event
     def set_pair_search_term(self, term: str):
@@ -65,11 +144,47 @@ class BotsState(rx.State):
         "take_profit_percentage": 2.0,
     }
 
+    def _reindex(self):
+        self._bot_index = {bot["id"]: i for i, bot in enumerate(self.bots)}
+        statuses = {}
+        for bot in self.bots:
+            live_bot = engine_registry.get_bot(bot["id"])
+            statuses[bot["id"]] = live_bot["status"] if live_bot else bot["status"]
+        self.bot_statuses = statuses
+
+    def _find_bot(self, bot_id: str) -> Bot | None:
+        index = self._bot_index.get(bot_id)
+        return self.bots[index] if index is not None else None
+
+    @rx.event
+    async def load_bots(self):
+        if self.bots and all(engine_registry.get_bot(b["id"]) for b in self.bots):
+            return
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.current_user:
+            return
+        db = SessionLocal()
+        try:
+            user_id = crud.get_user_id_from_email(db, auth_state.current_user["email"])
+            if user_id is None:
+                return
+            engine_registry.set_account(auth_state.current_user["email"], user_id)
+            db_bots = crud.get_bots_by_user(db, user_id)
+            self.bots = [bot_from_model(b) for b in db_bots]
+            for db_bot in db_bots:
+                if engine_registry.get_bot(db_bot.uuid) is None:
+                    engine_registry.register_bot(
+                        bot_from_model(db_bot), auth_state.current_user["email"]
+                    )
+            self._reindex()
+        finally:
+            db.close()
+
     @rx.event
     def get_bot_by_id(self):
         bot_id = self.router.page.params.get("bot_id", None)
         if bot_id:
-            self.selected_bot = next((b for b in self.bots if b["id"] == bot_id), None)
+            self.selected_bot = self._find_bot(bot_id)
         else:
             self.selected_bot = None
 
@@ -101,14 +216,40 @@ class BotsState(rx.State):
     @rx.var
     def required_balance(self) -> float:
         config = self.current_bot_config
-        base_order_cost = config["base_order_size"]
-        safety_orders_cost = sum(
-            (
-                config["safety_order_size"] * config["safety_order_volume_scale"] ** i
-                for i in range(config["immediate_safety_orders"])
-            )
+        return config["base_order_size"] + sum(
+            dca.safety_order_size(config, i)
+            for i in range(config["immediate_safety_orders"])
         )
-        return base_order_cost + safety_orders_cost
+
+    @rx.event(background=True)
+    async def suggest_settings(self):
+        async with self:
+            if self.is_suggesting:
+                return
+            self.is_suggesting = True
+            self.config_suggestions = []
+            config = cast(BotConfig, dict(self.current_bot_config))
+        try:
+            suggestions = await asyncio.to_thread(suggest_configs, config)
+        except Exception as e:
+            logging.exception(f"Failed to suggest settings for {config['pair']}: {e}")
+            async with self:
+                self.is_suggesting = False
+            return rx.toast.error("Could not backtest settings for this pair.")
+        async with self:
+            self.config_suggestions = suggestions
+            self.is_suggesting = False
+        if not suggestions:
+            return rx.toast.info("Not enough market history to suggest settings.")
+
+    @rx.event
+    def apply_suggestion(self, index: int):
+        if 0 <= index < len(self.config_suggestions):
+            self.current_bot_config = {
+                **self.config_suggestions[index]["config"],
+                "pair": self.current_bot_config["pair"],
+            }
+            self.config_revision += 1
 
     @rx.event
     async def add_bot(self, form_data: dict):
@@ -155,7 +296,19 @@ class BotsState(rx.State):
             total_pnl=0.0,
             deals_count=0,
         )
+        db = SessionLocal()
+        try:
+            user_id = crud.get_user_id_from_email(db, user["email"])
+            if user_id is not None:
+                crud.create_bot(db, user_id, dict(new_bot))
+        finally:
+            db.close()
         self.bots.append(new_bot)
+        self._bot_index[new_bot["id"]] = len(self.bots) - 1
+        self.bot_statuses[new_bot["id"]] = new_bot["status"]
+        engine_registry.register_bot(
+            Bot(**{**new_bot, "config": new_bot["config"].copy()}), user["email"]
+        )
         self.show_create_wizard = False
         from app.services.email_service import EmailService
 
@@ -169,7 +322,16 @@ class BotsState(rx.State):
 
     @rx.event
     def remove_bot(self, bot_id: str):
-        self.bots = [bot for bot in self.bots if bot["id"] != bot_id]
+        index = self._bot_index.get(bot_id)
+        if index is not None:
+            self.bots.pop(index)
+            self._reindex()
+        engine_registry.remove_bot(bot_id)
+        db = SessionLocal()
+        try:
+            crud.delete_bot(db, bot_id)
+        finally:
+            db.close()
 
     @rx.event
     def remove_bot_and_redirect(self, bot_id: str):
@@ -180,26 +342,29 @@ class BotsState(rx.State):
     def start_bot(self, bot_id: str):
         from app.states.bot_execution_state import BotExecutionState
 
-        for i, bot in enumerate(self.bots):
-            if bot["id"] == bot_id:
-                self.bots[i]["status"] = "starting"
-                break
+        self.set_bot_status(bot_id, "starting")
         return BotExecutionState.start_bot_execution(bot_id)
 
     @rx.event
     def set_bot_status(self, bot_id: str, status: str):
-        for i, bot in enumerate(self.bots):
-            if bot["id"] == bot_id:
-                self.bots[i]["status"] = cast(BotStatus, status)
-                break
+        if bot_id not in self._bot_index:
+            return
+        self.bot_statuses[bot_id] = cast(BotStatus, status)
+        engine_registry.set_bot_status(bot_id, status)
+        queue_bot_status(bot_id, status)
 
     @rx.event
     def update_bot_stats(self, bot_id: str, pnl_delta: float, deals_increment: int):
-        for i, bot in enumerate(self.bots):
-            if bot["id"] == bot_id:
-                self.bots[i]["total_pnl"] += pnl_delta
-                self.bots[i]["deals_count"] += deals_increment
-                break
+        index = self._bot_index.get(bot_id)
+        if index is not None:
+            self.bots[index]["total_pnl"] += pnl_delta
+            self.bots[index]["deals_count"] += deals_increment
+        engine_registry.update_bot_stats(bot_id, pnl_delta, deals_increment)
+        db = SessionLocal()
+        try:
+            crud.update_bot_stats(db, bot_id, pnl_delta, deals_increment)
+        finally:
+            db.close()
 
     @rx.event
     def pause_bot(self, bot_id: str):
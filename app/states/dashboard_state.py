@@ -1,5 +1,9 @@
 import reflex as rx
 from typing import TYPE_CHECKING
+from app.database import crud
+from app.database.database import SessionLocal
+from app.services.engine_registry import engine_registry
+from app.states.auth_state import AuthState
 
 if TYPE_CHECKING:
     from app.states.exchange_state import ExchangeState
@@ -13,4 +17,32 @@ class DashboardState(rx.State):
 
     @rx.var
     def display_balance(self) -> str:
-        return f"{self.account_balance:.2f}"
\ No newline at end of file
+        return f"{self.account_balance:.2f}"
+
+    @rx.var
+    def display_pnl(self) -> str:
+        return f"{self.total_pnl:.2f}"
+
+    @rx.event
+    async def load_summary(self):
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.current_user:
+            return
+        email = auth_state.current_user["email"]
+        account = engine_registry.accounts.get(email)
+        db = SessionLocal()
+        try:
+            user_id = (
+                account["user_id"]
+                if account and account["user_id"] is not None
+                else crud.get_user_id_from_email(db, email)
+            )
+            if user_id is None:
+                return
+            summary = crud.get_user_summary(db, user_id)
+            self.total_bots = summary.total_bots
+            self.active_bots = summary.active_bots
+            self.total_pnl = summary.total_pnl
+            self.account_balance = summary.account_balance
+        finally:
+            db.close()
@@ -1,11 +1,20 @@
 import reflex as rx
 from typing import TypedDict, Literal
+import asyncio
+import logging
 import time
+from collections import deque
+from collections.abc import Callable
+from app.database import crud
+from app.database.database import SessionLocal
+from app.services.engine_registry import engine_registry
 
 OrderType = Literal["base", "safety", "take_profit"]
 OrderStatus = Literal["new", "filled", "partial", "canceled", "error"]
 DealStatus = Literal["active", "completed", "canceled"]
 
+DEAL_HISTORY_PAGE_SIZE = 25
+
 
 class Order(TypedDict):
     order_id: str
@@ -19,6 +28,7 @@ class Order(TypedDict):
 
 class Deal(TypedDict):
     deal_id: str
+    db_id: int | None
     bot_id: str
     status: DealStatus
     entry_time: float
@@ -33,27 +43,223 @@ class Deal(TypedDict):
     realized_pnl: float
 
 
+class DealSummary(TypedDict):
+    deal_id: str
+    bot_id: str
+    status: DealStatus
+    entry_time: float
+    close_time: float | None
+    base_order_price: float
+    average_entry_price: float
+    total_quantity: float
+    realized_pnl: float
+    safety_orders_filled: int
+    safety_orders_pending: int
+
+
+active_deals: dict[str, Deal] = engine_registry.deals
+deal_count_cache: dict[int, int] = {}
+pending_deal_writes: deque[Callable[[], None]] = deque()
+deal_writer_task: asyncio.Task | None = None
+
+
+def get_cached_deal_count(db, bot_db_id: int) -> int:
+    if bot_db_id not in deal_count_cache:
+        deal_count_cache[bot_db_id] = crud.count_deals_by_bot_id(db, bot_db_id)
+    return deal_count_cache[bot_db_id]
+
+
+def summarize_deal(deal: Deal) -> DealSummary:
+    return DealSummary(
+        deal_id=deal["deal_id"],
+        bot_id=deal["bot_id"],
+        status=deal["status"],
+        entry_time=deal["entry_time"],
+        close_time=deal["close_time"],
+        base_order_price=deal["base_order"]["price"],
+        average_entry_price=deal["average_entry_price"],
+        total_quantity=deal["total_quantity"],
+        realized_pnl=deal["realized_pnl"],
+        safety_orders_filled=len(deal["filled_safety_orders"]),
+        safety_orders_pending=len(deal["pending_safety_orders"]),
+    )
+
+
+def summarize_db_deal(db_deal, bot_id: str) -> DealSummary:
+    return DealSummary(
+        deal_id=str(db_deal.id),
+        bot_id=bot_id,
+        status=db_deal.status,
+        entry_time=db_deal.entry_time,
+        close_time=db_deal.close_time,
+        base_order_price=0.0,
+        average_entry_price=db_deal.average_entry_price,
+        total_quantity=db_deal.total_quantity,
+        realized_pnl=db_deal.realized_pnl,
+        safety_orders_filled=0,
+        safety_orders_pending=0,
+    )
+
+
+def persist_new_deal(deal: Deal):
+    db = SessionLocal()
+    try:
+        db_bot = crud.get_bot_by_uuid(db, deal["bot_id"])
+        if not db_bot:
+            return
+        db_deal = crud.create_deal(
+            db,
+            db_bot.id,
+            {
+                "status": "active",
+                "entry_time": deal["entry_time"],
+                "average_entry_price": deal["base_order"]["price"],
+                "total_quantity": deal["base_order"]["quantity"],
+                "orders": [dict(deal["base_order"])],
+            },
+        )
+        deal["db_id"] = db_deal.id
+        if db_bot.id in deal_count_cache:
+            deal_count_cache[db_bot.id] += 1
+    finally:
+        db.close()
+
+
+def persist_order(deal: Deal, order: Order):
+    if deal["db_id"] is None:
+        return
+    db = SessionLocal()
+    try:
+        crud.create_order(db, deal["db_id"], order)
+    finally:
+        db.close()
+
+
+def persist_safety_fill(
+    deal: Deal,
+    order_id: str,
+    fill_price: float,
+    fill_qty: float,
+    average_entry_price: float,
+    total_quantity: float,
+):
+    db = SessionLocal()
+    try:
+        crud.update_order_status(db, order_id, "filled", fill_price, fill_qty)
+        if deal["db_id"] is not None:
+            crud.update_deal(
+                db,
+                deal["db_id"],
+                {
+                    "average_entry_price": average_entry_price,
+                    "total_quantity": total_quantity,
+                },
+            )
+    finally:
+        db.close()
+
+
+def persist_close(
+    deal: Deal, realized_pnl: float, close_time: float, sell_order: Order | None
+):
+    if deal["db_id"] is None:
+        return
+    db = SessionLocal()
+    try:
+        crud.close_deal(db, deal["db_id"], realized_pnl, close_time, sell_order)
+    finally:
+        db.close()
+
+
+def run_deal_write(write: Callable[[], None]):
+    try:
+        write()
+    except Exception as e:
+        logging.exception(f"Failed to persist deal update: {e}")
+
+
+async def flush_deal_writes():
+    while pending_deal_writes:
+        await asyncio.to_thread(run_deal_write, pending_deal_writes.popleft())
+
+
+def queue_deal_write(write: Callable[[], None]):
+    global deal_writer_task
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        run_deal_write(write)
+        return
+    pending_deal_writes.append(write)
+    if deal_writer_task is None or deal_writer_task.done():
+        deal_writer_task = loop.create_task(flush_deal_writes())
+
+
 class DealState(rx.State):
-    deals: dict[str, Deal] = {}
-    active_deal: Deal | None = None
-    bot_deals: list[Deal] = []
+    active_deal: DealSummary | None = None
+    bot_deals: list[DealSummary] = []
+    total_deals_count: int = 0
+    has_more_deals: bool = False
+    _history_bot_id: str = ""
+    _history_bot_db_id: int | None = None
+    _history_cursor: tuple[float, int] | None = None
 
     @rx.event
     def get_deals_for_bot(self):
         bot_id = self.router.page.params.get("bot_id", None)
-        if bot_id:
-            self.bot_deals = sorted(
-                [d for d in self.deals.values() if d["bot_id"] == bot_id],
-                key=lambda d: d["entry_time"],
-                reverse=True,
-            )
-            self.active_deal = next(
-                (d for d in self.bot_deals if d["status"] == "active"), None
-            )
+        if not bot_id:
+            return
+        deal = active_deals.get(bot_id)
+        self.active_deal = (
+            summarize_deal(deal) if deal and deal["status"] == "active" else None
+        )
+        self.bot_deals = []
+        self.total_deals_count = 0
+        self.has_more_deals = False
+        self._history_bot_id = bot_id
+        self._history_bot_db_id = None
+        self._history_cursor = None
+        db = SessionLocal()
+        try:
+            db_bot = crud.get_bot_by_uuid(db, bot_id)
+            if not db_bot:
+                return
+            self._history_bot_db_id = db_bot.id
+            self.total_deals_count = get_cached_deal_count(db, db_bot.id)
+            self._load_deal_page(db)
+        finally:
+            db.close()
 
     @rx.event
-    def get_active_deal_for_bot_id(self, bot_id: str) -> Deal | None:
-        return self.deals.get(bot_id)
+    def load_more_deals(self):
+        if not self.has_more_deals or self._history_bot_db_id is None:
+            return
+        db = SessionLocal()
+        try:
+            self._load_deal_page(db)
+        finally:
+            db.close()
+
+    def _load_deal_page(self, db):
+        page = crud.get_deals_page(
+            db,
+            self._history_bot_db_id,
+            limit=DEAL_HISTORY_PAGE_SIZE + 1,
+            before=self._history_cursor,
+        )
+        self.has_more_deals = len(page) > DEAL_HISTORY_PAGE_SIZE
+        page = page[:DEAL_HISTORY_PAGE_SIZE]
+        if page:
+            self._history_cursor = (page[-1].entry_time, page[-1].id)
+        self.bot_deals.extend(
+            summarize_db_deal(d, self._history_bot_id) for d in page
+        )
+
+    def get_active_deal(self, bot_id: str) -> Deal | None:
+        deal = active_deals.get(bot_id)
+        if deal and deal["status"] == "active":
+            return deal
+        return None
 
     def _calculate_average_entry(self, deal: Deal) -> tuple[float, float]:
         all_orders = [deal["base_order"]] + deal["filled_safety_orders"]
@@ -63,11 +269,17 @@ class DealState(rx.State):
             return (0.0, 0.0)
         return (total_cost / total_quantity, total_quantity)
 
+    def _publish(self, deal: Deal):
+        if deal["bot_id"] != self._history_bot_id:
+            return
+        self.active_deal = summarize_deal(deal) if deal["status"] == "active" else None
+
     @rx.event
     def create_deal(self, bot_id: str, base_order: Order):
-        deal_id = f"deal_{bot_id}_{int(time.time())}"
+        deal_id = f"deal_{bot_id}_{int(base_order['timestamp'])}"
         new_deal = Deal(
             deal_id=deal_id,
+            db_id=None,
             bot_id=bot_id,
             status="active",
             entry_time=base_order["timestamp"],
@@ -81,21 +293,37 @@ class DealState(rx.State):
             unrealized_pnl=0.0,
             realized_pnl=0.0,
         )
-        self.deals[bot_id] = new_deal
+        active_deals[bot_id] = new_deal
+        queue_deal_write(lambda: persist_new_deal(new_deal))
+        self._publish(new_deal)
 
     @rx.event
     def add_pending_safety_order(self, bot_id: str, safety_order: Order):
-        if bot_id not in self.deals or self.deals[bot_id]["status"] != "active":
+        deal = self.get_active_deal(bot_id)
+        if not deal:
             return
-        self.deals[bot_id]["pending_safety_orders"].append(safety_order)
+        deal["pending_safety_orders"].append(safety_order)
+        order = dict(safety_order)
+        queue_deal_write(lambda: persist_order(deal, order))
+        self._publish(deal)
+
+    @rx.event
+    def remove_pending_safety_order(self, bot_id: str, order_id: str):
+        deal = active_deals.get(bot_id)
+        if not deal:
+            return
+        deal["pending_safety_orders"] = [
+            o for o in deal["pending_safety_orders"] if o["order_id"] != order_id
+        ]
+        self._publish(deal)
 
     @rx.event
     def safety_order_filled(
         self, bot_id: str, filled_order_id: str, fill_price: float, fill_qty: float
     ):
-        if bot_id not in self.deals or self.deals[bot_id]["status"] != "active":
+        deal = self.get_active_deal(bot_id)
+        if not deal:
             return
-        deal = self.deals[bot_id]
         order_to_move = None
         for i, order in enumerate(deal["pending_safety_orders"]):
             if order["order_id"] == filled_order_id:
@@ -109,29 +337,35 @@ class DealState(rx.State):
             avg_price, total_quantity = self._calculate_average_entry(deal)
             deal["average_entry_price"] = avg_price
             deal["total_quantity"] = total_quantity
-            self.deals[bot_id] = deal
-
-    @rx.event
-    def update_unrealized_pnl(self, bot_id: str, current_price: float):
-        if bot_id not in self.deals:
-            return
-        deal = self.deals[bot_id]
-        pnl = (current_price - deal["average_entry_price"]) * deal["total_quantity"]
-        deal["unrealized_pnl"] = pnl
-        self.deals[bot_id] = deal
-
-    @rx.event
-    def set_take_profit_order(self, bot_id: str, take_profit_order: Order):
-        if bot_id not in self.deals:
-            return
-        self.deals[bot_id]["take_profit_order"] = take_profit_order
+            queue_deal_write(
+                lambda: persist_safety_fill(
+                    deal,
+                    filled_order_id,
+                    fill_price,
+                    fill_qty,
+                    avg_price,
+                    total_quantity,
+                )
+            )
+            self._publish(deal)
 
     @rx.event
-    def close_deal(self, bot_id: str, realized_pnl: float):
-        if bot_id not in self.deals:
+    def close_deal(
+        self,
+        bot_id: str,
+        realized_pnl: float,
+        close_time: float | None = None,
+        sell_order: Order | None = None,
+    ):
+        deal = active_deals.get(bot_id)
+        if not deal:
             return
-        deal = self.deals[bot_id]
         deal["status"] = "completed"
+        deal["take_profit_order"] = sell_order
         deal["realized_pnl"] = realized_pnl
-        deal["close_time"] = time.time()
-        self.deals[bot_id] = deal
\ No newline at end of file
+        deal["close_time"] = time.time() if close_time is None else close_time
+        close_time = deal["close_time"]
+        queue_deal_write(
+            lambda: persist_close(deal, realized_pnl, close_time, sell_order)
+        )
+        self._publish(deal)
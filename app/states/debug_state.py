@@ -0,0 +1,79 @@
+import reflex as rx
+import time
+from typing import TypedDict
+from urllib.parse import urlencode
+from app.database import security
+from app.services import loop_monitor
+from app.services.loop_monitor import LockStats
+from app.states.auth_state import AuthState
+
+LOCK_STATS_LIMIT = 50
+PROFILE_SECONDS = 10
+
+
+class SlowCallbackRow(TypedDict):
+    time: str
+    blocked_ms: float
+    stack: str
+
+
+class DebugState(rx.State):
+    loop_lag_ms: float = 0.0
+    loop_lag_max_ms: float = 0.0
+    slow_callback_count: int = 0
+    lock_stats: list[LockStats] = []
+    slow_callbacks: list[SlowCallbackRow] = []
+
+    @rx.event
+    async def load(self):
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.is_admin:
+            return rx.redirect("/")
+        self.loop_lag_ms = loop_monitor.loop_stats["lag_ms"]
+        self.loop_lag_max_ms = loop_monitor.loop_stats["lag_max_ms"]
+        self.slow_callback_count = loop_monitor.loop_stats["slow_callbacks"]
+        self.lock_stats = sorted(
+            (
+                LockStats(
+                    handler=stats["handler"],
+                    acquisitions=stats["acquisitions"],
+                    wait_total_ms=round(stats["wait_total_ms"], 2),
+                    wait_max_ms=round(stats["wait_max_ms"], 2),
+                    hold_total_ms=round(stats["hold_total_ms"], 2),
+                    hold_max_ms=round(stats["hold_max_ms"], 2),
+                )
+                for stats in list(loop_monitor.lock_stats.values())
+            ),
+            key=lambda stats: stats["wait_total_ms"] + stats["hold_total_ms"],
+            reverse=True,
+        )[:LOCK_STATS_LIMIT]
+        self.slow_callbacks = [
+            SlowCallbackRow(
+                time=time.strftime("%H:%M:%S", time.localtime(callback["at"])),
+                blocked_ms=callback["blocked_ms"],
+                stack=callback["stack"],
+            )
+            for callback in reversed(list(loop_monitor.slow_callbacks))
+        ]
+
+    @rx.event
+    async def reset_stats(self):
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.is_admin:
+            return
+        loop_monitor.reset()
+        return DebugState.load
+
+    @rx.event
+    async def download_profile(self, seconds: int = PROFILE_SECONDS):
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.is_admin:
+            return
+        token = security.create_signed_token(
+            {"scope": "profile", "email": auth_state.current_user["email"]}
+        )
+        query = urlencode({"token": token, "seconds": seconds})
+        return rx.download(
+            url=f"{rx.config.get_config().api_url}/api/debug/profile?{query}",
+            filename="profile.collapsed",
+        )
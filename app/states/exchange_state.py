@@ -1,13 +1,34 @@
 import reflex as rx
 import json
 import logging
-import os
-from typing import TypedDict
-from binance.client import Client
-from binance.exceptions import BinanceAPIException
-from binance import AsyncClient
+from typing import TYPE_CHECKING, TypedDict, cast
 import asyncio
+import itertools
 import re
+import time
+from app.services import binance_client, metrics, tracing
+
+if TYPE_CHECKING:
+    from binance import AsyncClient
+
+TRADING_PAIRS_TTL_SECONDS = 3600
+TRADING_PAIRS_LIMIT = 100
+STABLECOIN_PAIR_PATTERN = re.compile(".*USDT$|.*USDC$|.*FDUSD$|.*TUSD$")
+trading_pairs_cache: dict[str, list[str] | float] = {
+    "pairs": [],
+    "stable_pairs": [],
+    "fetched_at": 0.0,
+}
+
+
+def filter_trading_pairs(
+    search_term: str, limit: int = TRADING_PAIRS_LIMIT
+) -> list[str]:
+    stable_pairs = cast(list[str], trading_pairs_cache["stable_pairs"])
+    search_term = search_term.upper()
+    if not search_term:
+        return stable_pairs[:limit]
+    return list(itertools.islice((p for p in stable_pairs if search_term in p), limit))
 
 
 class APIKeys(TypedDict):
@@ -25,13 +46,13 @@ class ExchangeState(rx.State):
     api_keys: APIKeys = {"api_key": "", "secret_key": ""}
     has_api_keys: bool = False
     account_balance: list[WalletBalance] = []
-    trading_pairs: list[str] = []
+    trading_pairs_count: int = 0
     show_secret_key: bool = False
     last_balance_refresh: str = ""
 
     @rx.var
     def is_testnet(self) -> bool:
-        return os.environ.get("BINANCE_TESTNET", "false").lower() == "true"
+        return binance_client.is_testnet()
 
     @rx.var
     def obfuscated_secret_key(self) -> str:
@@ -49,12 +70,9 @@ class ExchangeState(rx.State):
         from app.states.bot_state import BotsState
 
         bots_state = await self.get_state(BotsState)
-        search_term = bots_state.pair_search_term.upper()
-        stablecoin_pattern = re.compile(".*USDT$|.*USDC$|.*FDUSD$|.*TUSD$")
-        stable_pairs = [p for p in self.trading_pairs if stablecoin_pattern.match(p)]
-        if not search_term:
-            return stable_pairs[:100]
-        return [p for p in stable_pairs if search_term in p.upper()][:100]
+        if not self.trading_pairs_count:
+            return []
+        return filter_trading_pairs(bots_state.pair_search_term)
 
     @rx.event(background=True)
     async def save_api_keys(self, form_data: dict):
@@ -67,10 +85,12 @@ class ExchangeState(rx.State):
         logging.info(
             f"Attempting to validate keys with Binance. Testnet: {is_testnet_mode}"
         )
+        from binance.exceptions import BinanceAPIException
+
         try:
-            client = Client(api_key, secret_key, testnet=is_testnet_mode)
-            if is_testnet_mode:
-                client.API_URL = client.API_TESTNET_URL
+            client = binance_client.create_client(
+                api_key, secret_key, testnet=is_testnet_mode
+            )
             client.get_account()
         except BinanceAPIException as e:
             logging.exception(f"Binance API Error during key validation: {e}")
@@ -126,7 +146,7 @@ class ExchangeState(rx.State):
         if not self.has_api_keys:
             return rx.toast.info("Please save your API keys first.")
         try:
-            client = Client(
+            client = binance_client.create_client(
                 self.api_keys["api_key"],
                 self.api_keys["secret_key"],
                 testnet=self.is_testnet,
@@ -139,6 +159,18 @@ class ExchangeState(rx.State):
                     if float(bal.get("free", 0)) > 0 or float(bal.get("locked", 0)) > 0
                 ]
                 self.account_balance = balances
+                usdt_balance = sum(
+                    float(bal["free"]) + float(bal["locked"])
+                    for bal in balances
+                    if bal["asset"] == "USDT"
+                )
+                from app.states.auth_state import AuthState
+
+                auth_state = await self.get_state(AuthState)
+                if auth_state.current_user:
+                    self._record_account_balance(
+                        auth_state.current_user["email"], usdt_balance
+                    )
                 from datetime import datetime
 
                 self.last_balance_refresh = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -153,8 +185,13 @@ class ExchangeState(rx.State):
     async def fetch_trading_pairs(self):
         if not self.has_api_keys:
             return
+        fetched_at = cast(float, trading_pairs_cache["fetched_at"])
+        if time.time() - fetched_at < TRADING_PAIRS_TTL_SECONDS:
+            async with self:
+                self.trading_pairs_count = len(trading_pairs_cache["pairs"])
+            return
         try:
-            client = Client(
+            client = binance_client.create_client(
                 self.api_keys["api_key"],
                 self.api_keys["secret_key"],
                 testnet=self.is_testnet,
@@ -165,8 +202,14 @@ class ExchangeState(rx.State):
                 for s in exchange_info["symbols"]
                 if s["status"] == "TRADING" and "SPOT" in s["permissions"]
             ]
+            pairs = sorted(pairs)
+            trading_pairs_cache["pairs"] = pairs
+            trading_pairs_cache["stable_pairs"] = [
+                p for p in pairs if STABLECOIN_PAIR_PATTERN.match(p)
+            ]
+            trading_pairs_cache["fetched_at"] = time.time()
             async with self:
-                self.trading_pairs = sorted(pairs)
+                self.trading_pairs_count = len(pairs)
         except Exception as e:
             logging.exception(f"Error fetching trading pairs: {e}")
 
@@ -205,7 +248,7 @@ class ExchangeState(rx.State):
             self.api_keys = {"api_key": "", "secret_key": ""}
             self.has_api_keys = False
             self.account_balance = []
-            self.trading_pairs = []
+            self.trading_pairs_count = 0
             self.last_balance_refresh = ""
             auth_state = await self.get_state(AuthState)
             if auth_state.current_user:
@@ -218,22 +261,27 @@ class ExchangeState(rx.State):
                     db.close()
         return rx.toast.info("API Keys cleared.")
 
-    async def _get_async_client(self) -> AsyncClient | None:
+    def _record_account_balance(self, email: str, balance: float):
+        from app.database import crud
+
+        db = self.get_db()
+        try:
+            user_id = crud.get_user_id_from_email(db, email)
+            if user_id is not None:
+                crud.set_user_account_balance(db, user_id, balance)
+        finally:
+            db.close()
+
+    async def _get_async_client(self) -> "AsyncClient | None":
         api_key = self.api_keys["api_key"]
         secret_key = self.api_keys["secret_key"]
         if not self.has_api_keys or not api_key or (not secret_key):
             logging.error("Cannot create async client, API keys not set or validated.")
             return None
         try:
-            is_testnet_mode = (
-                os.environ.get("BINANCE_TESTNET", "false").lower() == "true"
-            )
-            client = await AsyncClient.create(
-                api_key, secret_key, testnet=is_testnet_mode
+            return await binance_client.create_async_client(
+                api_key, secret_key, testnet=binance_client.is_testnet()
             )
-            if is_testnet_mode and hasattr(client, "API_TESTNET_URL"):
-                client.API_URL = client.API_TESTNET_URL
-            return client
         except Exception as e:
             logging.exception(f"Failed to create async client: {e}")
             return None
@@ -242,20 +290,32 @@ class ExchangeState(rx.State):
     async def place_market_order(
         self, pair: str, side: str, quantity: float
     ) -> dict | None:
-        client = await self._get_async_client()
+        with tracing.span("client_create"):
+            client = await self._get_async_client()
         if not client:
             return None
+        from binance.exceptions import BinanceAPIException
+
+        started = metrics.start_timer()
         try:
             logging.info(f"Placing market {side} order for {quantity} of {pair}")
-            order = await client.create_order(
-                symbol=pair, side=side.upper(), type="MARKET", quantity=quantity
-            )
+            with tracing.span(
+                "exchange_request", endpoint="market_order", sent_at=time.time() * 1000
+            ) as span:
+                order = await client.create_order(
+                    symbol=pair, side=side.upper(), type="MARKET", quantity=quantity
+                )
+                span.end(transact_time=order.get("transactTime"))
+            metrics.exchange_request_seconds.observe_since(started, "market_order")
+            metrics.record_weight(client)
             logging.info(f"Order successful: {order}")
             return order
         except BinanceAPIException as e:
+            metrics.exchange_errors_total.inc("market_order")
             logging.exception(f"Binance API error placing market order: {e}")
             return None
         except Exception as e:
+            metrics.exchange_errors_total.inc("market_order")
             logging.exception(f"Unexpected error placing market order: {e}")
             return None
         finally:
@@ -269,6 +329,9 @@ class ExchangeState(rx.State):
         client = await self._get_async_client()
         if not client:
             return None
+        from binance.exceptions import BinanceAPIException
+
+        started = metrics.start_timer()
         try:
             logging.info(
                 f"Placing limit {side} order for {quantity} of {pair} at price {price}"
@@ -281,12 +344,16 @@ class ExchangeState(rx.State):
                 quantity=quantity,
                 price=f"{price:.8f}",
             )
+            metrics.exchange_request_seconds.observe_since(started, "limit_order")
+            metrics.record_weight(client)
             logging.info(f"Limit order successful: {order}")
             return order
         except BinanceAPIException as e:
+            metrics.exchange_errors_total.inc("limit_order")
             logging.exception(f"Binance API error placing limit order: {e}")
             return None
         except Exception as e:
+            metrics.exchange_errors_total.inc("limit_order")
             logging.exception(f"Unexpected error placing limit order: {e}")
             return None
         finally:
@@ -297,12 +364,19 @@ class ExchangeState(rx.State):
     async def validate_balance(
         self, asset: str, required_amount: float
     ) -> tuple[bool, float]:
-        client = await self._get_async_client()
+        with tracing.span("client_create"):
+            client = await self._get_async_client()
         if not client:
             return (False, 0.0)
         available_balance = 0.0
+        started = metrics.start_timer()
         try:
-            balance = await client.get_asset_balance(asset=asset)
+            with tracing.span(
+                "exchange_request", endpoint="asset_balance", sent_at=time.time() * 1000
+            ):
+                balance = await client.get_asset_balance(asset=asset)
+            metrics.exchange_request_seconds.observe_since(started, "asset_balance")
+            metrics.record_weight(client)
             if balance:
                 available_balance = float(balance["free"])
             if available_balance >= required_amount:
@@ -312,6 +386,7 @@ class ExchangeState(rx.State):
             )
             return (False, available_balance)
         except Exception as e:
+            metrics.exchange_errors_total.inc("asset_balance")
             logging.exception(f"Error validating balance for {asset}: {e}")
             return (False, available_balance)
         finally:
@@ -1,8 +1,13 @@
 import reflex as rx
 from typing import TypedDict, Literal
-import time
+from app.database import crud, models
+from app.database.database import SessionLocal
+from app.services.engine_registry import engine_registry
+from app.services.notification_service import publish_notification
+from app.states.auth_state import AuthState
 
 NotificationType = Literal["info", "success", "warning", "error"]
+NOTIFICATION_PAGE_SIZE = 20
 
 
 class Notification(TypedDict):
@@ -13,44 +18,124 @@ class Notification(TypedDict):
     is_read: bool
 
 
+def notification_from_model(row: models.Notification) -> Notification:
+    return Notification(
+        id=str(row.seq),
+        timestamp=row.created_at,
+        type=row.type,
+        message=row.message,
+        is_read=row.is_read,
+    )
+
+
 class NotificationState(rx.State):
     notifications: list[Notification] = []
+    unread_count: int = 0
+    has_more_notifications: bool = False
 
-    @rx.var
-    def unread_count(self) -> int:
-        return sum((1 for n in self.notifications if not n["is_read"]))
-
-    @rx.var
-    def recent_notifications(self) -> list[Notification]:
-        return sorted(self.notifications, key=lambda n: n["timestamp"], reverse=True)[
-            :5
-        ]
+    async def _current_user_id(self) -> int | None:
+        auth_state = await self.get_state(AuthState)
+        if not auth_state.current_user:
+            return None
+        email = auth_state.current_user["email"]
+        account = engine_registry.accounts.get(email)
+        if account and account["user_id"] is not None:
+            return account["user_id"]
+        db = SessionLocal()
+        try:
+            return crud.get_user_id_from_email(db, email)
+        finally:
+            db.close()
 
-    @rx.event
-    def add_notification(self, message: str, type: NotificationType = "info"):
-        new_notification = Notification(
-            id=f"notif_{int(time.time() * 1000)}",
-            timestamp=time.time(),
-            type=type,
-            message=message,
-            is_read=False,
+    def _load_page(self, db, user_id: int, before_seq: int | None):
+        rows = crud.get_notifications_page(
+            db, user_id, limit=NOTIFICATION_PAGE_SIZE + 1, before_seq=before_seq
+        )
+        self.has_more_notifications = len(rows) > NOTIFICATION_PAGE_SIZE
+        self.notifications.extend(
+            notification_from_model(r) for r in rows[:NOTIFICATION_PAGE_SIZE]
         )
-        self.notifications.insert(0, new_notification)
-        if len(self.notifications) > 100:
+
+    def prepend_notification(self, row: models.Notification, unread_count: int):
+        self.notifications.insert(0, notification_from_model(row))
+        if len(self.notifications) > NOTIFICATION_PAGE_SIZE:
             self.notifications.pop()
+            self.has_more_notifications = True
+        self.unread_count = unread_count
+
+    @rx.event
+    async def load_notifications(self):
+        user_id = await self._current_user_id()
+        if user_id is None:
+            return
+        self.notifications = []
+        db = SessionLocal()
+        try:
+            self.unread_count = crud.get_notification_counter(db, user_id).unread_count
+            self._load_page(db, user_id, None)
+        finally:
+            db.close()
+
+    @rx.event
+    async def load_more_notifications(self):
+        user_id = await self._current_user_id()
+        if user_id is None or not self.notifications:
+            return
+        db = SessionLocal()
+        try:
+            self._load_page(db, user_id, int(self.notifications[-1]["id"]))
+        finally:
+            db.close()
+
+    @rx.event
+    async def add_notification(self, message: str, type: NotificationType = "info"):
+        user_id = await self._current_user_id()
+        if user_id is None:
+            return
+        published = publish_notification(user_id, message, type)
+        if published is not None:
+            self.prepend_notification(*published)
 
     @rx.event
-    def mark_as_read(self, notification_id: str):
-        for i, n in enumerate(self.notifications):
+    async def mark_as_read(self, notification_id: str):
+        user_id = await self._current_user_id()
+        if user_id is None:
+            return
+        db = SessionLocal()
+        try:
+            crud.mark_notification_read(db, user_id, int(notification_id))
+            self.unread_count = crud.get_notification_counter(db, user_id).unread_count
+        finally:
+            db.close()
+        for n in self.notifications:
             if n["id"] == notification_id:
-                self.notifications[i]["is_read"] = True
+                n["is_read"] = True
                 break
 
     @rx.event
-    def mark_all_as_read(self):
-        for i in range(len(self.notifications)):
-            self.notifications[i]["is_read"] = True
+    async def mark_all_as_read(self):
+        user_id = await self._current_user_id()
+        if user_id is None:
+            return
+        db = SessionLocal()
+        try:
+            crud.mark_all_notifications_read(db, user_id)
+        finally:
+            db.close()
+        for n in self.notifications:
+            n["is_read"] = True
+        self.unread_count = 0
 
     @rx.event
-    def clear_all_notifications(self):
-        self.notifications = []
\ No newline at end of file
+    async def clear_all_notifications(self):
+        user_id = await self._current_user_id()
+        if user_id is None:
+            return
+        db = SessionLocal()
+        try:
+            crud.clear_notifications(db, user_id)
+        finally:
+            db.close()
+        self.notifications = []
+        self.unread_count = 0
+        self.has_more_notifications = False
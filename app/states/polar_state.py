@@ -1,10 +1,12 @@
 import reflex as rx
 import os
 import logging
-from typing import TypedDict, cast
-from polar_sdk import Polar, models
+from typing import TYPE_CHECKING, Literal, TypedDict, cast
 from app.states.auth_state import AuthState, User
 
+if TYPE_CHECKING:
+    from polar_sdk import Polar
+
 logging.basicConfig(level=logging.INFO)
 
 
@@ -16,27 +18,36 @@ class Subscription(TypedDict):
     product_name: str
 
 
+def subscription_from_polar(subscription) -> Subscription:
+    period_end = subscription.current_period_end
+    return Subscription(
+        id=subscription.id,
+        status=str(subscription.status),
+        current_period_end=period_end.strftime("%Y-%m-%d") if period_end else "",
+        cancel_at_period_end=subscription.cancel_at_period_end,
+        product_name=subscription.product.name if subscription.product else "",
+    )
+
+
 class PolarState(rx.State):
     is_loading: bool = False
     subscription_active: bool = False
-    current_subscription: models.Subscription | None = None
-    polar_products: list[models.Product] = []
+    current_subscription: Subscription | None = None
+    _pro_product_id: str = ""
 
-    def _get_polar_client(self) -> Polar | None:
+    def _get_polar_client(self) -> "Polar | None":
         token = os.getenv("POLAR_ACCESS_TOKEN")
         if not token:
             logging.error("POLAR_ACCESS_TOKEN environment variable not set.")
             return None
-        return Polar(token=token)
+        from polar_sdk import Polar
 
-    @rx.var
-    def pro_product(self) -> models.Product | None:
-        return next((p for p in self.polar_products if p.name == "PRO"), None)
+        return Polar(token=token)
 
     @rx.var
     def subscription_renewal_date(self) -> str:
-        if self.current_subscription and self.current_subscription.current_period_end:
-            return self.current_subscription.current_period_end.strftime("%Y-%m-%d")
+        if self.current_subscription:
+            return self.current_subscription["current_period_end"]
         return ""
 
     @rx.event(background=True)
@@ -49,11 +60,17 @@ class PolarState(rx.State):
         polar = self._get_polar_client()
         if not polar:
             return
+        from polar_sdk import models
+
         try:
             async with polar:
                 products_response = await polar.products.list(is_recurring=True)
+                pro_product = next(
+                    (p for p in products_response.items or [] if p.name == "PRO"),
+                    None,
+                )
                 async with self:
-                    self.polar_products = products_response.items or []
+                    self._pro_product_id = pro_product.id if pro_product else ""
                 subs_response = await polar.subscriptions.list(
                     customer_email=user_email
                 )
@@ -69,7 +86,9 @@ class PolarState(rx.State):
                     auth_state = await self.get_state(AuthState)
                     if active_sub:
                         self.subscription_active = True
-                        self.current_subscription = active_sub
+                        self.current_subscription = subscription_from_polar(
+                            active_sub
+                        )
                         if auth_state.current_user["subscription_tier"] != "PRO":
                             auth_state.set_user_tier("PRO")
                     else:
@@ -90,14 +109,15 @@ class PolarState(rx.State):
             async with self:
                 auth_state = await self.get_state(AuthState)
                 user = cast(User, auth_state.current_user)
+                pro_product_id = self._pro_product_id
             polar = self._get_polar_client()
-            if not polar or not self.pro_product:
+            if not polar or not pro_product_id:
                 async with self:
                     self.is_loading = False
                 return rx.toast.error("Subscription service is not configured.")
             async with polar:
                 checkout_session = await polar.checkout.create(
-                    product_id=self.pro_product.id,
+                    product_id=pro_product_id,
                     success_url=f"{self.router.page.full_raw_url}",
                     customer_email=user.get("email"),
                 )
@@ -137,6 +157,8 @@ class PolarState(rx.State):
         polar = self._get_polar_client()
         if not polar:
             return {"body": "Polar client not configured", "status_code": 500}
+        from polar_sdk import models
+
         try:
             event = polar.webhooks.parse(payload, headers, secret)
             logging.info(f"Received Polar webhook: {event.type}")
@@ -0,0 +1,92 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "analytics_bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from app.database import analytics, models, rollups
+from app.database.database import SessionLocal, engine, init_db
+
+DEALS = int(os.environ.get("ANALYTICS_BENCH_DEALS", "100000"))
+BOTS = 20
+RUNS = 5
+MAX_QUERY_MS = float(os.environ.get("ANALYTICS_BENCH_MAX_MS", "250"))
+
+
+def seed(user_id: int):
+    rng = random.Random(7)
+    now = time.time()
+    bot_rows = [
+        {"id": i + 1, "uuid": f"bench-{i}", "name": f"Bot {i}", "user_id": user_id}
+        for i in range(BOTS)
+    ]
+    deal_rows = []
+    order_rows = []
+    for deal_id in range(1, DEALS + 1):
+        entry_time = now - rng.uniform(0, 365 * 86400)
+        deal_rows.append(
+            {
+                "id": deal_id,
+                "bot_id": rng.randint(1, BOTS),
+                "status": "completed",
+                "entry_time": entry_time,
+                "close_time": entry_time + rng.uniform(60, 86400),
+                "realized_pnl": rng.uniform(-5, 10),
+            }
+        )
+        order_rows.append(
+            {
+                "deal_id": deal_id,
+                "order_id_str": f"{deal_id}-base",
+                "order_type": "base",
+                "status": "filled",
+                "price": 100.0,
+                "quantity": 0.1,
+            }
+        )
+    with engine.begin() as conn:
+        conn.execute(
+            models.User.__table__.insert(),
+            [
+                {
+                    "id": user_id,
+                    "email": "bench@example.com",
+                    "username": "bench",
+                    "hashed_password": "",
+                }
+            ],
+        )
+        conn.execute(models.Bot.__table__.insert(), bot_rows)
+        conn.execute(models.Deal.__table__.insert(), deal_rows)
+        conn.execute(models.Order.__table__.insert(), order_rows)
+
+
+def main() -> int:
+    init_db()
+    seed(1)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rollup_rows = rollups.rebuild_daily_pnl(db, 1)
+        print(
+            f"Rebuilt {rollup_rows} daily rollups in {(time.perf_counter() - started) * 1000:.1f} ms"
+        )
+        timings = []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            result = analytics.user_analytics(db, 1)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        db.close()
+    best_ms = min(timings)
+    print(
+        f"{result['total_deals']} deals, {len(result['daily_pnl'])} days: best {best_ms:.1f} ms, worst {max(timings):.1f} ms (budget {MAX_QUERY_MS:.0f} ms)"
+    )
+    return 1 if best_ms > MAX_QUERY_MS else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
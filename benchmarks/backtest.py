@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import numpy as np
+from app.services.backtest import run_backtest
+
+CANDLES = 365 * 24 * 60
+RUNS = 3
+MAX_SECONDS = float(os.environ.get("BACKTEST_BENCH_MAX_SECONDS", "1.0"))
+
+CONFIG = {
+    "pair": "BTCUSDT",
+    "base_order_size": 10.0,
+    "safety_order_size": 10.0,
+    "safety_order_volume_scale": 1.5,
+    "safety_order_step_scale": 1.2,
+    "max_safety_orders": 5,
+    "immediate_safety_orders": 1,
+    "price_deviation": 1.0,
+    "take_profit_percentage": 1.5,
+}
+
+
+def synthetic_candles(count: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, 0.0004, (2, count)))
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    open_time = np.arange(count, dtype=np.float64) * 60_000
+    return np.column_stack((open_time, open_, high, low, close, np.ones(count)))
+
+
+def main() -> int:
+    candles = synthetic_candles(CANDLES)
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = run_backtest(CONFIG, candles, fee_rate=0.001)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(
+        f"{CANDLES} candles: {result['deals']} deals, P/L {result['total_pnl']:.2f}, max capital {result['max_capital_deployed']:.2f}, max drawdown {result['max_drawdown']:.2f}"
+    )
+    print(
+        f"best {best * 1000:.1f} ms over {RUNS} runs (budget {MAX_SECONDS * 1000:.0f} ms)"
+    )
+    return 1 if best > MAX_SECONDS else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
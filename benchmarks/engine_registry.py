@@ -0,0 +1,101 @@
+import random
+import sys
+import time
+import uuid
+from app.services.engine_registry import engine_registry
+from app.states.bot_execution_state import strategy_decision
+from app.states.bot_state import Bot
+from app.states.deal_state import Deal, Order
+
+BOT_COUNTS = (10, 100, 1000, 5000)
+TICKS = 20000
+MAX_TICK_OVERHEAD_US = 20.0
+
+CONFIG = {
+    "pair": "BTCUSDT",
+    "base_order_size": 10.0,
+    "safety_order_size": 10.0,
+    "safety_order_volume_scale": 1.5,
+    "safety_order_step_scale": 1.2,
+    "max_safety_orders": 5,
+    "immediate_safety_orders": 1,
+    "price_deviation": 1.0,
+    "take_profit_percentage": 2.0,
+}
+
+
+def populate(bot_count: int) -> list[Bot]:
+    engine_registry.bots.clear()
+    engine_registry.deals.clear()
+    bots = []
+    for i in range(bot_count):
+        bot_id = str(uuid.uuid4())
+        bot = Bot(
+            id=bot_id,
+            name=f"DCA Bot {i + 1}",
+            status="in_position",
+            in_deal=True,
+            config=dict(CONFIG),
+            total_pnl=0.0,
+            deals_count=0,
+        )
+        base_order = Order(
+            order_id=str(i),
+            timestamp=time.time(),
+            side="buy",
+            price=100.0,
+            quantity=0.1,
+            order_type="base",
+            status="filled",
+        )
+        engine_registry.register_bot(dict(bot), "bench@example.com")
+        engine_registry.deals[bot_id] = Deal(
+            deal_id=f"deal_{bot_id}",
+            db_id=None,
+            bot_id=bot_id,
+            status="active",
+            entry_time=base_order["timestamp"],
+            close_time=None,
+            base_order=base_order,
+            filled_safety_orders=[],
+            pending_safety_orders=[],
+            take_profit_order=None,
+            average_entry_price=100.0,
+            total_quantity=0.1,
+            unrealized_pnl=0.0,
+            realized_pnl=0.0,
+        )
+        bots.append(bot)
+    return bots
+
+
+def legacy_lookup(bots: list[Bot], bot_id: str):
+    bot = next((b for b in bots if b["id"] == bot_id), None)
+    deal = engine_registry.deals.get(bot_id)
+    return bot, deal
+
+
+def time_per_tick(fn, bot_ids: list[str]) -> float:
+    started = time.perf_counter()
+    for i in range(TICKS):
+        fn(bot_ids[i % len(bot_ids)], 100.5)
+    return (time.perf_counter() - started) / TICKS * 1_000_000
+
+
+def main() -> int:
+    failed = False
+    for bot_count in BOT_COUNTS:
+        bots = populate(bot_count)
+        bot_ids = [b["id"] for b in bots]
+        random.Random(42).shuffle(bot_ids)
+        legacy_us = time_per_tick(lambda b, p: legacy_lookup(bots, b), bot_ids)
+        registry_us = time_per_tick(strategy_decision, bot_ids)
+        failed = failed or registry_us > MAX_TICK_OVERHEAD_US
+        print(
+            f"{bot_count:>5d} bots  list scan {legacy_us:9.2f} us/tick  registry decision {registry_us:6.2f} us/tick"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "hot_path.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import reflex as rx
+from app.database import crud
+from app.database.database import SessionLocal, init_db
+from app.services.engine_registry import engine_registry
+from app.states.bot_execution_state import BotExecutionState
+from app.states.bot_state import Bot, BotsState
+from app.states.deal_state import Deal, DealState, Order
+from app.states.exchange_state import filter_trading_pairs, trading_pairs_cache
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "hot_path.json")
+BOT_COUNTS = (10, 100, 1000, 5000)
+ORDERS_PER_DEAL = (1, 10, 50)
+PAIR_COUNTS = (500, 2000)
+ROUNDS = 7
+CALLS_PER_ROUND = 2000
+TOLERANCE = float(os.environ.get("HOT_PATH_TOLERANCE", "0.5"))
+CONFIG = {
+    "pair": "BTCUSDT",
+    "base_order_size": 10.0,
+    "safety_order_size": 10.0,
+    "safety_order_volume_scale": 1.0,
+    "safety_order_step_scale": 1.0,
+    "max_safety_orders": 100,
+    "immediate_safety_orders": 0,
+    "price_deviation": 50.0,
+    "take_profit_percentage": 50.0,
+}
+
+
+def make_order(n: int) -> Order:
+    return Order(
+        order_id=str(n),
+        timestamp=time.time(),
+        side="buy",
+        price=100.0 - n * 0.01,
+        quantity=0.1,
+        order_type="base" if n == 0 else "safety",
+        status="filled",
+    )
+
+
+def make_deal(bot_id: str, orders: int) -> Deal:
+    return Deal(
+        deal_id=f"deal_{bot_id}",
+        db_id=None,
+        bot_id=bot_id,
+        status="active",
+        entry_time=time.time(),
+        close_time=None,
+        base_order=make_order(0),
+        filled_safety_orders=[make_order(i) for i in range(1, orders)],
+        pending_safety_orders=[],
+        take_profit_order=None,
+        average_entry_price=100.0,
+        total_quantity=0.1 * orders,
+        unrealized_pnl=0.0,
+        realized_pnl=0.0,
+    )
+
+
+def populate(bot_count: int, orders: int) -> list[str]:
+    engine_registry.bots.clear()
+    engine_registry.deals.clear()
+    bot_ids = []
+    for i in range(bot_count):
+        bot_id = str(uuid.UUID(int=(bot_count << 32) + i))
+        engine_registry.register_bot(
+            Bot(
+                id=bot_id,
+                name=f"DCA Bot {i + 1}",
+                status="in_position",
+                in_deal=True,
+                config=dict(CONFIG),
+                total_pnl=0.0,
+                deals_count=0,
+            ),
+            "bench@example.com",
+        )
+        engine_registry.deals[bot_id] = make_deal(bot_id, orders)
+        bot_ids.append(bot_id)
+    return bot_ids
+
+
+def build_session(bot_ids: list[str]) -> rx.State:
+    root = rx.State(_reflex_internal_init=True)
+    bots_state = root.get_substate(BotsState.get_full_name().split("."))
+    bots_state.bots = [dict(engine_registry.bots[bot_id]) for bot_id in bot_ids]
+    bots_state._reindex()
+    return root
+
+
+def seed_db(bot_ids: list[str]):
+    db = SessionLocal()
+    try:
+        user = crud.create_user(
+            db, f"bench{len(bot_ids)}", f"bench{len(bot_ids)}@example.com", "bench"
+        )
+        for bot_id in bot_ids:
+            crud.create_bot(db, user.id, dict(engine_registry.bots[bot_id]))
+    finally:
+        db.close()
+
+
+def summarize(samples: list[float]) -> dict:
+    return {
+        "min_us": min(samples),
+        "mean_us": statistics.mean(samples),
+        "stddev_us": statistics.stdev(samples),
+    }
+
+
+def measure(fn, args: list[tuple]) -> dict:
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for i in range(CALLS_PER_ROUND):
+            fn(*args[i % len(args)])
+        samples.append((time.perf_counter() - started) / CALLS_PER_ROUND * 1e6)
+    return summarize(samples)
+
+
+def measure_async(fn, args: list[tuple]) -> dict:
+    async def rounds() -> list[float]:
+        samples = []
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            for i in range(CALLS_PER_ROUND):
+                await fn(*args[i % len(args)])
+            samples.append((time.perf_counter() - started) / CALLS_PER_ROUND * 1e6)
+        return samples
+
+    return summarize(asyncio.run(rounds()))
+
+
+def run_cases() -> dict[str, dict]:
+    results = {}
+    for bot_count in BOT_COUNTS:
+        for orders in ORDERS_PER_DEAL:
+            bot_ids = populate(bot_count, orders)
+            root = build_session(bot_ids)
+            execution = root.get_substate(BotExecutionState.get_full_name().split("."))
+            deals = root.get_substate(DealState.get_full_name().split("."))
+            prices = [
+                (bot_id, 100.0 + (i % 7) * 0.1) for i, bot_id in enumerate(bot_ids)
+            ]
+            key = f"bots={bot_count},orders={orders}"
+            results[f"check_bot_strategy[{key}]"] = measure_async(
+                execution._check_bot_strategy, prices
+            )
+            results[f"calculate_average_entry[{key}]"] = measure(
+                deals._calculate_average_entry,
+                [(engine_registry.deals[bot_id],) for bot_id in bot_ids],
+            )
+            results[f"publish_deal[{key}]"] = measure(
+                deals._publish, [(engine_registry.deals[bot_id],) for bot_id in bot_ids]
+            )
+        bot_ids = populate(bot_count, 1)
+        seed_db(bot_ids)
+        bots_state = build_session(bot_ids).get_substate(
+            BotsState.get_full_name().split(".")
+        )
+        statuses = ("in_position", "monitoring")
+        results[f"set_bot_status[bots={bot_count}]"] = measure(
+            bots_state.set_bot_status,
+            [(bot_id, statuses[i % 2]) for i, bot_id in enumerate(bot_ids)],
+        )
+    for pair_count in PAIR_COUNTS:
+        pairs = [f"COIN{i}USDT" for i in range(pair_count)]
+        trading_pairs_cache["stable_pairs"] = pairs
+        results[f"filtered_trading_pairs[pairs={pair_count}]"] = measure(
+            filter_trading_pairs, [("",), ("coin1",), ("COIN19",), ("NOPE",)]
+        )
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict]) -> list[str]:
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        limit = expected["min_us"] * (1 + TOLERANCE)
+        if result["min_us"] > limit:
+            failures.append(
+                f"{name}: {result['min_us']:.2f} us > {limit:.2f} us (baseline {expected['min_us']:.2f})"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Strategy hot-path microbenchmarks.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record results as the new baseline",
+    )
+    args = parser.parse_args()
+    init_db()
+    results = run_cases()
+    for name, result in results.items():
+        print(
+            f"{name:55s} min {result['min_us']:9.2f} us  mean {result['mean_us']:9.2f} us  stddev {result['stddev_us']:7.2f}"
+        )
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"New baseline recorded at {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(
+            f"No baseline at {args.baseline}; rerun with --update-baseline to record one"
+        )
+        return 1
+    with open(args.baseline) as f:
+        failures = compare(results, json.load(f))
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
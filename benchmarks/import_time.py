@@ -0,0 +1,55 @@
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRYPOINT = "app.app"
+RUNS = int(os.environ.get("IMPORT_TIME_RUNS", "3"))
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "2500"))
+LAZY_MODULES = ("binance", "polar_sdk", "resend", "cryptography", "bcrypt")
+REPORT_TOP = 15
+
+
+def import_profile(module: str) -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        profile[name.strip()] = (int(self_us), int(cumulative_us))
+    return profile
+
+
+def main() -> int:
+    totals = []
+    profile = {}
+    for _ in range(RUNS):
+        profile = import_profile(ENTRYPOINT)
+        totals.append(profile[ENTRYPOINT][1] / 1000)
+    total_ms = statistics.median(totals)
+    top_level = {}
+    for name, (_, cumulative_us) in profile.items():
+        root = name.split(".")[0]
+        if name == root:
+            top_level[root] = cumulative_us / 1000
+    for name, ms in sorted(top_level.items(), key=lambda i: -i[1])[:REPORT_TOP]:
+        print(f"{ms:9.1f} ms  {name}")
+    eager = [m for m in LAZY_MODULES if m in top_level]
+    print(
+        f"import {ENTRYPOINT}: median {total_ms:.1f} ms over {RUNS} runs (budget {IMPORT_BUDGET_MS:.0f} ms)"
+    )
+    if eager:
+        print(f"Imported eagerly, should be deferred: {', '.join(eager)}")
+    return 1 if total_ms > IMPORT_BUDGET_MS or eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+LOAD_TEST_PORT = int(os.environ.get("LOAD_TEST_PORT", "9187"))
+DB_PATH = os.path.join(tempfile.mkdtemp(), "load_test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("BINANCE_BASE_URL", f"http://127.0.0.1:{LOAD_TEST_PORT}")
+os.environ["TRACE_ACTIONS"] = "true"
+os.environ["TRACE_FILE"] = ""
+
+import reflex as rx
+from reflex.constants import RouteVar
+from reflex.istate.data import RouterData
+from reflex.istate.manager import StateManagerMemory
+from reflex.state import StateProxy
+from sqlalchemy import event
+from app.app import app as rx_app
+from app.database import crud
+from app.database.database import SessionLocal, engine, init_db
+from app.services import binance_client, tracing
+from app.services.engine_registry import engine_registry
+from app.services.ui_publisher import ui_publisher
+from app.states.bot_execution_state import BotExecutionState
+from app.states.bot_state import Bot, BotsState
+from app.states.exchange_state import ExchangeState
+
+THRESHOLDS_PATH = os.path.join(os.path.dirname(__file__), "load_test_thresholds.json")
+SYMBOLS = {"DOGEUSDT": 0.15, "XRPUSDT": 0.6, "ADAUSDT": 0.45, "TRXUSDT": 0.12}
+LAG_INTERVAL = 0.05
+CONFIG = {
+    "base_order_size": 10.0,
+    "safety_order_size": 10.0,
+    "safety_order_volume_scale": 1.2,
+    "safety_order_step_scale": 1.0,
+    "max_safety_orders": 3,
+    "immediate_safety_orders": 0,
+    "price_deviation": 1.0,
+    "take_profit_percentage": 1.0,
+}
+
+
+class Metrics:
+    def __init__(self):
+        self.decisions: list[float] = []
+        self.orders: list[float] = []
+        self.loop_lag: list[float] = []
+        self.db_writes = 0
+        self.db_write_ms: list[float] = []
+
+
+class UpdateSink:
+    def __init__(self):
+        self.token_to_sid: dict[str, str] = {}
+        self.updates = 0
+
+    async def emit_update(self, update, token: str, **kwargs):
+        self.updates += 1
+
+
+metrics = Metrics()
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def count_db_writes():
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["load_test_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip()[:6].upper() in ("INSERT", "UPDATE", "DELETE"):
+            metrics.db_writes += 1
+            metrics.db_write_ms.append(
+                (time.perf_counter() - conn.info["load_test_started"]) * 1000
+            )
+
+
+def start_exchange(volatility: float) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "app.services.fake_exchange",
+            "--port",
+            str(LOAD_TEST_PORT),
+            "--symbols",
+            ",".join(f"{s}:{p}" for s, p in SYMBOLS.items()),
+            "--balances",
+            "USDT:1000000",
+            "--rate-limit",
+            "0",
+            "--volatility",
+            str(volatility),
+        ]
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{binance_client.BINANCE_BASE_URL}/api/v3/ping")
+            return process
+        except OSError:
+            if process.poll() is not None:
+                raise RuntimeError("Fake exchange exited during startup.")
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Fake exchange did not start within 30s.")
+
+
+def create_user(index: int) -> int:
+    db = SessionLocal()
+    try:
+        user = crud.create_user(
+            db, f"load{index}", f"load{index}@example.com", "load-test"
+        )
+        return user.id
+    finally:
+        db.close()
+
+
+def seed(users: int, bots: int) -> dict[str, list[Bot]]:
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as pool:
+        user_ids = list(pool.map(create_user, range(users)))
+    symbols = list(SYMBOLS)
+    db = SessionLocal()
+    seeded: dict[str, list[Bot]] = {}
+    try:
+        for i in range(bots):
+            user_id = user_ids[i % users]
+            email = f"load{i % users}@example.com"
+            bot = Bot(
+                id=str(uuid.uuid4()),
+                name=f"Load Bot {i + 1}",
+                status="starting",
+                in_deal=False,
+                config={"pair": symbols[i % len(symbols)], **CONFIG},
+                total_pnl=0.0,
+                deals_count=0,
+            )
+            crud.create_bot(db, user_id, dict(bot))
+            engine_registry.set_account(email, user_id)
+            engine_registry.register_bot(bot, email)
+            seeded.setdefault(email, []).append(bot)
+    finally:
+        db.close()
+    return seeded
+
+
+async def build_session(email: str, bots: list[Bot]) -> StateProxy:
+    client_token = str(uuid.uuid4())
+    async with rx_app.state_manager.modify_state(
+        f"{client_token}_{BotsState.get_full_name()}"
+    ) as root:
+        root.router = RouterData.from_router_data({RouteVar.CLIENT_TOKEN: client_token})
+        bots_state = await root.get_state(BotsState)
+        bots_state.bots = [dict(bot) for bot in bots]
+        bots_state._reindex()
+        exchange_state = await root.get_state(ExchangeState)
+        exchange_state.api_keys = {"api_key": email, "secret_key": "load"}
+        exchange_state.has_api_keys = True
+        execution = await root.get_state(BotExecutionState)
+    return StateProxy(execution)
+
+
+def record_orders(record: dict):
+    for span in record["spans"]:
+        if span["name"] == "place_market_order" and span["duration_ms"] is not None:
+            metrics.orders.append(span["duration_ms"])
+
+
+async def open_deal(execution: StateProxy, bot_id: str):
+    if not await execution._place_base_order(bot_id):
+        return
+    async with execution:
+        bots_state = await execution.get_state(BotsState)
+        bots_state.set_bot_status(bot_id, "monitoring")
+
+
+async def run_bot(execution: StateProxy, bot: Bot, ticks: asyncio.Queue):
+    bot_id = bot["id"]
+    symbol = bot["config"]["pair"]
+    while True:
+        res = await ticks.get()
+        price = float(res["p"])
+        ui_publisher.publish_price(bot_id, price)
+        metrics.decisions.append(time.time() * 1000 - res["E"])
+        trace = tracing.begin_tick(bot_id, symbol, res)
+        try:
+            await execution._check_bot_strategy(bot_id, price)
+        finally:
+            tracing.finish_tick(trace)
+
+
+async def watch_loop_lag(stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        metrics.loop_lag.append((time.perf_counter() - started - LAG_INTERVAL) * 1000)
+
+
+async def stream_symbol(
+    symbol: str, queues: list[asyncio.Queue], client, stop: asyncio.Event
+):
+    socket = binance_client.socket_manager(client).trade_socket(symbol)
+    async with socket as ts:
+        while not stop.is_set():
+            try:
+                res = await asyncio.wait_for(ts.recv(), timeout=1)
+            except asyncio.TimeoutError:
+                continue
+            if not res or "p" not in res:
+                continue
+            for queue in queues:
+                queue.put_nowait(res)
+
+
+async def run(users: int, bots: int, duration: float) -> dict:
+    started = time.perf_counter()
+    seeded = seed(users, bots)
+    print(
+        f"Seeded {users} users and {bots} bots in {time.perf_counter() - started:.1f}s"
+    )
+    rx_app._state_manager = StateManagerMemory(state=rx.State)
+    sink = UpdateSink()
+    rx_app._event_namespace = sink
+    count_db_writes()
+    baseline_rss = rss_kb()
+    sessions = {
+        email: await build_session(email, owned) for email, owned in seeded.items()
+    }
+    await asyncio.gather(
+        *(
+            open_deal(sessions[email], bot["id"])
+            for email, owned in seeded.items()
+            for bot in owned
+        )
+    )
+    tracing.add_exporter(record_orders)
+    metrics.db_writes = 0
+    metrics.db_write_ms.clear()
+    sink.updates = 0
+    queues = {bot["id"]: asyncio.Queue() for owned in seeded.values() for bot in owned}
+    workers = [
+        asyncio.create_task(run_bot(sessions[email], bot, queues[bot["id"]]))
+        for email, owned in seeded.items()
+        for bot in owned
+    ]
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(watch_loop_lag(stop))
+    stream_client = await binance_client.create_async_client()
+    streams = [
+        asyncio.create_task(
+            stream_symbol(
+                symbol,
+                [
+                    queues[bot["id"]]
+                    for owned in seeded.values()
+                    for bot in owned
+                    if bot["config"]["pair"] == symbol
+                ],
+                stream_client,
+                stop,
+            )
+        )
+        for symbol in SYMBOLS
+    ]
+    measured_from = time.perf_counter()
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*streams, lag_task, return_exceptions=True)
+    elapsed = time.perf_counter() - measured_from
+    for worker in workers:
+        worker.cancel()
+    outcomes = await asyncio.gather(*workers, return_exceptions=True)
+    engine_errors = [o for o in outcomes if isinstance(o, Exception)]
+    for error in engine_errors[:5]:
+        print(f"Engine error: {error!r}")
+    memory_per_bot = (rss_kb() - baseline_rss) / max(bots, 1)
+    await stream_client.close_connection()
+    live_bots = [engine_registry.bots[b["id"]] for o in seeded.values() for b in o]
+    return {
+        "users": users,
+        "bots": bots,
+        "duration_s": round(elapsed, 1),
+        "decisions": len(metrics.decisions),
+        "tick_to_decision_p50_ms": percentile(metrics.decisions, 0.5),
+        "tick_to_decision_p99_ms": percentile(metrics.decisions, 0.99),
+        "orders": len(metrics.orders),
+        "order_errors": sum(bot["status"] == "error" for bot in live_bots),
+        "engine_errors": len(engine_errors),
+        "order_latency_p50_ms": percentile(metrics.orders, 0.5),
+        "order_latency_p99_ms": percentile(metrics.orders, 0.99),
+        "loop_lag_p99_ms": percentile(metrics.loop_lag, 0.99),
+        "loop_lag_max_ms": max(metrics.loop_lag, default=0.0),
+        "memory_per_bot_kb": round(memory_per_bot, 1),
+        "deals_closed": sum(bot["deals_count"] for bot in live_bots),
+        "ui_updates_per_s": round(sink.updates / elapsed, 1),
+        "db_writes_per_s": round(metrics.db_writes / elapsed, 1),
+        "db_write_p99_ms": percentile(metrics.db_write_ms, 0.99),
+    }
+
+
+def check(result: dict, thresholds: dict) -> list[str]:
+    failures = []
+    for name, limit in thresholds.items():
+        metric, bound = name.rsplit("_", 1)
+        value = result.get(metric)
+        if value is None:
+            continue
+        if (bound == "max" and value > limit) or (bound == "min" and value < limit):
+            failures.append(f"{metric}={value:.2f} violates {bound} {limit}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the bot engine.")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--bots", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--volatility", type=float, default=60.0)
+    parser.add_argument("--thresholds", default=THRESHOLDS_PATH)
+    parser.add_argument("--output", help="Write the results as JSON")
+    parser.add_argument(
+        "--external-exchange",
+        action="store_true",
+        help="Use the fake exchange already running at BINANCE_BASE_URL",
+    )
+    args = parser.parse_args()
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    logging.disable(logging.ERROR)
+    init_db()
+    exchange = None if args.external_exchange else start_exchange(args.volatility)
+    try:
+        result = asyncio.run(run(args.users, args.bots, args.duration))
+    finally:
+        if exchange:
+            exchange.terminate()
+            exchange.wait()
+    for name, value in result.items():
+        print(f"{name:>26s}  {value}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    with open(args.thresholds) as f:
+        failures = check(result, json.load(f))
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+from app.services.market_data import KLINE_DTYPE, KlineStore
+
+CANDLES = 365 * 24 * 60
+MAX_RANGE_QUERY_US = float(os.environ.get("MARKET_DATA_MAX_QUERY_US", "500"))
+
+
+def main() -> int:
+    store = KlineStore("BENCHUSDT", "1m", root=tempfile.mkdtemp())
+    records = np.zeros(CANDLES, dtype=KLINE_DTYPE)
+    records["open_time"] = np.arange(CANDLES, dtype=np.int64) * 60_000
+    records["close"] = 100.0
+    started = time.perf_counter()
+    store.append(records)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"appended {CANDLES} klines in {elapsed_ms:.1f} ms")
+    rng = np.random.default_rng(1)
+    starts = rng.integers(0, CANDLES - 1440, 1000) * 60_000
+    started = time.perf_counter()
+    for start in starts:
+        view = store.read(int(start), int(start) + 1440 * 60_000)
+    per_query_us = (time.perf_counter() - started) / len(starts) * 1_000_000
+    print(
+        f"1-day range query: {per_query_us:.1f} us, {len(view)} rows, memory-mapped: {isinstance(view, np.memmap)}"
+    )
+    return 1 if per_query_us > MAX_RANGE_QUERY_US or len(view) != 1440 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+import reflex as rx
+from reflex.istate.manager import StateManagerMemory, StateManagerRedis
+from app.states.bot_state import BotsState, Bot
+from app.states.deal_state import DealState
+from app.services.state_backend import CompressingRedis, InProcessRedis
+
+EVENTS = 500
+BOTS_PER_SESSION = 5
+
+
+def state_key(client_token: str, state_cls) -> str:
+    return f"{client_token}_{state_cls.get_full_name()}"
+
+
+async def seed(manager, client_token: str):
+    async with manager.modify_state(state_key(client_token, BotsState)) as root:
+        bots_state = await root.get_state(BotsState)
+        for i in range(BOTS_PER_SESSION):
+            bots_state.bots.append(
+                Bot(
+                    id=str(uuid.uuid4()),
+                    name=f"DCA Bot {i + 1}",
+                    status="monitoring",
+                    in_deal=True,
+                    config=bots_state.current_bot_config.copy(),
+                    total_pnl=0.0,
+                    deals_count=0,
+                )
+            )
+        bots_state._reindex()
+        deal_state = await root.get_state(DealState)
+        deal_state.bot_deals = []
+
+
+async def run_events(manager, client_token: str) -> list[float]:
+    latencies = []
+    for i in range(EVENTS):
+        started = time.perf_counter()
+        async with manager.modify_state(state_key(client_token, BotsState)) as root:
+            bots_state = await root.get_state(BotsState)
+            bot = bots_state.bots[i % BOTS_PER_SESSION]
+            bots_state.set_bot_status(
+                bot["id"], "in_position" if i % 2 else "monitoring"
+            )
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list[float]):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:28s} mean {statistics.mean(latencies):7.3f} ms  p50 {latencies[len(latencies) // 2]:7.3f} ms  p99 {p99:7.3f} ms"
+    )
+
+
+async def main() -> int:
+    managers = {
+        "memory": StateManagerMemory(state=rx.State),
+        "inprocess (per-substate)": StateManagerRedis(
+            state=rx.State, redis=InProcessRedis()
+        ),
+        "inprocess + compression": StateManagerRedis(
+            state=rx.State, redis=CompressingRedis(InProcessRedis(), threshold=256)
+        ),
+    }
+    for name, manager in managers.items():
+        client_token = str(uuid.uuid4())
+        await seed(manager, client_token)
+        report(name, await run_events(manager, client_token))
+        redis = getattr(manager, "redis", None)
+        if redis is not None:
+            print(f"{'':28s} stored {redis.used_bytes()} bytes")
+        await manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,87 @@
+import sys
+import time
+import reflex as rx
+from app.states.bot_state import BotsState, Bot
+from app.states.deal_state import DealState, Deal, Order, summarize_deal
+from app.states.exchange_state import ExchangeState
+from app.services.state_metrics import (
+    SESSION_STATE_BUDGET_BYTES,
+    check_session_state_size,
+    session_state_sizes,
+)
+
+BOTS_PER_SESSION = 5
+SAFETY_ORDERS_PER_DEAL = 25
+HISTORY_ROWS = 25
+
+
+def make_order(n: int, order_type: str) -> Order:
+    return Order(
+        order_id=str(1_000_000 + n),
+        timestamp=time.time(),
+        side="buy",
+        price=100.0 - n,
+        quantity=0.1,
+        order_type=order_type,
+        status="filled",
+    )
+
+
+def make_deal(bot_id: str) -> Deal:
+    return Deal(
+        deal_id=f"deal_{bot_id}",
+        db_id=1,
+        bot_id=bot_id,
+        status="active",
+        entry_time=time.time(),
+        close_time=None,
+        base_order=make_order(0, "base"),
+        filled_safety_orders=[
+            make_order(i, "safety") for i in range(1, SAFETY_ORDERS_PER_DEAL)
+        ],
+        pending_safety_orders=[make_order(SAFETY_ORDERS_PER_DEAL, "safety")],
+        take_profit_order=None,
+        average_entry_price=95.0,
+        total_quantity=2.5,
+        unrealized_pnl=0.0,
+        realized_pnl=0.0,
+    )
+
+
+def build_session() -> rx.State:
+    root = rx.State(_reflex_internal_init=True)
+    bots_state = root.get_substate(BotsState.get_full_name().split("."))
+    deal_state = root.get_substate(DealState.get_full_name().split("."))
+    exchange_state = root.get_substate(ExchangeState.get_full_name().split("."))
+    for i in range(BOTS_PER_SESSION):
+        bot_id = f"00000000-0000-0000-0000-00000000000{i}"
+        bots_state.bots.append(
+            Bot(
+                id=bot_id,
+                name=f"DCA Bot {i + 1}",
+                status="in_position",
+                in_deal=True,
+                config=bots_state.current_bot_config.copy(),
+                total_pnl=0.0,
+                deals_count=HISTORY_ROWS,
+            )
+        )
+    deal_state.active_deal = summarize_deal(make_deal(bots_state.bots[0]["id"]))
+    deal_state.bot_deals = [
+        summarize_deal(make_deal(bots_state.bots[0]["id"])) for _ in range(HISTORY_ROWS)
+    ]
+    exchange_state.trading_pairs_count = 2000
+    return root
+
+
+def main() -> int:
+    root = build_session()
+    for name, size in sorted(session_state_sizes(root).items()):
+        print(f"{name:60s} {size:>8d} bytes")
+    ok, total = check_session_state_size(root)
+    print(f"total: {total} bytes (budget {SESSION_STATE_BUDGET_BYTES})")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import sys
+import time
+from app.services.sweep import default_ranges, expand_grid, run_sweep
+from benchmarks.backtest import CONFIG, synthetic_candles
+
+CANDLES = 90 * 24 * 4
+
+
+def main() -> int:
+    candles = synthetic_candles(CANDLES)
+    configs = expand_grid(CONFIG, default_ranges())
+    started = time.perf_counter()
+    front = run_sweep(CONFIG, candles)
+    elapsed = time.perf_counter() - started
+    print(f"{len(configs)} configs over {CANDLES} candles in {elapsed:.2f} s")
+    for entry in front[:10]:
+        result = entry["result"]
+        print(
+            f"P/L {result['total_pnl']:9.2f}  drawdown {result['max_drawdown']:8.2f}  capital {entry['capital_required']:8.2f}  {entry['config']}"
+        )
+    return 0 if front else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())